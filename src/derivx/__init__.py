@@ -2,10 +2,12 @@
 
 from .curves import PiecewiseFlatCurve
 from .models.gbm import RiskNeutralGBM
-from .engine.montecarlo import MonteCarloEngine
+from .models.heston import HestonModel
+from .engine.montecarlo import MonteCarloEngine, MCResult
 from .exercise.lsmc import ExerciseSpec
 from .payoffs.core import (
 PF,
+Payoff,
 relu,
 max_ as max,
 min_ as min,
@@ -17,15 +19,18 @@ up_and_out_call,
 basket_call,
 bs_call_price,
 )
-from .dsl.spec import price_from_spec, build_engine_from_spec
+from .dsl.spec import price_from_spec, build_engine_from_spec, pde_ladder_from_spec
 
 __all__ = [
 "__version__",
 "PiecewiseFlatCurve",
 "RiskNeutralGBM",
+"HestonModel",
 "MonteCarloEngine",
+"MCResult",
 "ExerciseSpec",
 "PF",
+"Payoff",
 "relu",
 "max",
 "min",
@@ -38,5 +43,6 @@ __all__ = [
 "bs_call_price",
 "price_from_spec",
 "build_engine_from_spec",
+"pde_ladder_from_spec",
 ]
 
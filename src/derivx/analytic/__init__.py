@@ -5,6 +5,7 @@ from .haug import (
     gap_call, gap_put,
     margrabe_exchange_call,
 )
+from .geometric import geometric_basket_call, geometric_asian_call
 
 # Sinônimos amigáveis / compatíveis com a DSL
 # (mantemos também os nomes "clássicos" que você já usa)
@@ -38,6 +39,7 @@ __all__ = [
     "cash_or_nothing_call", "cash_or_nothing_put",
     "asset_or_nothing_call", "asset_or_nothing_put",
     "gap_call", "gap_put", "margrabe_exchange_call",
+    "geometric_basket_call", "geometric_asian_call",
     # aliases compatíveis com DSL
     "bs_call_price", "bs_put_price",
     "digital_cash_call_price", "digital_cash_put_price",
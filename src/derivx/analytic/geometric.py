@@ -0,0 +1,56 @@
+from __future__ import annotations
+import math
+from typing import Sequence
+
+import numpy as np
+
+from .bs import Phi
+
+
+def _lognormal_call(mu: float, v: float, K: float, r: float, T: float) -> float:
+    """e^{-rT} E[(G - K)^+] com log G ~ N(mu, v)."""
+    if v <= 0.0:
+        return math.exp(-r * T) * max(math.exp(mu) - K, 0.0)
+    sv = math.sqrt(v)
+    d1 = (mu - math.log(K) + v) / sv
+    d2 = d1 - sv
+    return math.exp(-r * T) * (math.exp(mu + 0.5 * v) * Phi(d1) - K * Phi(d2))
+
+
+# --- Basket geométrico --------------------------------------------------------
+
+def geometric_basket_call(
+    S0: Sequence[float], weights: Sequence[float], K: float, r: float,
+    q: Sequence[float], sigma: Sequence[float], corr: np.ndarray, T: float,
+) -> float:
+    """
+    Call sobre G = (sum w) * prod S_i(T)^(w_i / sum w), pesos positivos.
+    log G é normal (GBM correlacionado), então o preço é fechado; G fica
+    próximo do basket aritmético sum w_i S_i(T), o que o torna um bom
+    control variate para ``basket_call``.
+    """
+    w = np.asarray(weights, dtype=float)
+    if np.any(w <= 0):
+        raise ValueError("geometric_basket_call exige pesos positivos.")
+    a = w / w.sum()
+    S0, q, sigma = (np.asarray(x, dtype=float) for x in (S0, q, sigma))
+    cov = np.asarray(corr, dtype=float) * np.outer(sigma, sigma) * T
+    mu = math.log(w.sum()) + float(a @ (np.log(S0) + (r - q - 0.5 * sigma ** 2) * T))
+    return _lognormal_call(mu, float(a @ cov @ a), K, r, T)
+
+
+# --- Asiática geométrica (fixings discretos) ----------------------------------
+
+def geometric_asian_call(
+    S0: float, K: float, r: float, q: float, sigma: float, fixing_times: Sequence[float], T: float,
+) -> float:
+    """
+    Call sobre a média geométrica G = (prod S(t_i))^(1/n) nos fixings t_i,
+    pago em T. log G ~ N(log S0 + (r - q - sigma^2/2) mean(t),
+    sigma^2 / n^2 sum_ij min(t_i, t_j)).
+    """
+    t = np.asarray(fixing_times, dtype=float)
+    n = t.size
+    mu = math.log(S0) + (r - q - 0.5 * sigma * sigma) * float(t.mean())
+    v = sigma * sigma * float(np.minimum.outer(t, t).sum()) / (n * n)
+    return _lognormal_call(mu, v, K, r, T)
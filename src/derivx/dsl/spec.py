@@ -1,14 +1,23 @@
 ﻿# src/derivx/dsl/spec.py
 from __future__ import annotations
 
+import os
 import numpy as np
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 from ..payoffs.extra import build_extra_payoff
 from ..curves import PiecewiseFlatCurve
 from ..models.gbm import RiskNeutralGBM
+from ..models.heston import HestonModel
 from ..engine.montecarlo import MonteCarloEngine
-from ..exercise.lsmc import ExerciseSpec
+from ..engine.mlmc import mlmc_price
+from ..engine.fft import fft_prices
+from ..engine.cos import cos_prices
+from ..engine.pde import PDEEngine
+from ..models.charfn import CHARFNS, get_charfn, model_charfn
+from ..engine.cache import shared_path_cache
+from ..engine.store import PathStore
+from ..exercise.lsmc import ExerciseSpec, lsmc_price
 from ..ir.black76 import (
     fra_pv, swap_par_rate, swap_pv,
     cap_price, floor_price, payer_swaption_price, receiver_swaption_price,
@@ -20,7 +29,9 @@ from ..payoffs.core import (
     up_and_out_call,
     basket_call,
     PF,
+    Payoff,
     relu,
+    terminal_only,
 )
 
 # === Importes analíticos (equity — fórmulas fechadas) ===
@@ -30,6 +41,7 @@ from ..analytic import (
     asset_or_nothing_call, asset_or_nothing_put,
     gap_call as an_gap_call, gap_put as an_gap_put,
     margrabe_exchange_call,
+    geometric_asian_call, geometric_basket_call,
 )
 
 
@@ -42,16 +54,34 @@ def _build_curve(spec: Dict[str, Any]) -> PiecewiseFlatCurve:
     return PiecewiseFlatCurve(np.array([1e-8], dtype=float), np.array([r], dtype=float))
 
 
+def _is_heston(model_spec: Dict[str, Any]) -> bool:
+    return str(model_spec.get("name", "gbm")).lower() == "heston"
+
+
 def build_engine_from_spec(spec: Dict[str, Any]) -> Tuple[MonteCarloEngine, np.ndarray, list]:
     model_spec = spec["model"]
     r_curve = _build_curve(model_spec)
 
     q = model_spec.get("q", 0.0)
-    sigma = model_spec.get("sigma", 0.2)
-    corr = np.array(model_spec.get("corr", [[1.0]]), dtype=float)
-
-    model = RiskNeutralGBM(r_curve, q_funcs=q, sigma_funcs=sigma, corr=corr)
+    name = str(model_spec.get("name", "gbm")).lower()
+    if name in CHARFNS and name not in ("gbm", "heston"):
+        raise ValueError(f"modelo '{name}' so tem funcao caracteristica; use engine='cos'.")
+    if _is_heston(model_spec):
+        model = HestonModel(
+            r_curve, q=float(q),
+            kappa=float(model_spec["kappa"]), theta=float(model_spec["theta"]),
+            xi=float(model_spec["xi"]), rho=float(model_spec["rho"]), v0=float(model_spec["v0"]),
+            psi_c=float(model_spec.get("psi_c", 1.5)),
+        )
+    else:
+        sigma = model_spec.get("sigma", 0.2)
+        corr = np.array(model_spec.get("corr", [[1.0]]), dtype=float)
+        model = RiskNeutralGBM(r_curve, q_funcs=q, sigma_funcs=sigma, corr=corr)
     eng = MonteCarloEngine(model)
+    # "path_cache": true | {"max_mb": N} — cache de caminhos compartilhado entre chamadas
+    cache = spec.get("path_cache")
+    if cache:
+        eng.path_cache = shared_path_cache(cache.get("max_mb") if isinstance(cache, dict) else None)
 
     grid = spec.get("grid", {"T": 1.0, "steps": 64})
     T = float(grid.get("T", 1.0))
@@ -62,11 +92,35 @@ def build_engine_from_spec(spec: Dict[str, Any]) -> Tuple[MonteCarloEngine, np.n
     return eng, times, S0
 
 
-def _build_payoff(product: Dict[str, Any]):
+def _times_to_idx(times: np.ndarray, want) -> list:
+    """Índices (>0, sem repetição, ordenados) da grade mais próximos dos instantes pedidos."""
+    out = []
+    for wt in map(float, want):
+        idx = int(np.argmin(np.abs(times - wt)))
+        if idx not in out and idx > 0:
+            out.append(idx)
+    return sorted(out)
+
+
+def _asian_fixings(product: Dict[str, Any], times: np.ndarray | None):
+    """Índices de fixing da asiática ('fixing_idx' ou 'fixing_times'); None = toda a grade após t0."""
+    if "fixing_idx" in product:
+        return list(map(int, product["fixing_idx"]))
+    if "fixing_times" in product:
+        if times is None:
+            raise ValueError("fixing_times exige a grade de tempo.")
+        return _times_to_idx(times, product["fixing_times"])
+    return None
+
+
+def _build_payoff(product: Dict[str, Any], times: np.ndarray | None = None, model: Dict[str, Any] | None = None):
     """
     Constrói o payoff para estilos europeus.
     Primeiro tenta os 'extras' (digitais/gap/exchange, etc).
     Se não reconhecer, cai no conjunto 'core' padrão.
+    Asiáticas aceitam datas de fixing esparsas ('fixing_idx' ou 'fixing_times').
+    Barreiras com ``"monitoring": "continuous"`` usam a correção de ponte
+    browniana com a sigma do ativo em ``model``.
     """
     # 1) tenta construir via payoffs extras (digitais/gap/exchange em MC)
     extra = build_extra_payoff(product)
@@ -80,19 +134,76 @@ def _build_payoff(product: Dict[str, Any]):
     if ptype == "european_put":
         return european_put(int(product.get("asset", 0)), float(product["K"]))
     if ptype == "asian_arith_call":
-        return asian_arith_call(int(product.get("asset", 0)), float(product["K"]))
+        fixings = _asian_fixings(product, times)
+        return asian_arith_call(int(product.get("asset", 0)), float(product["K"]), fixings=fixings)
     if ptype == "up_and_out_call":
-        return up_and_out_call(
-            int(product.get("asset", 0)),
-            float(product["K"]),
-            float(product["barrier"]),
-        )
+        a = int(product.get("asset", 0))
+        sigma = None
+        if str(product.get("monitoring", "discrete")).lower() == "continuous":
+            if model is None or _is_heston(model):
+                raise ValueError("monitoring='continuous' exige a sigma do modelo (GBM).")
+            sigma = _to_scalar_or_list(model.get("sigma", 0.2), a)
+        return up_and_out_call(a, float(product["K"]), float(product["barrier"]), sigma=sigma)
     if ptype == "basket_call":
         return basket_call(list(product["weights"]), float(product["K"]))
 
     raise ValueError(f"payoff type nao suportado: {ptype}")
 
 
+def _auto_control_variates(spec: Dict[str, Any], product: Dict[str, Any], times: np.ndarray) -> list:
+    """
+    Control variates com preço exato (módulo analytic) para o produto MC:
+      - forward descontado de cada ativo: E[e^{-rT} S_T] = S0 e^{-qT}
+      - asian_arith_call: asiática geométrica nos mesmos fixings, média
+        aritmética de S (forward) e call europeu de mesmo strike
+      - up_and_out_call: call europeu de mesmo strike
+      - basket_call: basket geométrico (pesos positivos)
+    Só vale com r, q e sigma constantes (sem 'r_curve'); senão retorna [].
+    No Heston só os forwards são exatos (os demais preços são de BS).
+    """
+    model = spec["model"]
+    heston = _is_heston(model)
+    constant = heston or all(isinstance(x, (int, float)) for k in ("q", "sigma")
+                   for x in np.atleast_1d(model.get(k, 0.0)).tolist())
+    if "r_curve" in model or not constant:
+        return []
+    r = float(model.get("r", 0.0))
+    S0 = [float(x) for x in spec.get("S0", [100.0])]
+    q = [_to_scalar_or_list(model.get("q", 0.0), i) for i in range(len(S0))]
+    sig = [_to_scalar_or_list(model.get("sigma", 0.2), i) for i in range(len(S0))]
+    corr = np.array(model.get("corr", [[1.0]]), dtype=float)
+    T = float(times[-1])
+
+    cvs = [(terminal_only(lambda paths, a=a: PF.terminal(paths, a)), S0[a] * np.exp(-q[a] * T))
+           for a in range(len(S0))]
+    if heston:
+        return cvs
+
+    ptype = str(product.get("type", "")).lower()
+    a = int(product.get("asset", 0))
+    if ptype in ("asian_arith_call", "up_and_out_call"):
+        K = float(product["K"])
+        cvs.append((european_call(a, K), bs_call(S0[a], K, r, q[a], sig[a], T)))
+    if ptype == "asian_arith_call":
+        fixings = _asian_fixings(product, times)
+        idx = np.arange(1, len(times)) if fixings is None else np.asarray(fixings)
+        obs = (slice(1, None),) if fixings is None else tuple(int(k) for k in fixings)
+        t_fix = times[idx]
+        geo = Payoff(lambda paths: relu(PF.geometric_average(paths, a, fixings=fixings) - K), obs=obs)
+        avg = Payoff(lambda paths: PF.average(paths, a, fixings=fixings), obs=obs)
+        cvs.append((geo, geometric_asian_call(S0[a], K, r, q[a], sig[a], t_fix, T)))
+        cvs.append((avg, np.exp(-r * T) * S0[a] * float(np.mean(np.exp((r - q[a]) * t_fix)))))
+    if ptype == "basket_call":
+        w = [float(x) for x in product["weights"]]
+        if min(w) > 0:
+            K = float(product["K"])
+            wa = np.asarray(w) / sum(w)
+            geo = terminal_only(lambda paths: relu(
+                sum(w) * np.exp(np.log(paths["S"][:, -1, :]) @ wa) - K))
+            cvs.append((geo, geometric_basket_call(S0, w, K, r, q, sig, corr, T)))
+    return cvs
+
+
 def _build_exercise(product: Dict[str, Any], times: np.ndarray):
     style = product.get("style", "european").lower()
     if style == "european":
@@ -106,13 +217,7 @@ def _build_exercise(product: Dict[str, Any], times: np.ndarray):
         if "exercise_idx" in product:
             ex_idx = list(map(int, product["exercise_idx"]))
         elif "exercise_times" in product:
-            want = list(map(float, product["exercise_times"]))
-            ex_idx = []
-            for wt in want:
-                idx = int(np.argmin(np.abs(times - wt)))
-                if idx not in ex_idx and idx > 0:
-                    ex_idx.append(idx)
-            ex_idx.sort()
+            ex_idx = _times_to_idx(times, product["exercise_times"])
         else:
             freq = int(product.get("exercise_every", 8))
             ex_idx = list(range(freq, len(times), freq))
@@ -231,6 +336,8 @@ def _to_scalar_or_list(x, i: int) -> float:
 def _price_analytic(spec: Dict[str, Any]) -> Tuple[float, float] | None:
     product = spec["product"]
     model = spec["model"]
+    if str(model.get("name", "gbm")).lower() in set(CHARFNS) - {"gbm"}:
+        return None  # fórmulas fechadas abaixo são de BS/GBM (Heston, Merton, VG... vão para FFT/COS/MC)
     grid = spec.get("grid", {"T": 1.0})
     T = float(grid.get("T", 1.0))
     S0 = spec.get("S0", [100.0])
@@ -291,15 +398,286 @@ def _price_analytic(spec: Dict[str, Any]) -> Tuple[float, float] | None:
     return None
 
 
+def _price_book(spec: Dict[str, Any], eng: MonteCarloEngine, times: np.ndarray, S0: list):
+    """"products": [...] — todos os produtos (europeus) numa única simulação MC."""
+    payoffs = []
+    for product in spec["products"]:
+        if str(product.get("style", "european")).lower() != "european":
+            raise ValueError("'products' aceita apenas produtos europeus/path-dependentes (sem exercicio).")
+        payoffs.append(_build_payoff(product, times, spec["model"]))
+    par = spec.get("parallel", {})
+    return eng.price_many(
+        payoffs, S0, times,
+        n_paths=int(spec.get("n_paths", 100_000)),
+        seed=spec.get("seed"),
+        chunk_size=spec.get("chunk_size"),
+        max_memory_mb=spec.get("max_memory_mb"),
+        n_workers=par.get("workers"), backend=str(par.get("backend", "processes")),
+        dtype=np.dtype(spec.get("dtype", "float64")),
+    )
+
+
+def _fft_applicable(spec: Dict[str, Any]) -> bool:
+    product = spec.get("product", {})
+    return (_is_heston(spec["model"]) and str(product.get("style", "european")).lower() == "european"
+            and str(product.get("type", "")).lower() in ("european_call", "european_put"))
+
+
+def _price_fft(spec: Dict[str, Any]):
+    """
+    engine 'fft': Carr–Madan sobre a função característica do Heston.
+    ``alpha``, ``N`` e ``eta`` vêm do spec (ou de ``grid``). ``product.K``
+    pode ser uma lista de strikes: a escada inteira sai de uma FFT e o
+    retorno é (array de preços, zeros).
+    """
+    if not _fft_applicable(spec):
+        raise ValueError("engine='fft' suporta european_call/european_put no modelo Heston.")
+    eng, _, S0 = build_engine_from_spec(spec)
+    product = spec["product"]
+    grid = spec.get("grid", {})
+    opt = {k: spec.get(k, grid.get(k, d)) for k, d in (("alpha", 1.5), ("N", 4096), ("eta", 0.25))}
+    a = int(product.get("asset", 0))
+    kind = "call" if str(product["type"]).lower() == "european_call" else "put"
+    p = fft_prices(eng.model, float(S0[a]), float(grid.get("T", 1.0)), product["K"], kind,
+                   float(opt["alpha"]), int(opt["N"]), float(opt["eta"]))
+    if p.ndim == 0:
+        return float(p), 0.0
+    return p, np.zeros_like(p)
+
+
+def _vanilla_kind(product: Dict[str, Any]) -> str | None:
+    if str(product.get("style", "european")).lower() != "european":
+        return None
+    return {"european_call": "call", "european_put": "put"}.get(str(product.get("type", "")).lower())
+
+
+def _price_cos(spec: Dict[str, Any]):
+    """
+    engine 'cos': método COS (Fang–Oosterlee) sobre a função característica
+    registrada em ``models.charfn.CHARFNS`` para ``model.name`` (gbm, heston,
+    merton, vg, ...). ``product.K`` e ``grid.T`` podem ser listas: todos os
+    strikes/maturidades numa avaliação vetorizada, retorno (array, zeros).
+    Opções ``N`` (nº de termos, padrão 256) e ``L`` (largura do intervalo em
+    desvios dos cumulantes, padrão 10), no spec ou em ``grid``.
+    """
+    product = spec["product"]
+    kind = _vanilla_kind(product)
+    if kind is None:
+        raise ValueError("engine='cos' suporta european_call/european_put.")
+    model = spec["model"]
+    name = str(model.get("name", "gbm")).lower()
+    a = int(product.get("asset", 0))
+    if name in ("gbm", "heston"):
+        cf = model_charfn(build_engine_from_spec(spec)[0].model, a)
+    else:
+        params = {k: v for k, v in model.items() if k not in ("name", "r", "r_curve")}
+        cf = get_charfn(name, _build_curve(model), **params)
+    grid = spec.get("grid", {})
+    T = grid.get("T", 1.0)
+    S0 = spec.get("S0", [100.0])
+    p = cos_prices(cf, float(S0[a]), product["K"], T, kind,
+                   N=int(spec.get("N", grid.get("N", 256))), L=float(spec.get("L", grid.get("L", 10.0))))
+    if np.ndim(p) == 0:
+        return float(p), 0.0
+    return p, np.zeros_like(p)
+
+
+def _pde_terminal(product: Dict[str, Any], T: float):
+    """
+    (payoff em S_T vetorizado, barreira superior, exercício imediato) para a
+    PDE; None se o produto não é de um ativo/terminal. Com exercício, só
+    ``european_call``/``european_put`` (o mesmo put/call de ``_build_exercise``).
+    """
+    ptype = str(product.get("type", "")).lower()
+    if str(product.get("style", "european")).lower() != "european":
+        # só vanillas: outros tipos "call"/"put" (asiática, basket...) não são funções de S_t
+        if "K" not in product or ptype not in ("european_call", "european_put"):
+            return None
+        K = float(product["K"])
+        g = (lambda S: np.maximum(K - S, 0.0)) if ptype == "european_put" else (lambda S: np.maximum(S - K, 0.0))
+        return g, None, g
+    if ptype == "up_and_out_call":
+        K = float(product["K"])
+        return (lambda S: np.maximum(S - K, 0.0)), float(product["barrier"]), None
+    try:
+        payoff = _build_payoff(product)
+    except (ValueError, KeyError):
+        return None
+    if not getattr(payoff, "terminal_only", False):
+        return None
+    times = np.array([0.0, T])
+    return (lambda S: np.asarray(payoff({"times": times, "S": np.repeat(S[:, None, None], 2, axis=1)}), dtype=float)), None, None
+
+
+def _pde_applicable(spec: Dict[str, Any]) -> bool:
+    model, product = spec["model"], spec["product"]
+    return (str(model.get("name", "gbm")).lower() == "gbm" and len(spec.get("S0", [100.0])) == 1
+            and _pde_terminal(product, 1.0) is not None)
+
+
+def _pde_setup(spec: Dict[str, Any]):
+    """(PDEEngine, S0, T, kwargs de ``PDEEngine.price``) a partir do spec."""
+    if not _pde_applicable(spec):
+        raise ValueError("engine='pde' suporta produtos terminais/up_and_out_call e put/call com exercicio de um ativo GBM.")
+    eng, times, S0 = build_engine_from_spec(spec)
+    product = spec["product"]
+    grid = spec.get("grid", {})
+    opt = {k: spec.get(k, grid.get(k, d))
+           for k, d in (("NS", 400), ("NT", 400), ("Smax_mult", 5.0), ("lcp", "auto"))}
+    T = float(grid.get("T", 1.0))
+    terminal, upper, exercise = _pde_terminal(product, T)
+    monitor = None
+    if upper is not None and str(product.get("monitoring", "discrete")).lower() != "continuous":
+        monitor = times[1:]  # mesmas datas em que o MC verifica a barreira
+    ex_times = None
+    if str(product.get("style", "european")).lower() == "bermudan":
+        ex_times = times[_build_exercise(product, times).exercise_idx]
+    pde = PDEEngine(eng.model, int(opt["NS"]), int(opt["NT"]), float(opt["Smax_mult"]),
+                    asset=int(product.get("asset", 0)))
+    K = product.get("K", product.get("K1"))
+    kw = dict(terminal=terminal, T=T, K=None if K is None else float(K), upper=upper,
+              exercise=exercise, exercise_times=ex_times, lcp=str(opt["lcp"]), monitor_times=monitor)
+    return pde, float(S0[0]), kw
+
+
+def _price_pde(spec: Dict[str, Any]):
+    """
+    engine 'pde': Crank–Nicolson em ln S (``engine.pde.PDEEngine``) para um
+    ativo GBM — vanillas, digitais, gap e up_and_out_call, e puts/calls
+    americanos/bermudanos. Com monitoramento discreto (padrão) a barreira é
+    verificada nas mesmas ``grid.steps`` datas do MC (knock-out na grade de
+    tempo da PDE); com ``"monitoring": "continuous"`` ela é a borda da grade. As datas
+    bermudanas vêm de ``_build_exercise`` na grade de MC (``grid.steps``),
+    então ``exercise_idx``/``exercise_times``/``exercise_every`` significam o
+    mesmo nos dois motores. ``NS``, ``NT``, ``Smax_mult`` e ``lcp``
+    ("auto" | "brennan_schwartz" | "policy") no spec ou em ``grid``.
+    """
+    pde, S0, kw = _pde_setup(spec)
+    return pde.price(S0=S0, **kw), 0.0
+
+
+def pde_ladder_from_spec(spec: Dict[str, Any], S: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+    """
+    Preço e gregas em uma escada de spots com UMA solução da PDE (mesmos
+    produtos/parâmetros de engine='pde'): {"S", "price", "delta", "gamma",
+    "theta"} como arrays. ``S`` (ou ``spec["S0_ladder"]``) é uma lista de
+    spots ou {"min", "max", "n"} (espaçamento uniforme) e substitui o S0 do
+    spec. A grade cobre a escada inteira, então use NS proporcional à
+    largura da faixa.
+    """
+    S = spec.get("S0_ladder") if S is None else S
+    if S is None:
+        raise ValueError("pde_ladder_from_spec exige S ou spec['S0_ladder'].")
+    if isinstance(S, dict):
+        S = np.linspace(float(S["min"]), float(S["max"]), int(S.get("n", 400)))
+    pde, _, kw = _pde_setup(spec)
+    return pde.ladder(S=S, **kw)
+
+
+def _price_mlmc(spec: Dict[str, Any]):
+    """
+    engine 'mlmc': Monte Carlo multinível até ``target_rmse``. A grade de cada
+    nível é n0 M^l passos até grid.T (``"mlmc": {"n0", "M", "n_pilot",
+    "min_level", "max_level"}``); ``grid.steps`` não é usado.
+    """
+    product = spec["product"]
+    if str(product.get("style", "european")).lower() != "european":
+        raise ValueError("engine='mlmc' aceita apenas produtos europeus/path-dependentes (sem exercicio).")
+    if "fixing_idx" in product or "fixing_times" in product:
+        raise ValueError("engine='mlmc' usa grades de tamanhos diferentes; fixings explicitos nao sao suportados.")
+    if "target_rmse" not in spec:
+        raise ValueError("engine='mlmc' exige 'target_rmse'.")
+    if _is_heston(spec["model"]):
+        raise ValueError("engine='mlmc' exige passos GBM exatos (grade grossa = fina amostrada); use 'mc' no Heston.")
+    eng, times, S0 = build_engine_from_spec(spec)
+    ml = spec.get("mlmc", {})
+    return mlmc_price(
+        eng.model, _build_payoff(product, model=spec["model"]), S0, float(times[-1]),
+        target_rmse=float(spec["target_rmse"]),
+        n0=int(ml.get("n0", 4)),
+        M=int(ml.get("M", 2)),
+        n_pilot=int(ml.get("n_pilot", 2_000)),
+        min_level=int(ml.get("min_level", 2)),
+        max_level=int(ml.get("max_level", 10)),
+        seed=spec.get("seed"),
+    )
+
+
+_STORE_IGNORED = ("target_se", "target_rel_se", "importance_shift")
+
+
+def _path_store(spec: Dict[str, Any], eng: MonteCarloEngine, times: np.ndarray, S0: list, dtype) -> PathStore:
+    """
+    "path_store": "<arquivo>.npy" (ou {"path": ..., "rebuild": bool}) —
+    reabre o store se o arquivo existe, senão simula n_paths/seed/dtype do
+    spec para ele em blocos de ``chunk_size``. Ao reabrir, modelo, grade,
+    S0, dtype e (quando dados no spec) n_paths/seed precisam conferir com os
+    metadados: divergência é erro, ou re-simulação com ``"rebuild": True``.
+    Opções que o store não usa (alvos de SE, sampler, importance_shift) são
+    rejeitadas.
+    """
+    ignored = [k for k in _STORE_IGNORED if spec.get(k) is not None]
+    if str(spec.get("sampler", "pseudo")).lower() != "pseudo":
+        ignored.append("sampler")
+    if ignored:
+        raise ValueError(f"path_store usa os caminhos gravados; opcoes nao suportadas: {ignored}")
+    cfg = spec["path_store"]
+    path = cfg["path"] if isinstance(cfg, dict) else str(cfg)
+    rebuild = bool(cfg.get("rebuild", False)) if isinstance(cfg, dict) else False
+    if os.path.exists(path):
+        store = PathStore.open(path)
+        m = store.meta
+        diff = []
+        try:
+            store.check_model(eng.model)
+        except ValueError:
+            diff.append("modelo")
+        if not (len(store.times) == len(times) and np.allclose(store.times, times)):
+            diff.append("grade")
+        if not np.allclose(store.S0, S0):
+            diff.append("S0")
+        if np.dtype(m["dtype"]) != np.dtype(dtype):
+            diff.append("dtype")
+        if "n_paths" in spec and int(spec["n_paths"]) != int(m["n_paths"]):
+            diff.append("n_paths")
+        if spec.get("seed") is not None and int(spec["seed"]) != int(m["seed"]):
+            diff.append("seed")
+        if not diff:
+            return store
+        if not rebuild:
+            raise ValueError(f"{path}: store difere do spec em {diff}; use {{'path': ..., 'rebuild': True}} para re-simular.")
+        del store
+    return PathStore.create(
+        path, eng.model, S0, times,
+        n_paths=int(spec.get("n_paths", 100_000)),
+        seed=spec.get("seed"),
+        chunk_size=int(spec.get("chunk_size") or 100_000),
+        dtype=dtype,
+        overwrite=rebuild,
+    )
+
+
 def price_from_spec(spec: Dict[str, Any]):
     """
     Roteia a DSL para:
       - engine 'analytic'/'auto': tenta primeiro JUROS (IR) e depois Equity (BS/Haug/Margrabe),
-      - caso não aplicável, cai para MC/LSMC (GBM).
+      - em 'auto', europeias no Heston vão para FFT (Carr–Madan),
+      - caso não aplicável, cai para MC/LSMC (GBM/Heston),
+      - engine 'fft': Carr–Madan (Heston; ``product.K`` pode ser lista),
+      - engine 'cos': Fang–Oosterlee sobre funções características registradas
+        (gbm/heston/merton/vg; strikes e maturidades em lista),
+      - engine 'pde': Crank–Nicolson 1D (GBM; vanillas, digitais, barreira contínua,
+        americanas/bermudanas — também escolhida por 'auto' nesses casos),
+      - engine 'mlmc': Monte Carlo multinível com RMSE alvo (``target_rmse``).
+
+    Com ``"products": [...]`` (em vez de ``"product"``) o book inteiro é
+    precificado por MC numa única simulação; retorna (preços, SEs, cov).
     """
     engine = str(spec.get("engine", "mc")).lower()
 
-    if engine in ("analytic", "auto"):
+    if engine == "analytic" and "products" in spec:
+        raise ValueError("'products' e precificado por MC numa simulacao compartilhada; use engine='mc' ou 'auto'.")
+    if engine in ("analytic", "auto") and "products" not in spec:
         # 1) tenta analítico de IR (FRA/swap/cap/floor/swaption) primeiro
         try:
             return _analytic_ir_price(spec["model"], spec.get("grid", {}), spec["product"])
@@ -312,26 +690,77 @@ def price_from_spec(spec: Dict[str, Any]):
         if out is not None:
             return out
 
-        # 3) se era estritamente 'analytic' e nada serviu, avisa
+        # 3) Heston europeu: FFT (Carr–Madan); modelos só com função característica: COS
+        if engine == "auto" and _fft_applicable(spec):
+            return _price_fft(spec)
+        if engine == "auto" and str(spec["model"].get("name", "")).lower() in CHARFNS and _vanilla_kind(spec["product"]):
+            return _price_cos(spec)
+        # 4) barreira contínua e exercício antecipado (GBM, um ativo): PDE
+        if (engine == "auto" and _pde_applicable(spec)
+                and (str(spec["product"].get("monitoring", "discrete")).lower() == "continuous"
+                     or str(spec["product"].get("style", "european")).lower() != "european")):
+            return _price_pde(spec)
+
+        # 5) se era estritamente 'analytic' e nada serviu, avisa
         if engine == "analytic":
             raise ValueError("engine='analytic' não suporta este payoff/modelo. Tente 'mc' (ou 'pde'/'fft' se disponível).")
 
+    if engine == "mlmc":
+        return _price_mlmc(spec)
+    if engine == "fft":
+        return _price_fft(spec)
+    if engine == "cos":
+        return _price_cos(spec)
+    if engine == "pde":
+        return _price_pde(spec)
+
     # === MC/LSMC (default) ===
     eng, times, S0 = build_engine_from_spec(spec)
+    if "products" in spec:
+        return _price_book(spec, eng, times, S0)
     product = spec["product"]
     style = product.get("style", "european").lower()
+    par = spec.get("parallel", {})
+    n_workers = par.get("workers")
+    backend = str(par.get("backend", "processes"))
+    dtype = np.dtype(spec.get("dtype", "float64"))
+    store = _path_store(spec, eng, times, S0, dtype) if spec.get("path_store") else None
+    block_size = int(spec.get("chunk_size") or 100_000)
 
     if style == "european":
-        payoff = _build_payoff(product)
+        payoff = _build_payoff(product, times, spec["model"])
+        cvs = None
+        if str(spec.get("control_variates", "")).lower() == "auto":
+            cvs = _auto_control_variates(spec, product, times) or None
+        if store is not None:
+            return eng.price_store(payoff, store, control_variate=cvs, block_size=block_size,
+                                   n_workers=n_workers, backend=backend, trace=bool(spec.get("trace", False)))
         return eng.price(
             payoff, S0, times,
+            control_variate=cvs,
             n_paths=int(spec.get("n_paths", 100_000)),
             seed=spec.get("seed"),
+            chunk_size=spec.get("chunk_size"),
+            max_memory_mb=spec.get("max_memory_mb"),
+            n_workers=n_workers, backend=backend,
+            sampler=str(spec.get("sampler", "pseudo")),
+            qmc_replications=int(spec.get("qmc_replications", 16)),
+            dtype=dtype,
+            target_se=spec.get("target_se"),
+            target_rel_se=spec.get("target_rel_se"),
+            max_paths=int(spec.get("max_paths", 10_000_000)),
+            importance_shift=spec.get("importance_shift"),
+            trace=bool(spec.get("trace", False)),
         )
     else:
         ex = _build_exercise(product, times)
+        if store is not None:
+            if par:
+                raise ValueError("path_store com exercicio (LSMC em blocos) e serial; remova 'parallel'.")
+            return lsmc_price(eng.model, store.paths(), ex, store.times, block_size=block_size)
         return eng.price_exercisable(
             ex, S0, times,
             n_paths=int(spec.get("n_paths", 120_000)),
             seed=spec.get("seed"),
+            n_workers=n_workers, backend=backend, dtype=dtype,
         )
@@ -0,0 +1,152 @@
+# src/derivx/engine/cache.py
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from ..models.gbm import RiskNeutralGBM
+
+
+def path_key(
+    model: RiskNeutralGBM,
+    S0: Sequence[float],
+    times: np.ndarray,
+    n_paths: int,
+    antithetic: bool,
+    seed: int,
+    dtype=np.float64,
+    obs_idx: Optional[Sequence[int]] = None,
+    is_shift: Optional[Sequence[float]] = None,
+) -> str:
+    """
+    Hash canônico (SHA-1) de tudo o que determina ``simulate_paths``.
+    O modelo entra pelos valores que a simulação usa — drift/vol por passo
+    da grade, nós/taxas da curva e correlação — e não pelos callables de
+    q/sigma, então modelos equivalentes construídos de novo compartilham a
+    entrada (modelos sem ``_grid_schedule``, como o Heston, entram pelos
+    parâmetros escalares). ``obs_idx`` é normalizado como em ``simulate_paths``.
+    """
+    times = np.asarray(times, dtype=float)
+    if hasattr(model, "_grid_schedule"):
+        drift, vol = model._grid_schedule(times)
+    else:
+        # outros modelos (ex.: Heston): parâmetros escalares do dataclass
+        drift = np.array([float(getattr(model, f.name)) for f in fields(model)
+                          if isinstance(getattr(model, f.name), (int, float))])
+        vol = np.frombuffer(type(model).__name__.encode(), dtype=np.uint8)
+    if obs_idx is not None:
+        # mesmas colunas de simulate_paths: t0 e T sempre; a grade toda equivale a None
+        Tn = len(times) - 1
+        obs_idx = np.unique(np.concatenate(([0], np.asarray(obs_idx, dtype=int), [Tn])))
+        if len(obs_idx) == Tn + 1:
+            obs_idx = None
+    h = hashlib.sha1()
+    for a in (drift, vol, model.r_curve.times, model.r_curve.rates, model.corr, np.asarray(S0, dtype=float), times):
+        h.update(np.ascontiguousarray(a, dtype=float).tobytes())
+        h.update(b"|")
+    h.update(repr((int(n_paths), bool(antithetic), int(seed), np.dtype(dtype).str)).encode())
+    for a in (obs_idx, is_shift):
+        h.update(b"-" if a is None else np.ascontiguousarray(a, dtype=float).tobytes())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def _frozen(v):
+    if not isinstance(v, np.ndarray):
+        return v
+    w = v.copy() if v.ndim <= 1 else v.view()
+    w.setflags(write=False)
+    return w
+
+
+def _nbytes(paths: Dict[str, np.ndarray]) -> int:
+    return sum(v.nbytes for v in paths.values() if isinstance(v, np.ndarray))
+
+
+@dataclass
+class PathCache:
+    """
+    Cache LRU de conjuntos de caminhos simulados, limitado a ``max_bytes``.
+
+    As entradas guardam o dict de ``simulate_paths`` com arrays somente
+    leitura (um payoff que tente escrever nelas falha em vez de corromper o
+    cache); ``get`` devolve uma cópia rasa do dict. Conjuntos maiores que o
+    orçamento não são guardados. Seguro para uso entre threads.
+    """
+    max_bytes: int = 512 * 1024 * 1024
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _store: "OrderedDict[str, Dict[str, np.ndarray]]" = field(default_factory=OrderedDict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(_nbytes(p) for p in self._store.values())
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        with self._lock:
+            paths = self._store.get(key)
+            if paths is None:
+                self.misses += 1
+                return None
+            self._store.move_to_end(key)
+            self.hits += 1
+            return dict(paths)
+
+    def put(self, key: str, paths: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Guarda ``paths`` como views somente leitura (os arrays de quem chamou
+        continuam graváveis; os 1-D, como ``times``, que podem ser do próprio
+        chamador, são copiados) e remove as entradas menos usadas até caber.
+        """
+        paths = {k: _frozen(v) for k, v in paths.items()}
+        size = _nbytes(paths)
+        with self._lock:
+            if size > self.max_bytes:
+                return dict(paths)
+            self._store.pop(key, None)
+            used = sum(_nbytes(p) for p in self._store.values())
+            while self._store and used + size > self.max_bytes:
+                _, old = self._store.popitem(last=False)
+                used -= _nbytes(old)
+                self.evictions += 1
+            self._store[key] = paths
+        return dict(paths)
+
+    def get_or_simulate(self, key: str, simulate: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        paths = self.get(key)
+        return paths if paths is not None else self.put(key, simulate())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """{"hits", "misses", "evictions", "entries", "bytes", "max_bytes"}."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._store), "bytes": sum(_nbytes(p) for p in self._store.values()),
+                    "max_bytes": self.max_bytes}
+
+
+_SHARED: Optional[PathCache] = None
+
+
+def shared_path_cache(max_mb: Optional[float] = None) -> PathCache:
+    """Cache do processo usado pela DSL (``"path_cache"``); ``max_mb`` redefine o orçamento."""
+    global _SHARED
+    if _SHARED is None:
+        _SHARED = PathCache()
+    if max_mb is not None:
+        _SHARED.max_bytes = int(max_mb * 1024 * 1024)
+    return _SHARED
@@ -0,0 +1,191 @@
+# src/derivx/engine/greeks.py
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+from numpy.random import Generator, PCG64
+
+from ..models.gbm import RiskNeutralGBM
+from ..payoffs.core import required_indices
+
+
+# ---------------------------------------------------------------------------
+# Passos exatos entre colunas simuladas
+# ---------------------------------------------------------------------------
+def _intervals(model: RiskNeutralGBM, times: np.ndarray, cols: np.ndarray):
+    """
+    Para cada intervalo k entre colunas consecutivas: log S sobe
+    X_k = m_k + L_k Z_k, com C_k = L_k L_k^T.
+    Retorna (m (K, d), L (K, d, d), w (K, d), tau (K,)), onde
+    w_k = integral de sigma no intervalo (dC_k/dsigma_a depende só de w)
+    e tau_k é a duração do intervalo.
+    """
+    dts = np.diff(times)
+    if len(cols) == len(times):
+        drift, vol = model._grid_schedule(times)
+        m, L = drift, vol[:, :, None] * model._chol[None, :, :]
+    else:
+        m, L = model._observed_schedule(times, cols)
+    mids = 0.5 * (times[:-1] + times[1:])
+    sig = np.array([[f(t) for f in model.sigma_funcs] for t in mids])
+    w = np.add.reduceat(sig * dts[:, None], cols[:-1], axis=0)
+    tau = np.diff(times[cols])
+    return m, L, w, tau
+
+
+def _draw(model: RiskNeutralGBM, payoff: Callable, times: np.ndarray, n_paths: int, antithetic: bool, seed):
+    """Colunas a simular (datas lidas pelo payoff) e as normais Z, como em ``MonteCarloEngine.price``."""
+    Tn = len(times) - 1
+    idx = required_indices([payoff], len(times))
+    cols = np.arange(Tn + 1) if idx is None else np.unique(np.concatenate(([0], idx, [Tn])))
+    Z = model._draw_normals(Generator(PCG64(seed)), n_paths, len(cols) - 1, antithetic)
+    return cols, Z
+
+
+def _paths(
+    model: RiskNeutralGBM, S0: np.ndarray, times: np.ndarray, cols: np.ndarray,
+    Z: np.ndarray, m: np.ndarray, L: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """Caminhos S0 exp(cumsum(m + L Z)) nas colunas ``cols``."""
+    S = np.empty((Z.shape[0], len(cols), model.dim))
+    S[:, 1:, :] = m[None, :, :] + np.einsum("kij,nkj->nki", L, Z)
+    model._exp_cumsum(S0, S)
+    if len(cols) == len(times):
+        return {"times": times, "S": S}
+    return {"times": times[cols], "S": S, "idx": cols}
+
+
+def _d_chol(L: np.ndarray, dC: np.ndarray) -> np.ndarray:
+    """dL para dC (lotes (K, d, d)): dL = L Phi(L^-1 dC L^-T), Phi = triângulo inferior com meia diagonal."""
+    Linv = np.linalg.inv(L)
+    M = Linv @ dC @ np.swapaxes(Linv, 1, 2)
+    Phi = np.tril(M, -1) + 0.5 * np.einsum("kii->ki", M)[:, :, None] * np.eye(L.shape[1])[None]
+    return L @ Phi
+
+
+def _dC_dsigma(corr: np.ndarray, w: np.ndarray, a: int) -> np.ndarray:
+    """dC_k/dsigma_a (choque paralelo na curva sigma_a): rho_ij (delta_ia w_j + delta_ja w_i)."""
+    K, d = w.shape
+    dC = np.zeros((K, d, d))
+    dC[:, a, :] += corr[a][None, :] * w
+    dC[:, :, a] += corr[:, a][None, :] * w
+    return dC
+
+
+def _mean_se(x: np.ndarray):
+    return float(x.mean()), float(x.std(ddof=1) / np.sqrt(x.size))
+
+
+# ---------------------------------------------------------------------------
+# Greeks
+# ---------------------------------------------------------------------------
+def mc_greeks(
+    model: RiskNeutralGBM,
+    payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+    S0: Sequence[float],
+    times: np.ndarray,
+    n_paths: int = 100_000,
+    antithetic: bool = True,
+    seed: Optional[int] = None,
+    method: str = "auto",
+) -> Dict[str, object]:
+    """
+    Preço, delta, gamma, vega e rho numa única simulação.
+
+    Convenções: delta_i = dV/dS0_i, gamma_i = d2V/dS0_i^2 (diagonal),
+    vega_i = dV/dsigma_i (choque paralelo em sigma_i(t)), rho = dV/dr
+    (choque paralelo na curva, incluindo o desconto).
+
+    method:
+      - "pathwise": derivada do payoff ao longo do caminho (exige
+        ``Payoff.grad``; payoffs Lipschitz); gamma misto
+        E[D G (u_1 - 1) / S0], G = delta pathwise, u_1 = score do 1º passo
+      - "lr":       likelihood ratio — pesos de score sobre o payoff; serve
+        para payoffs descontínuos (digitais, gap, barreiras). Delta e gamma
+        usam só o 1º passo: a variância cresce se ele for curto
+      - "auto":     pathwise se o payoff tiver ``grad``, senão LR
+
+    Payoffs cuja fórmula usa a própria vol (barreira com ponte browniana)
+    declaram ``Payoff.dsigma``; esse termo explícito entra na vega dos dois
+    métodos.
+
+    Os caminhos são os mesmos de ``MonteCarloEngine.price`` para a mesma seed
+    (mesmas datas simuladas, mesmo fluxo de normais).
+
+    Retorna {"price", "delta", "gamma", "vega", "rho", "se": {...}, "method"};
+    delta/gamma/vega são arrays (dim,).
+    """
+    if not isinstance(model, RiskNeutralGBM):
+        raise ValueError(f"mc_greeks suporta apenas RiskNeutralGBM (recebido {type(model).__name__}).")
+    method = method.lower()
+    grad = getattr(payoff, "grad", None)
+    if method == "auto":
+        method = "pathwise" if grad is not None else "lr"
+    if method not in ("pathwise", "lr"):
+        raise ValueError(f"method nao suportado: {method}")
+    if method == "pathwise" and grad is None:
+        raise ValueError("Greeks pathwise exigem Payoff.grad; use method='lr'.")
+
+    S0 = np.asarray(S0, dtype=float)
+    times = np.asarray(times, dtype=float)
+    cols, Z = _draw(model, payoff, times, n_paths, antithetic, seed)
+    m, L, w, tau = _intervals(model, times, cols)
+    paths = _paths(model, S0, times, cols, Z, m, L)
+    S = paths["S"]
+
+    T = float(times[-1])
+    D = model.df(0.0, T)
+    F = D * np.asarray(payoff(paths), dtype=float)
+    if F.ndim == 0:
+        F = np.full((n_paths,), float(F))
+
+    Linv = np.linalg.inv(L)
+    u = np.einsum("nkj,kji->nki", Z, Linv)  # u_k = C_k^-1 (X_k - m_k) = L_k^-T Z_k
+    u1 = u[:, 0, :]
+
+    samples: Dict[str, np.ndarray] = {"price": F}
+    if method == "lr":
+        Cinv1 = np.einsum("ji,jk->ik", Linv[0], Linv[0])
+        samples["delta"] = F[:, None] * u1 / S0[None, :]
+        samples["gamma"] = F[:, None] * (u1 ** 2 - u1 - np.diag(Cinv1)[None, :]) / S0[None, :] ** 2
+        samples["rho"] = F * (u.sum(axis=2) @ tau - T)
+        Cinv = np.einsum("kji,kjl->kil", Linv, Linv)
+        vega = []
+        for a in range(model.dim):
+            rw = model.corr[a][None, :] * w                                  # (K, d): rho_aj w_j
+            score = (-(Cinv[:, a, :] * rw).sum(axis=1)[None, :]              # -1/2 tr(C^-1 dC)
+                     - u[:, :, a] * w[None, :, a]                            # u^T dm
+                     + u[:, :, a] * (u * rw[None, :, :]).sum(axis=2))        # 1/2 u^T dC u
+            vega.append(F * score.sum(axis=1))
+        samples["vega"] = np.column_stack(vega)
+    else:
+        GS = D * np.asarray(grad(paths), dtype=float) * S                   # D dF/dS * S
+        G = GS.sum(axis=1) / S0[None, :]                                     # delta pathwise
+        samples["delta"] = G
+        samples["gamma"] = G * (u1 - 1.0) / S0[None, :]
+        t_cols = times[cols] - times[0]
+        samples["rho"] = np.einsum("njd,j->n", GS, t_cols) - T * F
+        vega = []
+        for a in range(model.dim):
+            dm = np.zeros_like(m)
+            dm[:, a] = -w[:, a]
+            dL = _d_chol(L, _dC_dsigma(model.corr, w, a))
+            dlogS = np.zeros_like(S)
+            dlogS[:, 1:, :] = np.cumsum(dm[None, :, :] + np.einsum("kij,nkj->nki", dL, Z), axis=1)
+            vega.append((GS * dlogS).sum(axis=(1, 2)))
+        samples["vega"] = np.column_stack(vega)
+
+    dsigma = getattr(payoff, "dsigma", None)
+    if dsigma is not None:
+        # vol explícita no payoff (ponte browniana): soma dF/dsigma com o caminho fixo
+        samples["vega"] = samples["vega"] + D * np.asarray(dsigma(paths), dtype=float)
+
+    out: Dict[str, object] = {"method": method, "se": {}}
+    for name, x in samples.items():
+        if x.ndim == 1:
+            out[name], out["se"][name] = _mean_se(x)
+        else:
+            out[name] = x.mean(axis=0)
+            out["se"][name] = x.std(axis=0, ddof=1) / np.sqrt(x.shape[0])
+    return out
@@ -0,0 +1,72 @@
+# src/derivx/engine/importance.py
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+from scipy.optimize import minimize
+
+from ..models.gbm import RiskNeutralGBM
+from ..payoffs.core import required_indices
+
+
+def _most_likely_paths(
+    model: RiskNeutralGBM, S0: np.ndarray, times: np.ndarray, cols: Optional[np.ndarray], z: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Caminhos determinísticos para drivers terminais z (m, dim): cada passo k
+    usa Z_k = z sqrt(tau_k / T) — o caminho mais provável com driver z.
+    """
+    grid = times if cols is None else times[cols]
+    w = np.sqrt(np.diff(grid) / times[-1])
+    Z = z[:, None, :] * w[None, :, None]
+    if cols is None:
+        return {"times": times, "S": model._paths_from_normals(S0, times, Z)}
+    return {"times": times[cols], "S": model._observed_from_normals(S0, times, cols, Z), "idx": cols}
+
+
+def optimal_shift(
+    model: RiskNeutralGBM,
+    payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+    S0: Sequence[float],
+    times: np.ndarray,
+    z_max: float = 8.0,
+    n_grid: int = 321,
+) -> np.ndarray:
+    """
+    Deslocamento mu (dim,) do driver terminal para amostragem por importância:
+    maximiza log F(path(z)) - |z|^2 / 2, com path(z) o caminho mais provável
+    de driver z (aproximação de Glasserman–Heidelberger–Shahabuddin; ótima
+    para payoffs guiados por S_T: digitais, gap, calls/puts fora do dinheiro).
+
+    Busca em grade ao longo de cada eixo e, com mais de um ativo, refina com
+    Nelder–Mead. Se o payoff é zero em toda a busca, devolve mu = 0.
+    """
+    S0 = np.asarray(S0, dtype=float)
+    times = np.asarray(times, dtype=float)
+    d = model.dim
+    Tn = len(times) - 1
+    idx = required_indices([payoff], len(times))
+    cols = None if idx is None else np.unique(np.concatenate(([0], idx, [Tn])))
+    if cols is not None and len(cols) == Tn + 1:
+        cols = None
+
+    def objective(z: np.ndarray) -> np.ndarray:
+        F = np.asarray(payoff(_most_likely_paths(model, S0, times, cols, z)), dtype=float)
+        with np.errstate(divide="ignore"):
+            return np.log(np.maximum(F, 0.0)) - 0.5 * (z ** 2).sum(axis=1)
+
+    axis = np.linspace(-z_max, z_max, n_grid)
+    cand = np.zeros((d * n_grid, d))
+    for a in range(d):
+        cand[a * n_grid:(a + 1) * n_grid, a] = axis
+    g = objective(cand)
+    if not np.isfinite(g.max()):
+        return np.zeros(d)
+    best = cand[int(np.argmax(g))]
+    if d == 1:
+        return best
+
+    res = minimize(lambda z: -float(objective(z[None, :])[0]), best, method="Nelder-Mead",
+                   options={"xatol": 1e-3, "fatol": 1e-6})
+    return res.x if np.isfinite(res.fun) and -res.fun >= g.max() else best
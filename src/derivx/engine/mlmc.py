@@ -0,0 +1,179 @@
+# src/derivx/engine/mlmc.py
+from __future__ import annotations
+
+import math
+import warnings
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+from numpy.random import Generator, PCG64
+
+from ..models.gbm import RiskNeutralGBM
+from .montecarlo import MCResult
+from .stats import RunningMoments
+
+
+class MLMCResult(MCResult):
+    """
+    Resultado de ``mlmc_price``: desempacota como ``(preço, SE)``, com
+    ``n_paths`` = total de amostras (somando os níveis), ``levels`` (por nível:
+    steps, n_paths, mean, var, cost) e ``bias`` — estimativa do viés de
+    discretização restante (RMSE ~ sqrt(se^2 + bias^2)).
+    """
+
+    def __new__(cls, price: float, se: float, n_paths: int, levels: Dict[str, np.ndarray], bias: float):
+        obj = super().__new__(cls, price, se, n_paths)
+        obj.levels = levels
+        obj.bias = float(bias)
+        return obj
+
+    def __getnewargs__(self):
+        return (self[0], self[1], self.n_paths, self.levels, self.bias)
+
+
+def _level_samples(
+    model: RiskNeutralGBM,
+    payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+    S0: np.ndarray,
+    T: float,
+    steps: int,
+    M: int,
+    coarse: bool,
+    n: int,
+    antithetic: bool,
+    rng: Generator,
+    chunk_size: int,
+    acc: RunningMoments,
+) -> RunningMoments:
+    """
+    Acumula em ``acc`` n amostras de Y = D (P_fino - P_grosso).
+    O caminho grosso é o fino lido a cada M datas: os passos GBM são exatos,
+    então isso é o mesmo incremento browniano somado em blocos de M.
+    """
+    times = np.linspace(0.0, T, steps + 1)
+    D = model.df(0.0, T)
+    buf = np.empty((min(n, chunk_size), steps + 1, model.dim))
+    done = 0
+    while done < n:
+        m = min(chunk_size, n - done)
+        paths = model.simulate_paths(S0, times, m, antithetic, rng=rng, out=buf[:m])
+        Y = np.broadcast_to(np.asarray(payoff(paths), dtype=float), (m,)).copy()
+        if coarse:
+            Y -= np.asarray(payoff({"times": times[::M], "S": paths["S"][:, ::M, :]}), dtype=float)
+        acc.update(D * Y)
+        done += m
+    return acc
+
+
+def mlmc_price(
+    model: RiskNeutralGBM,
+    payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+    S0: Sequence[float],
+    T: float,
+    target_rmse: float,
+    n0: int = 4,
+    M: int = 2,
+    n_pilot: int = 2_000,
+    min_level: int = 2,
+    max_level: int = 10,
+    antithetic: bool = False,
+    seed: Optional[int] = None,
+    max_memory_mb: float = 64.0,
+) -> MLMCResult:
+    """
+    Monte Carlo multinível (Giles, 2008) para payoffs dependentes da
+    trajetória cujo viés vem da frequência de monitoração (asiáticas com
+    média na grade, barreiras): E[P_L] = E[P_0] + sum_l E[P_l - P_{l-1}],
+    com o nível l numa grade uniforme de n0 M^l passos até T.
+
+    Cada diferença usa o mesmo caminho fino para P_l e P_{l-1} (acoplamento
+    por incrementos brownianos comuns), então sua variância cai com l e os
+    níveis finos pedem poucos caminhos. Os N_l saem das variâncias
+    estimadas (N_l ~ sqrt(V_l / C_l)) para que a variância total fique em
+    target_rmse^2 / 2; novos níveis são adicionados até o viés estimado
+    (pelo decaimento de |E[P_l - P_{l-1}]|) ficar abaixo de
+    target_rmse / sqrt(2). Custo O(eps^-2) contra O(eps^-3) do MC simples.
+
+    O payoff deve ler a grade inteira (sem índices fixos de datas): o mesmo
+    callable é avaliado em grades de tamanhos diferentes.
+    """
+    if target_rmse <= 0:
+        raise ValueError("target_rmse deve ser positivo.")
+    if M < 2 or n0 < 1:
+        raise ValueError("mlmc exige M >= 2 e n0 >= 1.")
+    S0 = np.asarray(S0, dtype=float)
+    rng = Generator(PCG64(seed))
+    eps2 = float(target_rmse) ** 2
+    L = max(0, min(int(min_level), int(max_level)))
+
+    def steps(l):
+        return int(n0) * M ** l
+
+    def cost(l):
+        return steps(l) * (1.0 + 1.0 / M if l else 1.0)
+
+    def chunk(l):
+        per_path = 8 * model.dim * (3 * (steps(l) + 1))
+        return max(2, int(max_memory_mb * 1024 * 1024 // per_path))
+
+    acc = [RunningMoments(1) for _ in range(L + 1)]
+    dN = np.full(L + 1, int(n_pilot), dtype=np.int64)
+
+    while dN.sum() > 0:
+        for l in np.flatnonzero(dN > 0):
+            _level_samples(model, payoff, S0, T, steps(l), M, l > 0, int(dN[l]), antithetic, rng, chunk(l), acc[l])
+        N = np.array([a.n for a in acc], dtype=np.int64)
+        mean = np.abs([a.mean[0] for a in acc])
+        var = np.array([a.m2[0, 0] / a.n for a in acc])
+        # níveis finos com poucas amostras: não deixa a estimativa cair abaixo da tendência
+        for l in range(2, L + 1):
+            mean[l] = max(mean[l], 0.5 * mean[l - 1] / M)
+            var[l] = max(var[l], 0.5 * var[l - 1] / M)
+
+        C = np.array([cost(l) for l in range(L + 1)])
+        target = np.ceil(np.sqrt(var / C) * np.sqrt(var * C).sum() * 2.0 / eps2).astype(np.int64)
+        dN = np.maximum(target - N, 0)
+
+        if np.all(dN <= 0.01 * N):
+            alpha = max(0.5, _decay_rate(mean[1:], M)) if L >= 2 else 1.0
+            # só níveis de correção (l >= 1): mean[0] é o preço, não um termo de viés
+            bias = max((mean[L - i] / M ** (i * alpha) for i in range(min(3, L))), default=math.inf) / (M ** alpha - 1.0)
+            if bias <= math.sqrt(eps2 / 2.0):
+                break
+            if L == max_level:
+                warnings.warn(f"mlmc: max_level={max_level} atingido; vies estimado {bias:.3g} > alvo.")
+                break
+            L += 1
+            beta = max(0.5, _decay_rate(var[1:], M)) if L >= 3 else 1.0
+            var = np.append(var, var[-1] / M ** beta)
+            N = np.append(N, 0)
+            acc.append(RunningMoments(1))
+            C = np.array([cost(l) for l in range(L + 1)])
+            target = np.ceil(np.sqrt(var / C) * np.sqrt(var * C).sum() * 2.0 / eps2).astype(np.int64)
+            dN = np.maximum(target - N, 0)
+            dN[L] = max(dN[L], 2)
+
+    N = np.array([a.n for a in acc], dtype=np.int64)
+    mean_l = np.array([a.mean[0] for a in acc])
+    var_l = np.array([a.m2[0, 0] / a.n for a in acc])
+    levels = {
+        "steps": np.array([steps(l) for l in range(L + 1)]),
+        "n_paths": N.copy(),
+        "mean": mean_l,
+        "var": var_l,
+        "cost": np.array([cost(l) for l in range(L + 1)]),
+    }
+    alpha = max(0.5, _decay_rate(np.abs(mean_l[1:]), M)) if L >= 2 else 1.0
+    bias = abs(mean_l[L]) / (M ** alpha - 1.0) if L >= 1 else 0.0
+    return MLMCResult(float(mean_l.sum()), float(np.sqrt((var_l / N).sum())), int(N.sum()), levels, bias)
+
+
+def _decay_rate(x: np.ndarray, M: int) -> float:
+    """Taxa a em x_l ~ c M^(-a l), por mínimos quadrados em log (níveis l >= 1)."""
+    x = np.asarray(x, dtype=float)
+    ok = x > 0
+    if ok.sum() < 2:
+        return 0.0
+    l = np.arange(1, len(x) + 1)[ok]
+    slope = np.polyfit(l, np.log(x[ok]) / math.log(M), 1)[0]
+    return float(-slope)
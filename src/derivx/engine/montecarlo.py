@@ -2,17 +2,144 @@
 
 import math
 from dataclasses import dataclass
-from typing import Callable, Optional, Sequence, Tuple, Dict
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from numpy.random import Generator, PCG64
+
 from ..models.gbm import RiskNeutralGBM
 from ..exercise.lsmc import ExerciseSpec, lsmc_price
+from ..payoffs.core import required_indices
+from .bumps import bump_ladder
+from .cache import PathCache, path_key
+from .greeks import mc_greeks
+from .importance import optimal_shift
+from .parallel import run_parallel, split_paths, worker_seeds
+from .qmc import sobol_normals
+from .stats import RunningMoments
+from .store import PathStore
+
+
+def _chunk_from_budget(max_memory_mb: float, n_times: int, dim: int, dtype=np.float64) -> int:
+    """
+    Nº de caminhos por bloco que cabe em ``max_memory_mb``.
+    Estimativa por caminho: S (n_times x dim) + Z e sua cópia antitética
+    (~1.5 x (n_times-1) x dim) + temporários do payoff, no ``dtype`` da simulação.
+    """
+    per_path = np.dtype(dtype).itemsize * dim * (3 * n_times)
+    return max(2, int(max_memory_mb * 1024 * 1024 // per_path))
+
+
+ControlVariates = Union[Tuple[Callable, float], Sequence[Tuple[Callable, float]]]
+
+
+def _cv_list(control_variate: Optional[ControlVariates]) -> List[Tuple[Callable, float]]:
+    """Normaliza ``control_variate``: um par (payoff, valor exato) ou uma lista deles."""
+    if control_variate is None:
+        return []
+    if len(control_variate) == 2 and callable(control_variate[0]) and not callable(control_variate[1]):
+        return [tuple(control_variate)]
+    return [tuple(c) for c in control_variate]
+
+
+def _finalize(acc: RunningMoments, control_variate: Optional[ControlVariates] = None) -> Tuple[float, float]:
+    """
+    Preço e SE a partir dos momentos acumulados de [payoff, controles...].
+    Com controles, os betas saem da regressão multivariada
+    beta = Cov(Y, Y)^-1 Cov(Y, X) e preço = média(X) - beta . (média(Y) - E[Y]).
+    """
+    n, mean, cov = acc.n, acc.mean, acc.cov
+
+    price = float(mean[0])
+    var = float(cov[0, 0])
+    cvs = _cv_list(control_variate)
+    if cvs:
+        true = np.array([c[1] for c in cvs], dtype=float)
+        # lstsq: controles colineares ou constantes ficam com beta 0 em vez de quebrar
+        beta = np.linalg.lstsq(cov[1:, 1:], cov[1:, 0], rcond=None)[0]
+        price -= float(beta @ (mean[1:] - true))
+        var -= float(cov[1:, 0] @ beta)
+    return price, math.sqrt(max(var, 0.0) / n)
+
+
+def _with_cv(payoff: Callable, control_variate: Optional[ControlVariates]) -> list:
+    return [payoff] + [c[0] for c in _cv_list(control_variate)]
+
+
+def _evaluate(funcs: Sequence[Callable], paths: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    """
+    Matriz (n, len(funcs)) em float64 com cada payoff avaliado nos mesmos
+    caminhos (ponderados por paths["lr"] sob amostragem por importância).
+    """
+    out = np.empty((n, len(funcs)))
+    for j, f in enumerate(funcs):
+        out[:, j] = np.asarray(f(paths), dtype=float)  # escalar é propagado
+    if "lr" in paths:
+        out *= paths["lr"][:, None]
+    return out
+
+
+class MCResult(tuple):
+    """
+    Resultado de ``MonteCarloEngine.price``: desempacota como ``(preço, SE)``
+    e traz ``n_paths``, o número de caminhos efetivamente usados, e
+    ``trace`` ({"n_paths", "price", "se"} após cada bloco/lote) quando pedido.
+    """
+
+    def __new__(cls, price: float, se: float, n_paths: Optional[int] = None, trace: Optional[Dict] = None):
+        obj = super().__new__(cls, (float(price), float(se)))
+        obj.n_paths = n_paths
+        obj.trace = trace
+        return obj
+
+    def __getnewargs__(self):
+        return (self[0], self[1], self.n_paths, self.trace)
+
+    @property
+    def price(self) -> float:
+        return self[0]
+
+    @property
+    def se(self) -> float:
+        return self[1]
+
+
+def _store_moments(
+    funcs: Sequence[Callable], store: Union[str, PathStore], lo: int, hi: int, block_size: int, df0T: float,
+    on_block: Optional[Callable[[RunningMoments], None]] = None,
+) -> RunningMoments:
+    """Momentos dos payoffs descontados nos caminhos [lo, hi) de um ``PathStore`` (ou do arquivo, em workers)."""
+    if isinstance(store, str):
+        store = PathStore.open(store)
+    acc = RunningMoments(len(funcs))
+    for paths in store.blocks(block_size, lo, hi):
+        n = paths["S"].shape[0]
+        acc.update(df0T * _evaluate(funcs, paths, n))
+        if on_block is not None:
+            on_block(acc)
+    return acc
+
+
+def _trace(points: Optional[list]) -> Optional[Dict]:
+    """Traço de convergência {"n_paths", "price", "se"} a partir dos pontos (n, preço, SE) registrados."""
+    if points is None:
+        return None
+    n, price, se = zip(*points)
+    return {"n_paths": np.array(n, dtype=np.int64), "price": np.array(price), "se": np.array(se)}
 
 
 @dataclass
 class MonteCarloEngine:
+    """
+    Motor MC sobre ``model``. Com ``path_cache`` (``engine.cache.PathCache``)
+    as simulações de chamada única com seed inteira são guardadas e
+    reaproveitadas: reprecificar outro produto no mesmo estado de mercado
+    (modelo, S0, grade, n_paths, antitético, seed, dtype) não simula de novo.
+    """
     model: RiskNeutralGBM
+    path_cache: Optional[PathCache] = None
 
     def price(
         self,
@@ -22,30 +149,437 @@ class MonteCarloEngine:
         n_paths: int = 100_000,
         antithetic: bool = True,
         seed: Optional[int] = None,
-        control_variate: Optional[Tuple[Callable, float]] = None,
-    ) -> Tuple[float, float]:
-        """Preço para payoffs europeus / path-dependentes (sem exercício antecipado)."""
-        paths = self.model.simulate_paths(S0, times, n_paths, antithetic, seed)
-        X = np.asarray(payoff(paths), dtype=float)
-        if X.ndim == 0:
-            X = np.full((paths["S"].shape[0],), float(X))
+        control_variate: Optional[ControlVariates] = None,
+        chunk_size: Optional[int] = None,
+        max_memory_mb: Optional[float] = None,
+        n_workers: Optional[int] = None,
+        backend: str = "processes",
+        sampler: str = "pseudo",
+        qmc_replications: int = 16,
+        dtype=np.float64,
+        target_se: Optional[float] = None,
+        target_rel_se: Optional[float] = None,
+        max_paths: int = 10_000_000,
+        importance_shift: Optional[Union[str, Sequence[float]]] = None,
+        trace: bool = False,
+    ) -> MCResult:
+        """
+        Preço para payoffs europeus / path-dependentes (sem exercício antecipado).
+        Retorna ``MCResult`` (desempacota como ``(preço, SE)``; ``.n_paths``).
+
+        ``control_variate`` é um par (payoff, preço exato em t0) ou uma lista
+        deles; com vários controles os betas vêm da regressão multivariada.
+
+        Com ``chunk_size`` (ou ``max_memory_mb``) a simulação é feita em blocos:
+        cada bloco é simulado, avaliado e reduzido a média/co-momentos
+        centrais (``engine.stats.RunningMoments``), de modo que a memória de
+        pico depende do bloco e não de ``n_paths``.
+        Os blocos consomem o mesmo fluxo de normais da chamada única, então o
+        conjunto de caminhos é o mesmo (só muda a ordem da soma).
+
+        Se o payoff (e o control variate, se houver) for um ``Payoff`` que
+        declara as datas que lê, só essas datas são simuladas (passos exatos
+        entre elas); ``terminal_only`` amostra S_T em um único passo.
+
+        Com ``n_workers`` > 1 os caminhos são divididos entre workers
+        (``backend="processes"`` ou ``"threads"``), cada um simulando e avaliando
+        o payoff na sua parcela com seu fluxo independente obtido de
+        ``SeedSequence(seed).spawn(n_workers)``; os momentos de cada worker são
+        combinados no final. O resultado é reprodutível para (seed, n_workers).
+
+        ``sampler="sobol"`` usa quasi-Monte Carlo: Sobol embaralhado com ponte
+        browniana no tempo e PCA entre ativos, em ``qmc_replications`` réplicas
+        independentes (RQMC). Preço = média das réplicas e SE = desvio das
+        réplicas / sqrt(R). Cada réplica usa 2^m pontos (n_paths/R arredondado
+        para cima); antitético, blocos e workers não se aplicam.
+
+        ``dtype=np.float32`` simula os caminhos em precisão simples (metade da
+        memória e da banda); payoff descontado, somas e SE seguem em float64.
+
+        Modo adaptativo: com ``target_se`` (absoluto) ou ``target_rel_se``
+        (relativo ao |preço|) ``n_paths`` vira o lote piloto. Os lotes são
+        somados em momentos acumulados e, após cada um, o nº de caminhos
+        necessário é estimado por n * (SE/alvo)^2; para ao atingir o alvo ou
+        ``max_paths``. Mesmo fluxo de normais: o resultado com N caminhos é o
+        de uma chamada com ``n_paths=N`` (sem workers).
+
+        Amostragem por importância: ``importance_shift`` = mu (dim,) desloca a
+        média do driver gaussiano (ver ``RiskNeutralGBM.simulate_paths``) e
+        cada payoff é multiplicado pela razão de verossimilhança do caminho.
+        ``"auto"`` escolhe mu por ``engine.importance.optimal_shift`` — para
+        digitais, gap e strikes muito fora do dinheiro, onde quase todos os
+        caminhos pagariam zero.
+
+        ``trace=True`` guarda a convergência em ``MCResult.trace``: preço e SE
+        acumulados após cada bloco (sem ``chunk_size``, blocos de n_paths/32),
+        lote adaptativo, worker fundido ou réplica RQMC.
+        """
+        adaptive = target_se is not None or target_rel_se is not None
+        if (importance_shift is not None or sampler.lower() == "sobol") and not hasattr(self.model, "_paths_from_normals"):
+            raise ValueError("importance_shift/sampler='sobol' exigem o modelo GBM.")
+        if isinstance(importance_shift, str):
+            if importance_shift.lower() != "auto":
+                raise ValueError(f"importance_shift nao suportado: {importance_shift}")
+            importance_shift = optimal_shift(self.model, payoff, S0, times)
+        shift = None if importance_shift is None else np.asarray(importance_shift, dtype=float)
+        if sampler.lower() == "sobol":
+            if adaptive:
+                raise ValueError("target_se nao suportado com sampler='sobol'.")
+            if shift is not None:
+                raise ValueError("importance_shift nao suportado com sampler='sobol'.")
+            return self._price_qmc(payoff, S0, times, n_paths, seed, control_variate, qmc_replications, dtype, trace)
+        if sampler.lower() != "pseudo":
+            raise ValueError(f"sampler nao suportado: {sampler}")
+        if chunk_size is None and max_memory_mb is not None:
+            chunk_size = _chunk_from_budget(max_memory_mb, len(times), self.model.dim, dtype)
+        points: Optional[list] = [] if trace else None
+        record = None if points is None else (lambda acc: points.append((acc.n, *_finalize(acc, control_variate))))
+        if adaptive:
+            return self._price_adaptive(
+                payoff, S0, times, n_paths, antithetic, seed, control_variate, chunk_size,
+                n_workers, backend, dtype, target_se, target_rel_se, max_paths, shift, record, points,
+            )
+        funcs = _with_cv(payoff, control_variate)
+        if n_workers is not None and n_workers > 1:
+            acc = self._parallel_moments(
+                funcs, S0, times, n_paths, antithetic, worker_seeds(seed, n_workers), chunk_size, backend, dtype,
+                shift, record,
+            )
+            return MCResult(*_finalize(acc, control_variate), acc.n, _trace(points))
+        if trace and chunk_size is None:
+            chunk_size = max(2, math.ceil(n_paths / 32))
+        if chunk_size is not None and chunk_size < n_paths:
+            acc = self._moments(funcs, S0, times, n_paths, antithetic, seed, int(chunk_size), dtype, shift,
+                                on_chunk=record)
+            return MCResult(*_finalize(acc, control_variate), acc.n, _trace(points))
+
+        paths = self._simulate(funcs, S0, times, n_paths, antithetic, seed, dtype, shift)
+        df0T = self.model.df(0.0, float(times[-1]))
+        block = df0T * _evaluate(funcs, paths, n_paths)
+        if len(funcs) == 1:
+            X = block[:, 0]
+            price, se = X.mean(), X.std(ddof=1) / math.sqrt(n_paths)
+        else:
+            price, se = _finalize(RunningMoments(len(funcs)).update(block), control_variate)
+        if points is not None:
+            points.append((n_paths, price, se))
+        return MCResult(price, se, n_paths, _trace(points))
+
+    def price_many(
+        self,
+        payoffs: Sequence[Callable[[Dict[str, np.ndarray]], np.ndarray]],
+        S0: Sequence[float],
+        times: np.ndarray,
+        n_paths: int = 100_000,
+        antithetic: bool = True,
+        seed: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_memory_mb: Optional[float] = None,
+        n_workers: Optional[int] = None,
+        backend: str = "processes",
+        dtype=np.float64,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Precifica um book de payoffs europeus/path-dependentes numa única
+        simulação: todos são avaliados nos mesmos caminhos.
+
+        Retorna (preços, SEs, cov), com cov[i, j] a covariância entre os
+        estimadores de preço i e j (útil para o SE de combinações do book:
+        var(w @ preços) = w @ cov @ w). As datas simuladas são a união das
+        declaradas pelos payoffs (``Payoff.obs``); blocos, orçamento de memória,
+        workers e ``dtype`` funcionam como em ``price``.
+        """
+        funcs = list(payoffs)
+        if not funcs:
+            raise ValueError("payoffs vazio.")
+        if chunk_size is None and max_memory_mb is not None:
+            chunk_size = _chunk_from_budget(max_memory_mb, len(times), self.model.dim, dtype)
+        if n_workers is not None and n_workers > 1:
+            acc = self._parallel_moments(
+                funcs, S0, times, n_paths, antithetic, worker_seeds(seed, n_workers), chunk_size, backend, dtype
+            )
+        elif self.path_cache is not None and (chunk_size is None or chunk_size >= n_paths):
+            paths = self._simulate(funcs, S0, times, n_paths, antithetic, seed, dtype)
+            df0T = self.model.df(0.0, float(times[-1]))
+            acc = RunningMoments(len(funcs)).update(df0T * _evaluate(funcs, paths, n_paths))
+        else:
+            acc = self._moments(funcs, S0, times, n_paths, antithetic, seed, chunk_size, dtype)
+
+        cov = acc.cov / acc.n
+        return acc.mean.copy(), np.sqrt(np.clip(np.diag(cov), 0.0, None)), cov
+
+    def price_store(
+        self,
+        payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+        store: PathStore,
+        control_variate: Optional[ControlVariates] = None,
+        block_size: int = 100_000,
+        n_workers: Optional[int] = None,
+        backend: str = "processes",
+        trace: bool = False,
+    ) -> MCResult:
+        """
+        Preço sobre os caminhos de um ``PathStore`` (memmap em disco), lidos em
+        blocos de ``block_size`` sem cópia: a memória de pico é um bloco de
+        payoffs, qualquer que seja o nº de caminhos. Com ``n_workers`` > 1 cada
+        worker reabre o arquivo e processa uma faixa contígua; os momentos são
+        fundidos na ordem. O modelo do motor precisa ser o do store.
+        """
+        store.check_model(self.model)
+        funcs = _with_cv(payoff, control_variate)
+        df0T = self.model.df(0.0, float(store.times[-1]))
+        points: Optional[list] = [] if trace else None
+        record = None if points is None else (lambda acc: points.append((acc.n, *_finalize(acc, control_variate))))
+        if n_workers is not None and n_workers > 1:
+            bounds = np.cumsum([0] + split_paths(len(store), n_workers))
+            tasks = [(funcs, store.path, int(lo), int(hi), block_size, df0T) for lo, hi in zip(bounds[:-1], bounds[1:])]
+            acc = RunningMoments(len(funcs))
+            for part in run_parallel(_store_moments, tasks, backend):
+                acc.merge(part)
+                if record is not None:
+                    record(acc)
+        else:
+            acc = _store_moments(funcs, store, 0, len(store), block_size, df0T, record)
+        return MCResult(*_finalize(acc, control_variate), acc.n, _trace(points))
+
+    def greeks(
+        self,
+        payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+        S0: Sequence[float],
+        times: np.ndarray,
+        n_paths: int = 100_000,
+        antithetic: bool = True,
+        seed: Optional[int] = None,
+        method: str = "auto",
+    ) -> Dict[str, object]:
+        """
+        Preço + delta/gamma/vega/rho nos mesmos caminhos (ver ``engine.greeks.mc_greeks``):
+        pathwise para payoffs com ``Payoff.grad``, likelihood ratio para os demais.
+        """
+        return mc_greeks(self.model, payoff, S0, times, n_paths, antithetic, seed, method)
 
+    def bump_ladder(
+        self,
+        payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+        S0: Sequence[float],
+        times: np.ndarray,
+        spot: Optional[Sequence[float]] = None,
+        sigma: Optional[Sequence[float]] = None,
+        rate: Optional[Sequence[float]] = None,
+        asset: Optional[int] = None,
+        n_paths: int = 100_000,
+        antithetic: bool = True,
+        seed: Optional[int] = None,
+    ) -> Dict[str, object]:
+        """
+        Escadas de preços chocados (spot relativo, sigma e r absolutos) com as
+        mesmas normais do cenário base (ver ``engine.bumps.bump_ladder``).
+        """
+        return bump_ladder(self.model, payoff, S0, times, spot, sigma, rate, asset, n_paths, antithetic, seed)
+
+    def _price_adaptive(
+        self,
+        payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+        S0: Sequence[float],
+        times: np.ndarray,
+        batch: int,
+        antithetic: bool,
+        seed: Optional[int],
+        control_variate: Optional[ControlVariates],
+        chunk_size: Optional[int],
+        n_workers: Optional[int],
+        backend: str,
+        dtype,
+        target_se: Optional[float],
+        target_rel_se: Optional[float],
+        max_paths: int,
+        shift: Optional[np.ndarray] = None,
+        record: Optional[Callable[[RunningMoments], None]] = None,
+        points: Optional[list] = None,
+    ) -> MCResult:
+        batch = max(2, min(int(batch), int(max_paths)))
+        if antithetic:
+            batch -= batch % 2
+        parallel = n_workers is not None and n_workers > 1
+        funcs = _with_cv(payoff, control_variate)
+        # um único fluxo (serial) ou um SeedSequence raiz que gera filhos por lote (workers)
+        root = np.random.SeedSequence(seed)
+        rng = Generator(PCG64(root))
+
+        acc = RunningMoments(len(funcs))
+        m = batch
+        while True:
+            if parallel:
+                acc.merge(self._parallel_moments(
+                    funcs, S0, times, m, antithetic, root.spawn(n_workers), chunk_size, backend, dtype, shift
+                ))
+                if record is not None:
+                    record(acc)
+            else:
+                # o mesmo acumulador segue de lote em lote (e de bloco em bloco)
+                self._moments(funcs, S0, times, m, antithetic, rng, chunk_size, dtype, shift, acc=acc,
+                              on_chunk=record)
+            n = acc.n
+            price, se = _finalize(acc, control_variate)
+
+            tol = math.inf if target_se is None else float(target_se)
+            if target_rel_se is not None:
+                tol = min(tol, target_rel_se * abs(price))
+            if se <= tol or n >= max_paths:
+                return MCResult(price, se, n, _trace(points))
+            # n necessário ~ n (SE/tol)^2, com 10% de folga; ao menos um lote
+            need = math.ceil(1.1 * n * (se / max(tol, 1e-300)) ** 2)
+            m = int(min(max(need - n, batch), max_paths - n))
+            if antithetic and m > 1 and n + m < max_paths:
+                m -= m % 2  # lotes pares: pares antitéticos não se separam
+
+    def _parallel_moments(
+        self,
+        funcs: Sequence[Callable[[Dict[str, np.ndarray]], np.ndarray]],
+        S0: Sequence[float],
+        times: np.ndarray,
+        n_paths: int,
+        antithetic: bool,
+        seeds: Sequence[np.random.SeedSequence],
+        chunk_size: Optional[int],
+        backend: str,
+        dtype,
+        shift: Optional[np.ndarray] = None,
+        on_merge: Optional[Callable[[RunningMoments], None]] = None,
+    ) -> RunningMoments:
+        """
+        Momentos de n_paths divididos entre workers (um SeedSequence por
+        worker); os acumuladores parciais são fundidos na ordem dos workers,
+        chamando ``on_merge`` após cada fusão.
+        """
+        sizes = split_paths(n_paths, len(seeds), antithetic)
+        tasks = [(funcs, S0, times, m, antithetic, ss, chunk_size, dtype, shift) for m, ss in zip(sizes, seeds)]
+        parts = run_parallel(self._moments, tasks, backend)
+        acc = RunningMoments(len(funcs))
+        for part in parts:
+            acc.merge(part)
+            if on_merge is not None:
+                on_merge(acc)
+        return acc
+
+    def _price_qmc(
+        self,
+        payoff: Callable[[Dict[str, np.ndarray]], np.ndarray],
+        S0: Sequence[float],
+        times: np.ndarray,
+        n_paths: int,
+        seed: Optional[int],
+        control_variate: Optional[ControlVariates],
+        replications: int,
+        dtype=np.float64,
+        trace: bool = False,
+    ) -> MCResult:
+        if replications < 2:
+            raise ValueError("RQMC precisa de ao menos 2 réplicas para estimar o SE.")
+        times = np.asarray(times, dtype=float)
+        S0 = np.asarray(S0, dtype=float)
+        m = 2 ** max(1, math.ceil(math.log2(max(n_paths / replications, 2))))
+        df0T = self.model.df(0.0, float(times[-1]))
+
+        est = np.empty(replications)
+        for i, ss in enumerate(worker_seeds(seed, replications)):
+            Z = sobol_normals(m, times, self.model.corr, self.model._chol, seed=Generator(PCG64(ss))).astype(dtype)
+            paths = {"times": times, "S": self.model._paths_from_normals(S0, times, Z)}
+            block = df0T * _evaluate(_with_cv(payoff, control_variate), paths, m)
+            if control_variate is not None:
+                est[i] = _finalize(RunningMoments(block.shape[1]).update(block), control_variate)[0]
+            else:
+                est[i] = block[:, 0].mean()
+
+        points = None
+        if trace:
+            r = np.arange(2, replications + 1)
+            points = [(m * k, est[:k].mean(), est[:k].std(ddof=1) / math.sqrt(k)) for k in r]
+        return MCResult(est.mean(), est.std(ddof=1) / math.sqrt(replications), m * replications, _trace(points))
+
+    def _sampler(self, funcs: Sequence[Callable], times: np.ndarray, shift: Optional[np.ndarray] = None) -> Callable:
+        """
+        Simulador restrito às datas lidas pelos payoffs, quando declaradas e o
+        modelo permite; com ``shift``, amostragem por importância.
+        """
+        kw = {} if shift is None else {"is_shift": shift}
+        idx = required_indices(funcs, len(times))
+        if idx is not None and hasattr(self.model, "simulate_terminal"):
+            kw["obs_idx"] = idx
+        return partial(self.model.simulate_paths, **kw) if kw else self.model.simulate_paths
+
+    def _simulate(
+        self,
+        funcs: Optional[Sequence[Callable]],
+        S0: Sequence[float],
+        times: np.ndarray,
+        n_paths: int,
+        antithetic: bool,
+        seed,
+        dtype=np.float64,
+        shift: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Simulação única (só as datas lidas por ``funcs``; None = grade inteira),
+        passando pelo ``path_cache`` quando há cache e a seed é inteira.
+        """
+        simulate = self.model.simulate_paths if funcs is None else self._sampler(funcs, times, shift)
+        if self.path_cache is None or not isinstance(seed, (int, np.integer)):
+            return simulate(S0, times, n_paths, antithetic, seed, dtype=dtype)
+        idx = None
+        if funcs is not None and hasattr(self.model, "simulate_terminal"):
+            idx = required_indices(funcs, len(times))
+        key = path_key(self.model, S0, times, n_paths, antithetic, seed, dtype, idx, shift)
+        return self.path_cache.get_or_simulate(key, lambda: simulate(S0, times, n_paths, antithetic, seed, dtype=dtype))
+
+    def _moments(
+        self,
+        funcs: Sequence[Callable[[Dict[str, np.ndarray]], np.ndarray]],
+        S0: Sequence[float],
+        times: np.ndarray,
+        n_paths: int,
+        antithetic: bool,
+        seed,
+        chunk_size: Optional[int],
+        dtype=np.float64,
+        shift: Optional[np.ndarray] = None,
+        acc: Optional[RunningMoments] = None,
+        on_chunk: Optional[Callable[[RunningMoments], None]] = None,
+    ) -> RunningMoments:
+        """
+        Simula em blocos e acumula média/co-momentos (``RunningMoments``) dos
+        payoffs descontados de ``funcs`` (ex.: [payoff, control variate]),
+        continuando ``acc`` se dado; ``on_chunk`` é chamado após cada bloco.
+        ``seed`` pode ser int, None, SeedSequence (fluxo de um worker) ou um
+        Generator, que é consumido e continua em chamadas seguintes.
+        """
+        if chunk_size is None:
+            chunk_size = n_paths
+        # blocos pares mantêm cada par antitético dentro do mesmo bloco
+        if antithetic:
+            chunk_size = max(2, chunk_size - (chunk_size % 2))
+
+        simulate = self._sampler(funcs, times, shift)
+        rng = seed if isinstance(seed, Generator) else Generator(PCG64(seed))
         df0T = self.model.df(0.0, float(times[-1]))
-        disc_X = df0T * X
-
-        # Controle variate opcional
-        if control_variate is not None:
-            cv_func, cv_true = control_variate
-            Y = df0T * np.asarray(cv_func(paths), dtype=float)
-            cov = np.cov(disc_X, Y, bias=False)
-            varY = cov[1, 1]
-            if varY > 0:
-                beta = cov[0, 1] / varY
-                disc_X = disc_X - beta * (Y - cv_true)
-
-        price = float(disc_X.mean())
-        se = float(disc_X.std(ddof=1) / math.sqrt(disc_X.size))
-        return price, se
+        if acc is None:
+            acc = RunningMoments(len(funcs))
+
+        # o buffer do primeiro bloco é reutilizado pelos seguintes (sem realocar)
+        buf = None
+        done = 0
+        while done < n_paths:
+            m = min(chunk_size, n_paths - done)
+            paths = simulate(S0, times, m, antithetic, rng=rng, dtype=dtype,
+                             out=None if buf is None else buf[:m])
+            if buf is None:
+                buf = paths["S"]
+            acc.update(df0T * _evaluate(funcs, paths, m))
+            if on_chunk is not None:
+                on_chunk(acc)
+            done += m
+
+        return acc
 
     def price_exercisable(
         self,
@@ -55,9 +589,42 @@ class MonteCarloEngine:
         n_paths: int = 120_000,
         antithetic: bool = True,
         seed: Optional[int] = None,
+        n_workers: Optional[int] = None,
+        backend: str = "processes",
+        dtype=np.float64,
     ) -> Tuple[float, float]:
-        """Preço para Bermudanas/Americanas via LSMC."""
-        paths = self.model.simulate_paths(S0, times, n_paths, antithetic, seed)
+        """
+        Preço para Bermudanas/Americanas via LSMC.
+
+        Com ``n_workers`` > 1 e ``backend="processes"`` cada worker roda um LSMC
+        independente (regressão própria) sobre sua parcela de caminhos; preço e
+        SE vêm dos momentos agregados. Com ``backend="threads"`` só a simulação
+        é dividida entre threads e a regressão usa todos os caminhos.
+
+        ``dtype=np.float32`` guarda os caminhos em precisão simples; a regressão
+        e os fluxos de caixa continuam em float64.
+        """
+        if n_workers is not None and n_workers > 1 and backend.lower() == "threads":
+            paths = self.model.simulate_paths(S0, times, n_paths, antithetic, seed, workers=n_workers, dtype=dtype)
+            return lsmc_price(self.model, paths, spec, times)
+        if n_workers is not None and n_workers > 1:
+            sizes = split_paths(n_paths, n_workers, antithetic)
+            tasks = [(spec, S0, times, m, antithetic, ss, dtype) for m, ss in zip(sizes, worker_seeds(seed, n_workers))]
+            parts = run_parallel(self._lsmc_moments, tasks, backend)
+            return _finalize(RunningMoments.combine(parts))
+
+        paths = self._simulate(None, S0, times, n_paths, antithetic, seed, dtype)
         return lsmc_price(self.model, paths, spec, times)
 
+    def _lsmc_moments(
+        self, spec: ExerciseSpec, S0: Sequence[float], times: np.ndarray, n_paths: int, antithetic: bool, seed,
+        dtype=np.float64,
+    ) -> RunningMoments:
+        rng = Generator(PCG64(seed))
+        paths = self.model.simulate_paths(S0, times, n_paths, antithetic, rng=rng, dtype=dtype)
+        price, se = lsmc_price(self.model, paths, spec, times)
+        # reconstrói os momentos a partir de média e SE (ddof=1)
+        var = se * se * n_paths
+        return RunningMoments(1, n_paths, np.array([price]), np.array([[(n_paths - 1) * var]]))
+
 
@@ -0,0 +1,99 @@
+# src/derivx/engine/parallel.py
+from __future__ import annotations
+
+import multiprocessing as mp
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# ---------------------------------------------------------------------------
+# Divisão de trabalho e fluxos independentes
+# ---------------------------------------------------------------------------
+def split_paths(n_paths: int, n_workers: int, antithetic: bool = False) -> List[int]:
+    """
+    Divide n_paths em n_workers parcelas (as primeiras recebem o resto). Com
+    ``antithetic`` a divisão é em pares (Z, -Z): toda parcela é par, exceto a
+    última quando n_paths é ímpar, e nenhum par fica entre dois workers.
+    """
+    if n_workers < 1:
+        raise ValueError("n_workers deve ser >= 1.")
+    if antithetic:
+        sizes = [2 * m for m in split_paths(int(n_paths) // 2, n_workers)]
+        sizes[-1] += int(n_paths) % 2
+        return sizes
+    base, rest = divmod(int(n_paths), int(n_workers))
+    return [base + (1 if i < rest else 0) for i in range(n_workers)]
+
+
+def worker_seeds(seed: Optional[int], n_workers: int) -> List[np.random.SeedSequence]:
+    """
+    Um SeedSequence filho por worker (SeedSequence.spawn): fluxos
+    estatisticamente independentes e reprodutíveis para (seed, n_workers).
+    """
+    return np.random.SeedSequence(seed).spawn(int(n_workers))
+
+
+# ---------------------------------------------------------------------------
+# Execução
+# ---------------------------------------------------------------------------
+# O trabalho é entregue aos processos pelo initializer: com start method
+# "fork" (Linux) nada é serializado, então payoffs em lambda/closure funcionam;
+# com "spawn" (Windows/macOS) payoff e modelo precisam ser picklable — senão
+# ``run_parallel`` recai em threads.
+_JOB: Optional[Tuple[Callable, Sequence[Tuple[Any, ...]]]] = None
+
+
+def _init_worker(job: Tuple[Callable, Sequence[Tuple[Any, ...]]]) -> None:
+    global _JOB
+    _JOB = job
+
+
+def _run_worker(i: int) -> Any:
+    fn, tasks = _JOB
+    return fn(*tasks[i])
+
+
+def run_parallel(
+    fn: Callable,
+    tasks: Sequence[Tuple[Any, ...]],
+    backend: str = "processes",
+    start_method: Optional[str] = None,
+) -> List[Any]:
+    """
+    Executa fn(*tasks[i]) para cada i, um worker por tarefa; resultados na ordem de tasks.
+
+    backend:
+      - "processes": ProcessPoolExecutor (escala em CPU, paga start-up e pickling)
+      - "threads":   ThreadPoolExecutor (sem processos extras; escala porque o
+                     RNG e as ufuncs do NumPy liberam o GIL) — bom para cotações
+                     interativas de 20–80k caminhos
+
+    ``start_method`` (padrão: "fork" quando existe, senão o do sistema). Sem
+    fork (Windows/macOS usam "spawn") o trabalho precisa ser picklable; se
+    não for (modelos e payoffs com lambdas/closures), roda em threads com um
+    ``RuntimeWarning`` em vez de falhar.
+    """
+    backend = backend.lower()
+    if backend == "threads":
+        with ThreadPoolExecutor(max_workers=len(tasks)) as ex:
+            return list(ex.map(lambda t: fn(*t), tasks))
+    if backend == "processes":
+        if start_method is None:
+            start_method = "fork" if "fork" in mp.get_all_start_methods() else mp.get_start_method()
+        if start_method != "fork":
+            try:
+                pickle.dumps((fn, tasks))
+            except Exception as err:
+                warnings.warn(f"backend='processes' com start method '{start_method}' exige trabalho picklable "
+                              f"({err}); usando threads.", RuntimeWarning, stacklevel=2)
+                return run_parallel(fn, tasks, "threads")
+        with ProcessPoolExecutor(
+            max_workers=len(tasks), mp_context=mp.get_context(start_method), initializer=_init_worker,
+            initargs=((fn, tasks),)
+        ) as ex:
+            return list(ex.map(_run_worker, range(len(tasks))))
+    raise ValueError(f"backend paralelo nao suportado: {backend}")
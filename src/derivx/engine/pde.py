@@ -0,0 +1,391 @@
+# src/derivx/engine/pde.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+from scipy.linalg import solve_banded
+
+from ..models.gbm import RiskNeutralGBM
+
+
+@dataclass
+class PDEEngine:
+    """
+    Black–Scholes 1D por diferenças finitas em x = ln S (grade uniforme),
+    com r(t) da curva piecewise-flat e q(t)/sigma(t) do ativo ``asset``:
+
+        V_t + 1/2 sigma^2 V_xx + (r - q - 1/2 sigma^2) V_x - r V = 0
+
+    Crank–Nicolson no tempo; os ``rannacher`` primeiros passos (a partir do
+    vencimento) são trocados por dois meio-passos de Euler implícito cada,
+    o que amortece as oscilações de payoffs com quina/salto (strike,
+    digitais). Cada passo resolve um sistema tridiagonal com
+    ``scipy.linalg.solve_banded`` (O(NS)); r, q e sigma entram pela média do
+    passo (r exata pela integral da curva, q/sigma no ponto médio).
+
+    Domínio: [min(K, S0) / Smax_mult, max(K, S0) * Smax_mult] em S (S0 é o
+    ponto ou a faixa de ``ladder``), ou a barreira (Dirichlet zero,
+    monitoramento contínuo) quando dada. Nas bordas sem barreira V = DF(t, T) f(S F(t, T)), exato para payoffs lineares
+    fora da região do strike (vanillas, digitais, gap).
+    """
+    model: RiskNeutralGBM
+    NS: int = 400
+    NT: int = 400
+    Smax_mult: float = 5.0
+    rannacher: int = 2
+    asset: int = 0
+
+    def price(
+        self,
+        terminal: Callable[[np.ndarray], np.ndarray],
+        S0: float,
+        T: float,
+        K: Optional[float] = None,
+        upper: Optional[float] = None,
+        lower: Optional[float] = None,
+        exercise: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        exercise_times: Optional[Sequence[float]] = None,
+        lcp: str = "auto",
+        monitor_times: Optional[Sequence[float]] = None,
+    ) -> float:
+        """
+        Preço em t=0 do payoff ``terminal(S_T)`` (vetorizado em S), com
+        ``upper``/``lower`` barreiras knock-out opcionais. ``K`` centra a
+        grade (padrão: S0). Sem ``monitor_times`` as barreiras são contínuas
+        (bordas da grade); com ``monitor_times`` são verificadas só nessas
+        datas: a grade passa da barreira (que fica entre dois nós), as datas
+        entram na grade de tempo e nelas V = 0 para S >= upper / S <= lower
+        (seguido de novos passos de Rannacher, como no vencimento).
+
+        Exercício antecipado: ``exercise(S)`` é o valor de exercício imediato.
+        Sem ``exercise_times`` a opção é americana e cada passo resolve o
+        problema de complementaridade linear min(A V - b, V - g) = 0
+        (``lcp``: "brennan_schwartz" — exato para g monótono, exercício numa
+        só região —, "policy" — iteração de política, geral — ou "auto", que
+        escolhe Brennan–Schwartz quando g é monótono). Com ``exercise_times``
+        (bermudana) a grade de tempo inclui essas datas e nelas V = max(V, g).
+        """
+        return self.greeks(terminal, S0, T, K, upper, lower, exercise, exercise_times, lcp,
+                           monitor_times)["price"]
+
+    def greeks(
+        self,
+        terminal: Callable[[np.ndarray], np.ndarray],
+        S0: float,
+        T: float,
+        K: Optional[float] = None,
+        upper: Optional[float] = None,
+        lower: Optional[float] = None,
+        exercise: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        exercise_times: Optional[Sequence[float]] = None,
+        lcp: str = "auto",
+        monitor_times: Optional[Sequence[float]] = None,
+    ) -> Dict[str, float]:
+        """
+        {"price", "delta", "gamma", "theta"} em S0 lidos da mesma solução:
+        delta/gamma pelas derivadas da spline em x (V_S = V_x / S,
+        V_SS = (V_xx - V_x) / S^2) e theta por (V(dt) - V(0)) / dt no
+        primeiro passo (por ano).
+        """
+        return {k: float(v[0]) for k, v in
+                self.ladder(terminal, [S0], T, K, upper, lower, exercise, exercise_times, lcp,
+                            monitor_times).items() if k != "S"}
+
+    def ladder(
+        self,
+        terminal: Callable[[np.ndarray], np.ndarray],
+        S: Sequence[float],
+        T: float,
+        K: Optional[float] = None,
+        upper: Optional[float] = None,
+        lower: Optional[float] = None,
+        exercise: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        exercise_times: Optional[Sequence[float]] = None,
+        lcp: str = "auto",
+        monitor_times: Optional[Sequence[float]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Perfil em spot com uma única solução: a fatia t=0 da grade é
+        interpolada nos pontos ``S`` e devolvida como arrays {"S", "price",
+        "delta", "gamma", "theta"} (mesmas fórmulas de ``greeks``). O
+        domínio passa a cobrir [min(S), max(S)] (e K) com a mesma folga de
+        ``Smax_mult``, então escadas largas pedem NS maior para manter dx.
+        Pontos além de uma barreira knock-out valem zero.
+        """
+        S = np.asarray(S, dtype=float).reshape(-1)
+        if len(S) == 0 or np.any(S <= 0):
+            raise ValueError("pontos de spot devem ser positivos (e ao menos um).")
+        alive = np.ones(len(S), dtype=bool)
+        if upper is not None:
+            alive &= S < upper
+        if lower is not None:
+            alive &= S > lower
+        out = {k: np.zeros(len(S)) for k in ("price", "delta", "gamma", "theta")}
+        out["S"] = S
+        if alive.any():
+            Sa = S[alive]
+            x, V, V_dt, dt = self._solve(terminal, (float(Sa.min()), float(Sa.max())), float(T), K, upper, lower,
+                                         exercise, exercise_times, lcp, monitor_times)
+            for k, v in _slice_greeks(x, V, V_dt, dt, Sa).items():
+                out[k][alive] = v
+        return out
+
+    def _grid(self, S_range: Tuple[float, float], K: Optional[float], upper: Optional[float],
+              lower: Optional[float], discrete: bool = False) -> np.ndarray:
+        s_lo, s_hi = S_range
+        c = s_lo if K is None else float(K)
+        if discrete:
+            # barreira discreta dentro do domínio, a meio caminho entre dois nós (o salto do
+            # knock-out cai entre nós e a convergência em dx volta a ser de 2ª ordem)
+            bars = [b for b in (upper, lower) if b is not None]
+            lo = np.log(min(c, s_lo, *bars) / self.Smax_mult)
+            hi = np.log(max(c, s_hi, *bars) * self.Smax_mult)
+            x = np.linspace(lo, hi, int(self.NS) + 1)
+            xb = np.log(upper if upper is not None else lower)
+            dx = x[1] - x[0]
+            x = x + (xb - (lo + (np.floor((xb - lo) / dx) + 0.5) * dx))
+            lo, hi = x[0], x[-1]
+        else:
+            lo = np.log(min(c, s_lo) / self.Smax_mult) if lower is None else np.log(lower)
+            hi = np.log(max(c, s_hi) * self.Smax_mult) if upper is None else np.log(upper)
+            x = np.linspace(lo, hi, int(self.NS) + 1)
+        if not lo < np.log(s_lo) <= np.log(s_hi) < hi:
+            raise ValueError("S0 fora do dominio da PDE; aumente Smax_mult.")
+        return x
+
+    def _solve(
+        self,
+        terminal: Callable[[np.ndarray], np.ndarray],
+        S_range: Tuple[float, float],
+        T: float,
+        K: Optional[float],
+        upper: Optional[float],
+        lower: Optional[float],
+        exercise: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        exercise_times: Optional[Sequence[float]] = None,
+        lcp: str = "auto",
+        monitor_times: Optional[Sequence[float]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Retorna (x, V(t=0), V(t=dt), dt) na grade inteira, bordas incluídas;
+        ``S_range`` = (S mínimo, S máximo) que a grade precisa cobrir.
+        """
+        if T <= 0:
+            raise ValueError("T deve ser positivo.")
+        if int(self.NT) < 2:
+            raise ValueError("NT deve ser >= 2 (theta usa a camada t=dt).")
+        discrete = monitor_times is not None and (upper is not None or lower is not None)
+        x = self._grid(S_range, K, upper, lower, discrete)
+        S = np.exp(x)
+        dx = x[1] - x[0]
+        times = np.linspace(0.0, T, int(self.NT) + 1)
+        qf, sf = self.model.q_funcs[self.asset], self.model.sigma_funcs[self.asset]
+        rc = self.model.r_curve
+
+        g, american = None, False
+        if exercise is not None:
+            g = np.asarray(exercise(S), dtype=float)
+            if exercise_times is None:
+                american = True
+                lcp = _lcp_method(lcp, g)
+        bermudan = exercise is not None and exercise_times is not None
+        times = _merge_dates(times, exercise_times if bermudan else (), T)
+        times = _merge_dates(times, monitor_times if discrete else (), T)
+        ex_dates = _on_dates(times, exercise_times if bermudan else (), T)
+        ko_dates = _on_dates(times, monitor_times if discrete else (), T)
+        if discrete:
+            knocked = np.zeros(len(S), dtype=bool)
+            if upper is not None:
+                knocked |= S >= upper * (1.0 - 1e-12)
+            if lower is not None:
+                knocked |= S <= lower * (1.0 + 1e-12)
+
+        V = np.asarray(terminal(S), dtype=float).copy()
+        if discrete:
+            if ko_dates[-1]:
+                V[knocked] = 0.0
+        else:
+            if upper is not None:
+                V[-1] = 0.0
+            if lower is not None:
+                V[0] = 0.0
+        f = lambda s: float(np.asarray(terminal(np.array([s])), dtype=float)[0])
+        R = Q = 0.0  # integrais de r e q de t até T
+        V_dt = V
+        smooth = self.rannacher  # passos de Euler implícito restantes (após o vencimento e cada knock-out)
+        for n in range(len(times) - 2, -1, -1):
+            t0, t1 = times[n], times[n + 1]
+            dt = t1 - t0
+            rbar = rc.integral(t0, t1) / dt
+            tm = 0.5 * (t0 + t1)
+            q, s2 = qf(tm), sf(tm) ** 2
+            R += rbar * dt
+            Q += q * dt
+            df, fwd = np.exp(-R), np.exp(R - Q)
+            bc = [0.0 if lower is not None else df * f(S[0] * fwd),
+                  0.0 if upper is not None else df * f(S[-1] * fwd)]
+            if american:
+                bc = [max(bc[0], g[0]), max(bc[1], g[-1])]
+            mu = rbar - q - 0.5 * s2
+            a = 0.5 * s2 / dx ** 2 - 0.5 * mu / dx
+            b = -s2 / dx ** 2 - rbar
+            c = 0.5 * s2 / dx ** 2 + 0.5 * mu / dx
+            ga = g if american else None
+            if smooth > 0:
+                for _ in range(2):
+                    V = _theta_step(V, a, b, c, 0.5 * dt, 1.0, bc, ga, lcp)
+                smooth -= 1
+            else:
+                V = _theta_step(V, a, b, c, dt, 0.5, bc, ga, lcp)
+            if ex_dates[n]:
+                V = np.maximum(V, g)
+            if ko_dates[n] and n > 0:
+                V[knocked] = 0.0
+                smooth = self.rannacher
+            if n == 1:
+                V_dt = V
+        return x, V, V_dt, float(times[1] - times[0])
+
+
+def _merge_dates(times: np.ndarray, dates: Sequence[float], T: float) -> np.ndarray:
+    """Insere na grade de tempo as ``dates`` em (0, T), sem duplicar nós."""
+    d = np.asarray(dates, dtype=float)
+    times = np.unique(np.concatenate([times, d[(d > 0.0) & (d < T)]]))
+    return times[np.concatenate(([True], np.diff(times) > 1e-12 * T))]
+
+
+def _on_dates(times: np.ndarray, dates: Sequence[float], T: float) -> np.ndarray:
+    """Máscara dos nós de ``times`` que coincidem com alguma de ``dates``."""
+    d = np.asarray(dates, dtype=float)
+    return np.isclose(times[:, None], d[None, :], rtol=0.0, atol=1e-9 * T).any(axis=1)
+
+
+def _slice_greeks(x: np.ndarray, V: np.ndarray, V_dt: np.ndarray, dt: float, S: np.ndarray) -> Dict[str, np.ndarray]:
+    """Preço, delta, gamma (spline cúbica em x = ln S) e theta nos pontos ``S``."""
+    spl = CubicSpline(x, V)
+    xs = np.log(S)
+    v, vx, vxx = spl(xs), spl(xs, 1), spl(xs, 2)
+    theta = (CubicSpline(x, V_dt)(xs) - v) / dt
+    return {"price": v, "delta": vx / S, "gamma": (vxx - vx) / S ** 2, "theta": theta}
+
+
+def _lcp_method(lcp: str, g: np.ndarray) -> str:
+    lcp = lcp.lower()
+    if lcp not in ("auto", "brennan_schwartz", "policy"):
+        raise ValueError(f"lcp nao suportado: {lcp}")
+    if lcp != "auto":
+        return lcp
+    d = np.diff(g)
+    return "brennan_schwartz" if np.all(d <= 0) or np.all(d >= 0) else "policy"
+
+
+def _theta_step(V: np.ndarray, a: float, b: float, c: float, dt: float, theta: float,
+                bc: Sequence[float], g: Optional[np.ndarray] = None, lcp: str = "policy") -> np.ndarray:
+    """
+    Um passo do esquema theta (theta=1/2: CN; 1: Euler implícito) para
+    (I - theta dt L) V_new = (I + (1 - theta) dt L) V, L = [a, b, c]
+    tridiagonal, com V_new nas bordas dado por ``bc``. Com ``g`` resolve o
+    problema de complementaridade V_new >= g (exercício americano).
+    """
+    m = len(V) - 2
+    e = (1.0 - theta) * dt
+    rhs = V[1:-1] + e * (a * V[:-2] + b * V[1:-1] + c * V[2:])
+    rhs[0] += theta * dt * a * bc[0]
+    rhs[-1] += theta * dt * c * bc[1]
+    ab = np.empty((3, m))
+    ab[0, :] = -theta * dt * c
+    ab[1, :] = 1.0 - theta * dt * b
+    ab[2, :] = -theta * dt * a
+    out = np.empty_like(V)
+    out[0], out[-1] = bc
+    if g is None:
+        out[1:-1] = solve_banded((1, 1), ab, rhs, check_finite=False)
+    elif lcp == "brennan_schwartz":
+        out[1:-1] = _brennan_schwartz(ab, rhs, g[1:-1])
+    else:
+        out[1:-1] = _policy_iteration(ab, rhs, g[1:-1])
+    return out
+
+
+def _brennan_schwartz(ab: np.ndarray, rhs: np.ndarray, g: np.ndarray) -> np.ndarray:
+    """
+    Brennan & Schwartz (1977): eliminação gaussiana a partir do lado de
+    continuação (fatoração UL) e substituição com projeção V_j = max(g_j, ...)
+    a partir do lado de exercício. Exato quando a região de exercício é um
+    intervalo numa das pontas (g monótono: put embaixo, call em cima).
+
+    As bandas são constantes (grade uniforme), então a fatoração sai do
+    cache; a eliminação é um solve bidiagonal, a fronteira de exercício é o
+    primeiro nó em que o valor de continuação supera g e o resto é outro
+    solve bidiagonal — sem laço em Python por nó.
+    """
+    if g[0] < g[-1]:  # exercício em S alto (call): resolve o sistema espelhado
+        ab_rev = np.stack([ab[2, ::-1], ab[1, ::-1], ab[0, ::-1]])
+        return _brennan_schwartz(ab_rev, rhs[::-1], g[::-1])[::-1]
+    m = len(rhs)
+    lo, up = float(ab[2, 0]), float(ab[0, -1])
+    d, f = _ul_factor(lo, float(ab[1, 0]), up, m)
+    # r' = U^{-1} rhs, U bidiagonal superior unitária com f na diagonal de cima
+    r = solve_banded((0, 1), np.stack([np.concatenate(([0.0], f)), np.ones(m)]), rhs, check_finite=False)
+    # com V_{j-1} = g_{j-1}, o nó j continua em exercício enquanto o valor de continuação <= g_j
+    cont = r / d
+    cont[1:] -= lo * g[:-1] / d[1:]
+    free = np.flatnonzero(cont > g)
+    if len(free) == 0:
+        return g.copy()
+    k = free[0]
+    V = g.copy()
+    rk = r[k:].copy()
+    if k > 0:
+        rk[0] -= lo * g[k - 1]
+    L = np.stack([d[k:], np.concatenate((np.full(m - k - 1, lo), [0.0]))])
+    V[k:] = solve_banded((1, 0), L, rk, check_finite=False)
+    return V
+
+
+@lru_cache(maxsize=64)
+def _ul_factor(lo: float, diag: float, up: float, m: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fatoração A = U L de uma tridiagonal de bandas constantes (lo, diag, up):
+    pivôs d (diagonal de L) e multiplicadores f (U). Somente leitura (cache).
+    """
+    d = np.empty(m)
+    f = np.empty(m - 1)
+    d[-1] = diag
+    for j in range(m - 2, -1, -1):
+        f[j] = up / d[j + 1]
+        d[j] = diag - f[j] * lo
+    d.setflags(write=False)
+    f.setflags(write=False)
+    return d, f
+
+
+def _policy_iteration(ab: np.ndarray, rhs: np.ndarray, g: np.ndarray, max_iter: int = 100) -> np.ndarray:
+    """
+    Iteração de política para min(A V - b, V - g) = 0: em cada iteração as
+    linhas em que V - g < A V - b viram V = g e o sistema (ainda
+    tridiagonal) é resolvido de novo; termina quando o conjunto de exercício
+    não muda (em geral 2–4 iterações partindo da projeção do passo livre).
+    """
+    V = solve_banded((1, 1), ab, rhs, check_finite=False)
+    ex = V < g
+    for _ in range(max_iter):
+        A = ab.copy()
+        b = rhs.copy()
+        A[1, ex] = 1.0
+        A[0, 1:][ex[:-1]] = 0.0
+        A[2, :-1][ex[1:]] = 0.0
+        b[ex] = g[ex]
+        V = solve_banded((1, 1), A, b, check_finite=False)
+        AV = ab[1] * V
+        AV[:-1] += ab[0, 1:] * V[1:]
+        AV[1:] += ab[2, :-1] * V[:-1]
+        ex_new = V - g < AV - rhs
+        if np.array_equal(ex_new, ex):
+            break
+        ex = ex_new
+    return V
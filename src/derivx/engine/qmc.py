@@ -0,0 +1,99 @@
+# src/derivx/engine/qmc.py
+from __future__ import annotations
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+
+# ---------------------------------------------------------------------------
+# Ponte browniana
+# ---------------------------------------------------------------------------
+def brownian_bridge_plan(times: np.ndarray) -> List[Tuple[int, int, int, float, float, float]]:
+    """
+    Ordem de construção da ponte browniana na grade ``times``.
+    Cada item (m, l, r, wl, wr, sd): W(t_m) = wl*W(t_l) + wr*W(t_r) + sd*xi,
+    com l/r já construídos (r = -1 no primeiro item: W(T) = sd*xi).
+    O primeiro ponto é T, depois os pontos médios (em índice) recursivamente,
+    de modo que as primeiras coordenadas carregam a maior parte da variância.
+    """
+    times = np.asarray(times, dtype=float)
+    n = len(times) - 1
+    plan = [(n, 0, -1, 0.0, 0.0, math.sqrt(times[n] - times[0]))]
+    queue = [(0, n)]
+    while queue:
+        nxt = []
+        for l, r in queue:
+            if r - l < 2:
+                continue
+            m = (l + r) // 2
+            tl, tm, tr = times[l], times[m], times[r]
+            wl = (tr - tm) / (tr - tl)
+            wr = (tm - tl) / (tr - tl)
+            sd = math.sqrt((tm - tl) * (tr - tm) / (tr - tl))
+            plan.append((m, l, r, wl, wr, sd))
+            nxt += [(l, m), (m, r)]
+        queue = nxt
+    return plan
+
+
+def bridge_increments(xi: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """
+    Converte normais xi (n, Tn, k) — eixo 1 na ordem da ponte — em incrementos
+    padronizados (n, Tn, k): dW_j / sqrt(dt_j), i.i.d. N(0,1) ao longo do tempo.
+    """
+    times = np.asarray(times, dtype=float)
+    n, Tn, k = xi.shape
+    W = np.zeros((n, Tn + 1, k))
+    for j, (m, l, r, wl, wr, sd) in enumerate(brownian_bridge_plan(times)):
+        if r < 0:
+            W[:, m, :] = sd * xi[:, j, :]
+        else:
+            W[:, m, :] = wl * W[:, l, :] + wr * W[:, r, :] + sd * xi[:, j, :]
+    return np.diff(W, axis=1) / np.sqrt(np.diff(times))[None, :, None]
+
+
+# ---------------------------------------------------------------------------
+# Normais quasi-aleatórias (Sobol embaralhado + ponte + PCA)
+# ---------------------------------------------------------------------------
+def pca_rotation(corr: np.ndarray, chol: np.ndarray) -> np.ndarray:
+    """
+    Matriz M tal que Z = zeta @ M.T faz Z @ chol.T == zeta @ A.T, com A = V sqrt(L)
+    (autovetores de corr em ordem decrescente de autovalor). Z continua i.i.d.
+    N(0,1), mas a coordenada zeta_0 passa a mover o fator principal.
+    """
+    lam, V = np.linalg.eigh(corr)
+    order = np.argsort(lam)[::-1]
+    A = V[:, order] * np.sqrt(np.clip(lam[order], 0.0, None))[None, :]
+    return np.linalg.solve(chol, A)
+
+
+def sobol_normals(
+    n_paths: int,
+    times: np.ndarray,
+    corr: np.ndarray,
+    chol: np.ndarray,
+    seed=None,
+) -> np.ndarray:
+    """
+    Normais (n_paths, Tn, dim) a partir de um Sobol embaralhado (Owen), no
+    formato que ``RiskNeutralGBM._paths_from_normals`` espera.
+
+    Coordenadas do Sobol são atribuídas por importância: ponto da ponte
+    browniana (T primeiro) e, dentro dele, componente principal da correlação.
+    n_paths deve ser potência de 2 (equilíbrio do Sobol).
+    """
+    times = np.asarray(times, dtype=float)
+    Tn = len(times) - 1
+    dim = corr.shape[0]
+    m = int(round(math.log2(n_paths)))
+    if 2 ** m != n_paths:
+        raise ValueError("n_paths do Sobol deve ser potência de 2.")
+
+    U = qmc.Sobol(d=Tn * dim, scramble=True, seed=seed).random_base2(m)
+    xi = ndtri(np.clip(U, 1e-12, 1.0 - 1e-12)).reshape(n_paths, Tn, dim)
+    zeta = bridge_increments(xi, times)
+    return zeta @ pca_rotation(corr, chol).T
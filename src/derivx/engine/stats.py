@@ -0,0 +1,79 @@
+# src/derivx/engine/stats.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+@dataclass
+class RunningMoments:
+    """
+    Média e co-momentos centrais de k colunas acumulados em fluxo
+    (Welford por blocos; fusão de Chan–Golub–LeVeque).
+
+      n:    nº de observações
+      mean: (k,) média corrente
+      m2:   (k, k) soma dos produtos cruzados centrados na média
+
+    Cada bloco é centrado na própria média antes de somar, então não há o
+    cancelamento de sum(x^2) - n mean^2 quando a média é grande frente ao
+    desvio; acumuladores de workers/lotes diferentes se fundem com ``merge``
+    sem guardar os payoffs.
+    """
+    k: int
+    n: int = 0
+    mean: Optional[np.ndarray] = None
+    m2: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.mean is None:
+            self.mean = np.zeros(self.k)
+        if self.m2 is None:
+            self.m2 = np.zeros((self.k, self.k))
+
+    def update(self, block: np.ndarray) -> "RunningMoments":
+        """Acrescenta as linhas de ``block`` (m, k)."""
+        block = np.asarray(block, dtype=float).reshape(-1, self.k)
+        m = block.shape[0]
+        if m == 0:
+            return self
+        bmean = block.mean(axis=0)
+        c = block - bmean
+        return self._merge(m, bmean, c.T @ c)
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Funde ``other`` neste acumulador (in place) e o devolve."""
+        if other.k != self.k:
+            raise ValueError("RunningMoments com nº de colunas diferente.")
+        if other.n == 0:
+            return self
+        return self._merge(other.n, other.mean, other.m2)
+
+    def _merge(self, nb: int, mean_b: np.ndarray, m2_b: np.ndarray) -> "RunningMoments":
+        na = self.n
+        n = na + nb
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (nb / n)
+        self.m2 = self.m2 + m2_b + np.outer(delta, delta) * (na * nb / n)
+        self.n = n
+        return self
+
+    @classmethod
+    def combine(cls, parts: Iterable["RunningMoments"]) -> "RunningMoments":
+        """Fusão de vários acumuladores (ex.: um por worker), na ordem dada."""
+        parts = list(parts)
+        out = cls(parts[0].k)
+        for p in parts:
+            out.merge(p)
+        return out
+
+    @property
+    def cov(self) -> np.ndarray:
+        """Covariância amostral (ddof=1)."""
+        return self.m2 / max(self.n - 1, 1)
+
+    @property
+    def var(self) -> np.ndarray:
+        return np.diag(self.cov).copy()
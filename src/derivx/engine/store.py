@@ -0,0 +1,139 @@
+# src/derivx/engine/store.py
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+from numpy.random import Generator, PCG64, SeedSequence
+
+from ..models.gbm import RiskNeutralGBM
+from .cache import path_key
+
+
+def _meta_path(path: str) -> str:
+    return path + ".json"
+
+
+@dataclass
+class PathStore:
+    """
+    Conjunto de caminhos GBM em disco (``.npy`` aberto via ``np.memmap``) com
+    metadados em ``<arquivo>.json``: modelo (curva, q/sigma por passo,
+    correlação), grade, S0, n_paths, antitético, seed e dtype.
+
+    ``create`` simula em blocos direto no arquivo (memória de pico = um
+    bloco) consumindo um único fluxo de normais, então o conjunto é o mesmo
+    de ``simulate_paths(..., seed)`` numa chamada (na ordem dos blocos, como
+    em ``MonteCarloEngine.price`` com ``chunk_size``). ``open`` reabre o arquivo
+    (somente leitura) em outro processo ou execução sem simular de novo;
+    ``blocks`` entrega fatias {"times", "S"} que são views do memmap (sem
+    cópia) e servem a qualquer payoff/``PF``.
+    """
+    path: str
+    S: np.ndarray
+    times: np.ndarray
+    meta: Dict[str, Any]
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        model: RiskNeutralGBM,
+        S0: Sequence[float],
+        times: np.ndarray,
+        n_paths: int,
+        antithetic: bool = True,
+        seed: Optional[int] = None,
+        chunk_size: int = 100_000,
+        dtype=np.float64,
+        overwrite: bool = False,
+    ) -> "PathStore":
+        """
+        Simula ``n_paths`` caminhos em blocos de ``chunk_size`` para ``path``.
+        Com ``seed=None`` a entropia sorteada é gravada nos metadados, de modo
+        que o conjunto continua reprodutível.
+        """
+        if not isinstance(model, RiskNeutralGBM):
+            raise ValueError(f"PathStore suporta apenas RiskNeutralGBM (recebido {type(model).__name__}).")
+        if os.path.exists(path) and not overwrite:
+            raise FileExistsError(f"{path} ja existe (use overwrite=True).")
+        times = np.asarray(times, dtype=float)
+        S0 = np.asarray(S0, dtype=float)
+        ss = SeedSequence(seed)
+        seed_used = int(ss.entropy)
+        rng = Generator(PCG64(ss))
+        chunk_size = max(2, int(chunk_size))
+        if antithetic:
+            chunk_size -= chunk_size % 2  # pares antitéticos no mesmo bloco
+
+        mm = np.lib.format.open_memmap(path, mode="w+", dtype=np.dtype(dtype),
+                                       shape=(int(n_paths), len(times), model.dim))
+        done = 0
+        while done < n_paths:
+            m = min(chunk_size, n_paths - done)
+            model.simulate_paths(S0, times, m, antithetic, rng=rng, out=mm[done:done + m])
+            done += m
+        mm.flush()
+        del mm
+
+        mids = 0.5 * (times[:-1] + times[1:])
+        meta = {
+            "format": "derivx-paths",
+            "version": 1,
+            "model": {
+                "name": "gbm",
+                "r_curve": {"times": model.r_curve.times.tolist(), "rates": model.r_curve.rates.tolist()},
+                "q": [[f(t) for f in model.q_funcs] for t in mids],
+                "sigma": [[f(t) for f in model.sigma_funcs] for t in mids],
+                "corr": np.asarray(model.corr).tolist(),
+            },
+            "S0": S0.tolist(),
+            "times": times.tolist(),
+            "n_paths": int(n_paths),
+            "dim": int(model.dim),
+            "antithetic": bool(antithetic),
+            "seed": seed_used,
+            "dtype": np.dtype(dtype).str,
+            "chunk_size": chunk_size,
+            "key": path_key(model, S0, times, n_paths, antithetic, seed_used, dtype),
+        }
+        with open(_meta_path(path), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: str) -> "PathStore":
+        """Reabre um store existente (memmap somente leitura)."""
+        with open(_meta_path(path), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        S = np.load(path, mmap_mode="r")
+        if S.shape != (meta["n_paths"], len(meta["times"]), meta["dim"]):
+            raise ValueError(f"{path}: shape {S.shape} nao confere com os metadados.")
+        return cls(path, S, np.asarray(meta["times"], dtype=float), meta)
+
+    def __len__(self) -> int:
+        return self.S.shape[0]
+
+    @property
+    def S0(self) -> np.ndarray:
+        return np.asarray(self.meta["S0"], dtype=float)
+
+    def paths(self) -> Dict[str, np.ndarray]:
+        """Todos os caminhos como dict de ``simulate_paths`` (S é o próprio memmap)."""
+        return {"times": self.times, "S": self.S}
+
+    def blocks(self, block_size: int = 100_000, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Fatias consecutivas [start, stop) de até ``block_size`` caminhos (views do memmap)."""
+        stop = len(self) if stop is None else int(stop)
+        for lo in range(int(start), stop, int(block_size)):
+            yield {"times": self.times, "S": self.S[lo:min(lo + int(block_size), stop)]}
+
+    def check_model(self, model: RiskNeutralGBM) -> None:
+        """Erro se ``model`` não é o modelo com que o store foi simulado (mesma chave de ``path_key``)."""
+        m = self.meta
+        key = path_key(model, m["S0"], self.times, m["n_paths"], m["antithetic"], m["seed"], np.dtype(m["dtype"]))
+        if key != m["key"]:
+            raise ValueError(f"{self.path}: caminhos simulados com outro modelo/mercado.")
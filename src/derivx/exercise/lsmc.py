@@ -4,7 +4,7 @@ from __future__ import annotations
 import math
 import numpy as np
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from ..models.gbm import RiskNeutralGBM
 
 
@@ -64,6 +64,7 @@ def lsmc_price(
     times: np.ndarray,  # shape (n_times,), crescente
     feature_fn: Callable[[Dict[str, np.ndarray], int], np.ndarray] = make_features,
     basis_fn: Callable[[np.ndarray], np.ndarray] = default_basis,
+    block_size: Optional[int] = None,
 ) -> Tuple[float, float]:
     """
     Preço via LSMC para um payoff exercível nas datas spec.exercise_idx.
@@ -77,6 +78,13 @@ def lsmc_price(
            - Atualização: V = payoff_i (se exercer) ou V = Y (se continuar)
       3) Ao final, V já está avaliado em t0; preço = média(V), se = std/sqrt(n)
 
+    Caminhos em float32 são aceitos: features, regressão e V são sempre float64.
+
+    Com ``block_size`` os caminhos são lidos em fatias (ex.: o memmap de um
+    ``PathStore``): a regressão de cada data sai das equações normais
+    X^T X beta = X^T y acumuladas bloco a bloco, e só V (n_paths,) fica em
+    memória.
+
     Retorna: (preço, erro-padrão)
     """
     ex_idx = sorted(list(spec.exercise_idx))
@@ -85,6 +93,8 @@ def lsmc_price(
 
     if len(ex_idx) < 1:
         raise ValueError("ExerciseSpec.exercise_idx vazio.")
+    if block_size is not None and block_size < n_paths:
+        return _lsmc_blocked(model, paths, spec, times, ex_idx, feature_fn, basis_fn, int(block_size))
 
     # 1) Valor no vencimento (última data de exercício)
     k_last = ex_idx[-1]
@@ -113,7 +123,7 @@ def lsmc_price(
         cont = np.array(Y, copy=True)
 
         if np.any(itm):
-            feats_all = feature_fn(paths, i)             # (n_paths, n_features)
+            feats_all = np.asarray(feature_fn(paths, i), dtype=float)  # (n_paths, n_features)
             X_itm = basis_fn(feats_all[itm, :])          # só ITM
 
             # se #amostras >= #colunas, regressão estável
@@ -136,6 +146,61 @@ def lsmc_price(
     return price, se
 
 
+def _lsmc_blocked(
+    model: RiskNeutralGBM,
+    paths: Dict[str, np.ndarray],
+    spec: ExerciseSpec,
+    times: np.ndarray,
+    ex_idx: List[int],
+    feature_fn: Callable[[Dict[str, np.ndarray], int], np.ndarray],
+    basis_fn: Callable[[np.ndarray], np.ndarray],
+    block_size: int,
+) -> Tuple[float, float]:
+    """Mesmo algoritmo de ``lsmc_price`` com os caminhos lidos em blocos (equações normais)."""
+    S = paths["S"]
+    n_paths = S.shape[0]
+    bounds = [(lo, min(lo + block_size, n_paths)) for lo in range(0, n_paths, block_size)]
+
+    def block(lo, hi):
+        return {**paths, "S": S[lo:hi]}
+
+    V = np.empty(n_paths)
+    for lo, hi in bounds:
+        V[lo:hi] = np.maximum(np.asarray(spec.immediate_payoff(block(lo, hi), ex_idx[-1]), dtype=float), 0.0)
+
+    imm = np.empty(n_paths)
+    for k in range(len(ex_idx) - 2, -1, -1):
+        i = ex_idx[k]
+        j = ex_idx[k + 1]
+        disc = float(model.df(float(times[i]), float(times[j])))
+
+        # passo 1: payoff imediato e equações normais nos caminhos ITM
+        XtX, Xty, n_itm = None, None, 0
+        for lo, hi in bounds:
+            b = block(lo, hi)
+            imm[lo:hi] = np.maximum(np.asarray(spec.immediate_payoff(b, i), dtype=float), 0.0)
+            itm = imm[lo:hi] > 1e-12
+            if np.any(itm):
+                X = basis_fn(np.asarray(feature_fn(b, i), dtype=float)[itm, :])
+                XtX = X.T @ X if XtX is None else XtX + X.T @ X
+                Xty = X.T @ (disc * V[lo:hi][itm]) if Xty is None else Xty + X.T @ (disc * V[lo:hi][itm])
+                n_itm += X.shape[0]
+        beta = np.linalg.pinv(XtX) @ Xty if XtX is not None and n_itm >= XtX.shape[0] else None
+
+        # passo 2: decisão de exercício com a mesma regressão em todos os blocos
+        for lo, hi in bounds:
+            Y = disc * V[lo:hi]
+            cont = np.array(Y, copy=True)
+            itm = imm[lo:hi] > 1e-12
+            if beta is not None and np.any(itm):
+                cont[itm] = basis_fn(np.asarray(feature_fn(block(lo, hi), i), dtype=float)[itm, :]) @ beta
+            V[lo:hi] = np.where(imm[lo:hi] >= cont, imm[lo:hi], Y)
+
+    price = float(np.mean(V))
+    se = float(np.std(V, ddof=1) / np.sqrt(n_paths)) if n_paths > 1 else 0.0
+    return price, se
+
+
 # ---------------------------------------------------------------------------
 # Utilitário: LSMC "cross-fit" para put (exemplo standalone)
 # (Mantido; assume T=1.0 -> dt = 1/steps)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from scipy.integrate import quad
+
+from ..curves import PiecewiseFlatCurve
+from .heston import HestonModel
+
+
+@dataclass(frozen=True)
+class CharFn:
+    """
+    Função característica do log-retorno X_T = ln(S_T / S0) sob Q:
+
+      phi(u, T):       E[exp(i u X_T)] (u complexo, vetorizado); inclui o drift
+                       int r - int q, então phi(-i, T) = forward / S0
+      df(T):           fator de desconto até T
+      cumulants_fn(T): (c1, c2, c4) exatos, quando conhecidos; senão
+                       ``cumulants`` os estima por diferenças finitas de
+                       log phi(-i s, T) (função geradora de cumulantes)
+    """
+    phi: Callable[[np.ndarray, float], np.ndarray]
+    df: Callable[[float], float]
+    cumulants_fn: Optional[Callable[[float], Tuple[float, float, float]]] = None
+
+    def cumulants(self, T: float, h: float = 0.05) -> Tuple[float, float, float]:
+        if self.cumulants_fn is not None:
+            return self.cumulants_fn(T)
+        s = h * np.arange(-2, 3)
+        K = np.log(self.phi(-1j * s, T)).real
+        c1 = (K[3] - K[1]) / (2 * h)
+        c2 = (K[3] - 2 * K[2] + K[1]) / h ** 2
+        c4 = (K[4] - 4 * K[3] + 6 * K[2] - 4 * K[1] + K[0]) / h ** 4
+        return float(c1), float(max(c2, 0.0)), float(max(c4, 0.0))
+
+    def forward_factor(self, T: float) -> float:
+        """E[S_T] / S0."""
+        return float(self.phi(np.array(-1j), T).real)
+
+
+CHARFNS: Dict[str, Callable[..., CharFn]] = {}
+
+
+def register_charfn(name: str):
+    """Decorador: registra ``fn(r_curve, **params) -> CharFn`` sob ``name`` (usado pela DSL)."""
+    def deco(fn):
+        CHARFNS[name.lower()] = fn
+        return fn
+    return deco
+
+
+def get_charfn(name: str, r_curve: PiecewiseFlatCurve, **params) -> CharFn:
+    try:
+        builder = CHARFNS[name.lower()]
+    except KeyError:
+        raise ValueError(f"funcao caracteristica nao registrada: {name} (disponiveis: {sorted(CHARFNS)})")
+    return builder(r_curve, **params)
+
+
+def _drift(r_curve: PiecewiseFlatCurve, q_int: Callable[[float], float]):
+    return lambda T: r_curve.integral(0.0, T) - q_int(T)
+
+
+@register_charfn("gbm")
+def gbm_charfn(r_curve: PiecewiseFlatCurve, q: float = 0.0, sigma: float = 0.2) -> CharFn:
+    q, sigma = float(q), float(sigma)
+    return _gbm(r_curve, lambda T: q * T, lambda T: sigma * sigma * T)
+
+
+def _gbm(r_curve, q_int, var_int) -> CharFn:
+    mu = _drift(r_curve, q_int)
+
+    def phi(u, T):
+        u = np.asarray(u, dtype=complex)
+        w = var_int(T)
+        return np.exp(1j * u * (mu(T) - 0.5 * w) - 0.5 * w * u * u)
+
+    def cumulants(T):
+        w = var_int(T)
+        return mu(T) - 0.5 * w, w, 0.0
+
+    return CharFn(phi, lambda T: r_curve.df(0.0, T), cumulants)
+
+
+@register_charfn("heston")
+def heston_charfn(r_curve: PiecewiseFlatCurve, q: float = 0.0, kappa: float = 1.5, theta: float = 0.04,
+                  xi: float = 0.5, rho: float = -0.7, v0: float = 0.04, psi_c: float = 1.5) -> CharFn:
+    return model_charfn(HestonModel(r_curve, float(q), float(kappa), float(theta), float(xi), float(rho), float(v0),
+                                    psi_c=float(psi_c)))
+
+
+@register_charfn("merton")
+def merton_charfn(r_curve: PiecewiseFlatCurve, q: float = 0.0, sigma: float = 0.2, lam: float = 0.1,
+                  mu_j: float = -0.1, sigma_j: float = 0.15) -> CharFn:
+    """Merton (1976): GBM + saltos compostos de Poisson (intensidade lam) com log-salto N(mu_j, sigma_j^2)."""
+    q, sigma, lam, mu_j, sigma_j = map(float, (q, sigma, lam, mu_j, sigma_j))
+    kbar = np.exp(mu_j + 0.5 * sigma_j ** 2) - 1.0
+    mu = _drift(r_curve, lambda T: q * T)
+
+    def phi(u, T):
+        u = np.asarray(u, dtype=complex)
+        jump = lam * T * (np.exp(1j * u * mu_j - 0.5 * sigma_j ** 2 * u * u) - 1.0)
+        return np.exp(1j * u * (mu(T) - (lam * kbar + 0.5 * sigma ** 2) * T) - 0.5 * sigma ** 2 * T * u * u + jump)
+
+    def cumulants(T):
+        c1 = mu(T) - (lam * kbar + 0.5 * sigma ** 2) * T + lam * mu_j * T
+        c2 = (sigma ** 2 + lam * (mu_j ** 2 + sigma_j ** 2)) * T
+        c4 = lam * T * (mu_j ** 4 + 6 * sigma_j ** 2 * mu_j ** 2 + 3 * sigma_j ** 4)
+        return c1, c2, c4
+
+    return CharFn(phi, lambda T: r_curve.df(0.0, T), cumulants)
+
+
+@register_charfn("vg")
+def variance_gamma_charfn(r_curve: PiecewiseFlatCurve, q: float = 0.0, sigma: float = 0.2, nu: float = 0.2,
+                          theta: float = -0.14) -> CharFn:
+    """Variance Gamma (Madan, Carr & Chang, 1998): browniano com drift theta num relógio gama de variância nu."""
+    q, sigma, nu, theta = map(float, (q, sigma, nu, theta))
+    arg = 1.0 - theta * nu - 0.5 * sigma ** 2 * nu
+    if arg <= 0:
+        raise ValueError("VG: 1 - theta nu - sigma^2 nu / 2 deve ser positivo.")
+    omega = np.log(arg) / nu  # correção de martingale
+    mu = _drift(r_curve, lambda T: q * T)
+
+    def phi(u, T):
+        u = np.asarray(u, dtype=complex)
+        return np.exp(1j * u * (mu(T) + omega * T)) * (1.0 - 1j * u * theta * nu + 0.5 * sigma ** 2 * nu * u * u) ** (-T / nu)
+
+    def cumulants(T):
+        c1 = mu(T) + (omega + theta) * T
+        c2 = (sigma ** 2 + nu * theta ** 2) * T
+        c4 = 3.0 * (sigma ** 4 * nu + 2.0 * theta ** 4 * nu ** 3 + 4.0 * sigma ** 2 * theta ** 2 * nu ** 2) * T
+        return c1, c2, c4
+
+    return CharFn(phi, lambda T: r_curve.df(0.0, T), cumulants)
+
+
+def model_charfn(model, asset: int = 0) -> CharFn:
+    """
+    CharFn de um modelo já construído: ``RiskNeutralGBM`` (ativo ``asset``;
+    q(t) e sigma(t) entram integrados em [0, T]) ou ``HestonModel``.
+    """
+    if hasattr(model, "charfn"):
+        return CharFn(lambda u, T: model.charfn(u, 1.0, T), lambda T: model.df(0.0, T))
+    if hasattr(model, "sigma_funcs"):
+        qf, sf = model.q_funcs[asset], model.sigma_funcs[asset]
+        return _gbm(model.r_curve, lambda T: quad(qf, 0.0, T)[0], lambda T: quad(lambda t: sf(t) ** 2, 0.0, T)[0])
+    raise TypeError(f"modelo sem funcao caracteristica: {type(model).__name__}")
@@ -1,13 +1,15 @@
 ﻿from __future__ import annotations
 
-import math
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from typing import Callable, Optional, Sequence, Dict
 
 import numpy as np
-from numpy.random import Generator, PCG64
+from numpy.random import Generator, PCG64, SeedSequence
 
 from ..curves import PiecewiseFlatCurve
+from ..engine.parallel import split_paths
 
 
 @dataclass
@@ -51,6 +53,8 @@ class RiskNeutralGBM:
 
         # Cholesky com pequeno jitter numÃ©rico
         self._chol = np.linalg.cholesky(self.corr + 1e-12 * np.eye(self.dim))
+        # cronogramas drift/vol por grade de tempo (ver _grid_schedule)
+        self._schedules: Dict[tuple, tuple] = {}
 
     def simulate_paths(
         self,
@@ -59,7 +63,50 @@ class RiskNeutralGBM:
         n_paths: int = 100_000,
         antithetic: bool = True,
         seed: Optional[int] = None,
+        rng: Optional[Generator] = None,
+        obs_idx: Optional[Sequence[int]] = None,
+        workers: Optional[int] = None,
+        dtype=np.float64,
+        out: Optional[np.ndarray] = None,
+        is_shift: Optional[Sequence[float]] = None,
     ) -> Dict[str, np.ndarray]:
+        """
+        Simula caminhos nas datas de ``times``.
+
+        Se ``rng`` for passado, as normais saem desse gerador (e ``seed`` é
+        ignorada); chamadas sucessivas com o mesmo ``rng`` continuam o mesmo
+        fluxo, o que permite simular em blocos reproduzindo exatamente o
+        conjunto de caminhos de uma única chamada.
+
+        Com ``obs_idx`` (índices da grade) só as colunas observadas — mais t0
+        e T — são simuladas e guardadas: como r, q e sigma são determinísticos,
+        o passo entre duas datas observadas é exato (drift e covariância
+        integrados: r pela integral da curva, q e sigma pelo ponto médio de
+        cada sub-passo da grade). O resultado traz ``"idx"`` com os índices da
+        grade guardados, que os helpers ``PF`` usam para localizar as datas.
+
+        Com ``workers`` > 1 a saída é pré-alocada e cada thread preenche uma
+        fatia com seu próprio Generator (filhos de ``SeedSequence(seed)`` ou de
+        ``rng.spawn``); o RNG e as ufuncs do NumPy liberam o GIL, então as
+        threads rodam em paralelo. Reprodutível para (seed, workers).
+
+        ``dtype=np.float32`` sorteia as normais e guarda S em precisão simples
+        (metade da memória/banda); o ruído de MC domina o arredondamento.
+
+        ``out`` é um buffer pré-alocado (n_paths, n_colunas, dim) reutilizado
+        como S — chamadas repetidas (blocos, re-precificações) não realocam;
+        o dtype passa a ser o de ``out``.
+
+        Drift e vol por passo são calculados uma vez por grade e cacheados no
+        modelo; os caminhos saem em espaço log (matmul em lote + cumsum + exp).
+
+        Amostragem por importância: ``is_shift`` = mu (dim,) desloca as normais
+        independentes (antes da correlação) de cada passo k em
+        theta_k = mu sqrt(tau_k / T), de modo que o driver terminal padronizado
+        sum_k sqrt(tau_k / T) Z_k passa a ter média mu. O resultado traz
+        ``"lr"`` = exp(-sum_k theta_k . Z_k + |mu|^2 / 2) por caminho, a razão
+        de verossimilhança que torna E[lr * payoff] não viesado.
+        """
         S0 = np.asarray(S0, dtype=float)
         assert S0.shape == (self.dim,)
         times = np.asarray(times, dtype=float)
@@ -68,34 +115,210 @@ class RiskNeutralGBM:
         if Tn <= 0:
             raise ValueError("times precisa ter ao menos [0, T].")
 
+        cols = None
+        if obs_idx is not None:
+            cols = np.unique(np.concatenate(([0], np.asarray(obs_idx, dtype=int), [Tn])))
+            if cols[0] < 0 or cols[-1] > Tn:
+                raise ValueError("obs_idx fora da grade de tempo.")
+            if len(cols) == Tn + 1:
+                cols = None
+
+        if cols is None:
+            fill = partial(self._fill_grid, S0, times)
+            shape = (n_paths, Tn + 1, self.dim)
+        else:
+            fill = partial(self._fill_observed, S0, times, cols)
+            shape = (n_paths, len(cols), self.dim)
+        if out is None:
+            S = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"out deve ter shape {shape}, recebido {out.shape}.")
+        else:
+            S = out
+
+        theta = None
+        if is_shift is not None:
+            tau = np.diff(times if cols is None else times[cols])
+            theta = np.asarray(is_shift, dtype=float)[None, :] * np.sqrt(tau / times[-1])[:, None]
+        fill = partial(fill, theta=theta)
+
+        if workers is not None and workers > 1:
+            if rng is not None:
+                gens = rng.spawn(workers)
+            else:
+                gens = [Generator(PCG64(ss)) for ss in SeedSequence(seed).spawn(workers)]
+            bounds = np.cumsum([0] + split_paths(n_paths, workers, antithetic))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                lrs = list(ex.map(lambda i: fill(gens[i], S[bounds[i]:bounds[i + 1]], antithetic), range(workers)))
+            lr = None if theta is None else np.concatenate(lrs)
+        else:
+            lr = fill(rng if rng is not None else Generator(PCG64(seed)), S, antithetic)
+
+        paths = {"times": times, "S": S} if cols is None else {"times": times[cols], "S": S, "idx": cols}
+        if lr is not None:
+            paths["lr"] = lr
+        return paths
+
+    def simulate_terminal(
+        self,
+        S0: Sequence[float],
+        times: np.ndarray,
+        n_paths: int = 100_000,
+        antithetic: bool = True,
+        seed: Optional[int] = None,
+        rng: Optional[Generator] = None,
+        dtype=np.float64,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Amostra exata de S_T em um único passo, para payoffs que só leem a data final.
+        Custo O(n_paths x dim) em vez de O(n_paths x steps x dim).
+
+        Retorna {"times": [0, T], "S": (n_paths, 2, dim), "idx": [0, len(times)-1]}.
+        """
+        Tn = len(times) - 1
+        return self.simulate_paths(S0, times, n_paths, antithetic, seed, rng, obs_idx=[Tn], dtype=dtype)
+
+    def _fill_grid(
+        self, S0: np.ndarray, times: np.ndarray, rng: Generator, out: np.ndarray, antithetic: bool, theta=None
+    ) -> Optional[np.ndarray]:
+        Z = self._draw_normals(rng, out.shape[0], len(times) - 1, antithetic, out.dtype)
+        lr = self._shift_normals(Z, theta)
+        self._paths_from_normals(S0, times, Z, out=out)
+        return lr
+
+    def _fill_observed(
+        self,
+        S0: np.ndarray,
+        times: np.ndarray,
+        cols: np.ndarray,
+        rng: Generator,
+        out: np.ndarray,
+        antithetic: bool,
+        theta=None,
+    ) -> Optional[np.ndarray]:
+        Z = self._draw_normals(rng, out.shape[0], len(cols) - 1, antithetic, out.dtype)
+        lr = self._shift_normals(Z, theta)
+        self._observed_from_normals(S0, times, cols, Z, out)
+        return lr
+
+    def _observed_from_normals(
+        self, S0: np.ndarray, times: np.ndarray, cols: np.ndarray, Z: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Como ``_paths_from_normals``, mas com passos exatos entre as colunas ``cols``."""
+        mean, L = self._observed_schedule(times, cols)
+        S = np.empty((Z.shape[0], len(cols), self.dim), dtype=Z.dtype) if out is None else out
+        inc = S[:, 1:, :]
+        np.einsum("nkj,kij->nki", Z, L.astype(S.dtype), out=inc)
+        inc += mean.astype(S.dtype)[None, :, :]
+        self._exp_cumsum(S0, S)
+        return S
+
+    @staticmethod
+    def _shift_normals(Z: np.ndarray, theta: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Z += theta in-place; devolve a razão de verossimilhança exp(-sum theta.Z + |theta|^2/2)."""
+        if theta is None:
+            return None
+        Z += theta.astype(Z.dtype)[None, :, :]
+        return np.exp(-np.einsum("nki,ki->n", Z, theta) + 0.5 * float((theta ** 2).sum()))
+
+    def _draw_normals(self, rng: Generator, n_paths: int, Tn: int, antithetic: bool, dtype=np.float64) -> np.ndarray:
         n_eff = n_paths if not antithetic else (n_paths + (n_paths % 2)) // 2
-        rng = Generator(PCG64(seed))
-        Z = rng.standard_normal(size=(n_eff, Tn, self.dim))
+        Z = rng.standard_normal(size=(n_eff, Tn, self.dim), dtype=dtype)
         if antithetic:
             Z = np.concatenate([Z, -Z], axis=0)
-        Z = Z[:n_paths]
+        return Z[:n_paths]
+
+    def _paths_from_normals(
+        self, S0: np.ndarray, times: np.ndarray, Z: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Caminhos a partir de normais Z (n_paths, Tn, dim), em espaço log:
+        incrementos de todos os passos numa única multiplicação correlacionada,
+        depois um cumsum + exp in-place em ``out`` (alocado se None).
+        """
+        n_paths, Tn = Z.shape[0], Z.shape[1]
+        S = np.empty((n_paths, Tn + 1, self.dim), dtype=Z.dtype) if out is None else out
+        drift, vol = self._grid_schedule(times)
+
+        inc = S[:, 1:, :]
+        if self.dim == 1:
+            np.multiply(Z, vol.astype(S.dtype)[None, :, :], out=inc)
+        else:
+            np.matmul(Z, self._chol.T.astype(S.dtype), out=inc)
+            inc *= vol.astype(S.dtype)[None, :, :]
+        inc += drift.astype(S.dtype)[None, :, :]
+        self._exp_cumsum(S0, S)
+        return S
+
+    @staticmethod
+    def _exp_cumsum(S0: np.ndarray, S: np.ndarray) -> None:
+        """S[:, 1:] tem log-incrementos; vira S0 * exp(soma acumulada), in-place."""
+        S[:, 0, :] = 0.0
+        np.cumsum(S, axis=1, out=S)
+        np.exp(S, out=S)
+        S *= S0.astype(S.dtype)[None, None, :]
 
-        S = np.empty((n_paths, Tn + 1, self.dim), dtype=float)
-        S[:, 0, :] = S0[None, :]
+    # -----------------------------------------------------------------------
+    # Cronogramas determinísticos (cacheados por grade)
+    # -----------------------------------------------------------------------
+    def _cached(self, key, build: Callable[[], tuple]) -> tuple:
+        hit = self._schedules.get(key)
+        if hit is None:
+            if len(self._schedules) >= 32:
+                self._schedules.pop(next(iter(self._schedules)))
+            hit = self._schedules[key] = build()
+        return hit
 
-        for k in range(Tn):
-            t0, t1 = times[k], times[k + 1]
-            dt = float(t1 - t0)
-            if dt <= 0:
+    def _grid_schedule(self, times: np.ndarray):
+        """
+        (drift, vol), cada um (Tn, dim), por passo da grade: r, q e sigma no
+        ponto médio; drift = (r - q - sigma^2/2) dt e vol = sigma sqrt(dt).
+        """
+        times = np.asarray(times, dtype=float)
+
+        def build():
+            dts = np.diff(times)
+            if np.any(dts <= 0):
                 raise ValueError("times deve ser estritamente crescente.")
-            t_mid = 0.5 * (t0 + t1)
+            mids = 0.5 * (times[:-1] + times[1:])
+            r = np.array([self.r_curve.r(t) for t in mids])
+            q = np.array([[f(t) for f in self.q_funcs] for t in mids])          # (Tn, dim)
+            sig = np.array([[f(t) for f in self.sigma_funcs] for t in mids])    # (Tn, dim)
+            drift = (r[:, None] - q - 0.5 * sig ** 2) * dts[:, None]
+            vol = sig * np.sqrt(dts)[:, None]
+            return drift, vol
 
-            r = self.r_curve.r(t_mid)
-            q = np.array([f(t_mid) for f in self.q_funcs])
-            sig = np.array([f(t_mid) for f in self.sigma_funcs])
+        return self._cached(("grid", times.tobytes()), build)
 
-            drift = (r - q - 0.5 * sig ** 2) * dt
-            vol = sig * math.sqrt(dt)
-            dW = Z[:, k, :] @ self._chol.T
+    def _observed_schedule(self, times: np.ndarray, cols: np.ndarray):
+        """
+        (mean, L) do passo exato entre colunas observadas consecutivas:
+        mean (n_obs, dim) e L (n_obs, dim, dim) = Cholesky da covariância
+        integrada (r pela integral da curva, q e sigma pelo ponto médio de
+        cada sub-passo).
+        """
+        times = np.asarray(times, dtype=float)
+        cols = np.asarray(cols, dtype=int)
 
-            S[:, k + 1, :] = S[:, k, :] * np.exp(drift[None, :] + vol[None, :] * dW)
+        def build():
+            dts = np.diff(times)
+            if np.any(dts <= 0):
+                raise ValueError("times deve ser estritamente crescente.")
+            mids = 0.5 * (times[:-1] + times[1:])
+            q = np.array([[f(t) for f in self.q_funcs] for t in mids])
+            sig = np.array([[f(t) for f in self.sigma_funcs] for t in mids])
+            n_obs = len(cols) - 1
+            mean = np.empty((n_obs, self.dim))
+            L = np.empty((n_obs, self.dim, self.dim))
+            for j in range(n_obs):
+                a, b = cols[j], cols[j + 1]
+                cov = np.einsum("k,ki,kj->ij", dts[a:b], sig[a:b], sig[a:b]) * self.corr
+                mean[j] = (self.r_curve.integral(float(times[a]), float(times[b]))
+                           - dts[a:b] @ q[a:b] - 0.5 * np.diag(cov))
+                L[j] = np.linalg.cholesky(cov + 1e-14 * np.eye(self.dim))
+            return mean, L
 
-        return {"times": times, "S": S}
+        return self._cached(("obs", times.tobytes(), cols.tobytes()), build)
 
     def df(self, t0: float, t1: float) -> float:
         return self.r_curve.df(t0, t1)
@@ -1,11 +1,40 @@
 ﻿from __future__ import annotations
 
 import math
-from typing import Callable, Sequence, Dict, Optional
+from dataclasses import dataclass
+from typing import Callable, Sequence, Dict, Optional, Tuple, Union
 
 import numpy as np
 
 
+def _cols(paths: Dict[str, np.ndarray], t_idx):
+    """
+    Converte índices da grade de tempo em colunas de paths["S"].
+    Caminhos simulados só nas datas observadas trazem paths["idx"] (índices
+    da grade guardados); sem essa chave as colunas são a própria grade.
+    """
+    idx = paths.get("idx")
+    if idx is None:
+        return t_idx
+    n_times = int(idx[-1]) + 1
+    want = np.asarray(t_idx)
+    want = np.where(want < 0, want + n_times, want)
+    pos = np.searchsorted(idx, want)
+    if np.any(pos >= len(idx)) or np.any(idx[np.minimum(pos, len(idx) - 1)] != want):
+        raise ValueError(f"datas {t_idx} nao foram simuladas (idx guardados: {list(idx)}).")
+    return pos if pos.ndim else int(pos)
+
+
+def _window(paths: Dict[str, np.ndarray], start: int, end: Optional[int], fixings: Optional[Sequence[int]]):
+    """Colunas de paths["S"] das datas start..end-1 da grade (ou dos índices ``fixings``)."""
+    if fixings is not None:
+        return _cols(paths, list(fixings))
+    if "idx" in paths:
+        n_times = int(paths["idx"][-1]) + 1
+        return _cols(paths, np.arange(n_times)[start:end])
+    return slice(start, end)
+
+
 class PF:
     @staticmethod
     def terminal(paths: Dict[str, np.ndarray], asset: int) -> np.ndarray:
@@ -13,7 +42,7 @@ class PF:
 
     @staticmethod
     def at_time(paths: Dict[str, np.ndarray], asset: int, t_idx: int) -> np.ndarray:
-        return paths["S"][:, t_idx, asset]
+        return paths["S"][:, _cols(paths, t_idx), asset]
 
     @staticmethod
     def running_max(paths: Dict[str, np.ndarray], asset: int) -> np.ndarray:
@@ -24,17 +53,34 @@ class PF:
         return paths["S"][:, :, asset].min(axis=1)
 
     @staticmethod
-    def average(paths: Dict[str, np.ndarray], asset: int, start: int = 1, end: Optional[int] = None) -> np.ndarray:
-        S = paths["S"][:, start:end, asset]
-        return S.mean(axis=1)
+    def average(
+        paths: Dict[str, np.ndarray],
+        asset: int,
+        start: int = 1,
+        end: Optional[int] = None,
+        fixings: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """Média nas datas start..end-1 da grade ou, se dado, nos índices ``fixings``."""
+        return paths["S"][:, _window(paths, start, end, fixings), asset].mean(axis=1)
+
+    @staticmethod
+    def geometric_average(
+        paths: Dict[str, np.ndarray],
+        asset: int,
+        start: int = 1,
+        end: Optional[int] = None,
+        fixings: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """Média geométrica nas mesmas datas de ``PF.average``."""
+        return np.exp(np.log(paths["S"][:, _window(paths, start, end, fixings), asset]).mean(axis=1))
 
     @staticmethod
     def basket(paths: Dict[str, np.ndarray], weights: Sequence[float], t_idx: Optional[int] = None) -> np.ndarray:
-        w = np.asarray(weights, dtype=float)
+        w = np.asarray(weights, dtype=paths["S"].dtype)  # preserva float32
         if t_idx is None:
             ST = paths["S"][:, -1, :]
         else:
-            ST = paths["S"][:, t_idx, :]
+            ST = paths["S"][:, _cols(paths, t_idx), :]
         return (ST * w[None, :]).sum(axis=1)
 
     @staticmethod
@@ -47,6 +93,140 @@ class PF:
         else:
             raise ValueError("direction must be 'up' or 'down'")
 
+    @staticmethod
+    def barrier_survival(
+        paths: Dict[str, np.ndarray],
+        asset: int,
+        level: float,
+        sigma: Union[float, Callable[[float], float]],
+        direction: str = "up",
+    ) -> np.ndarray:
+        """
+        Probabilidade de o ativo não tocar ``level`` em tempo contínuo, dado o
+        caminho na grade (ponte browniana em log S entre datas consecutivas):
+        em cada passo, P(toque) = exp(-2 (b - x_k)(b - x_{k+1}) / v_k), com
+        b = log(level), x = log S e v_k = integral de sigma^2 no passo.
+        Zero se alguma data da grade já está além da barreira.
+        ``sigma``: vol do ativo (escalar ou função de t).
+        """
+        if direction not in ("up", "down"):
+            raise ValueError("direction must be 'up' or 'down'")
+        x = np.log(paths["S"][:, :, asset] / level)
+        t = np.asarray(paths["times"], dtype=float)
+        dt = np.diff(t)
+        if callable(sigma):
+            v = np.array([sigma(tm) for tm in 0.5 * (t[:-1] + t[1:])]) ** 2 * dt
+        else:
+            v = float(sigma) ** 2 * dt
+        if direction == "up":
+            x = -x
+        # x > 0 no lado vivo; produto de distâncias consecutivas à barreira
+        p_hit = np.exp(-2.0 * np.maximum(x[:, :-1], 0.0) * np.maximum(x[:, 1:], 0.0) / v[None, :])
+        alive = (x > 0).all(axis=1)
+        return np.where(alive, np.prod(1.0 - p_hit, axis=1), 0.0)
+
+    @staticmethod
+    def barrier_survival_dsigma(
+        paths: Dict[str, np.ndarray],
+        asset: int,
+        level: float,
+        sigma: Union[float, Callable[[float], float]],
+        direction: str = "up",
+    ) -> np.ndarray:
+        """
+        Derivada de ``barrier_survival`` em relação a um choque paralelo em
+        sigma(t), com o caminho fixo (dependência explícita da ponte):
+        d p_k / d sigma = p_k 2 a_k / v_k^2 dv_k/dsigma, dv_k/dsigma = 2 sigma_k dt_k.
+        """
+        if direction not in ("up", "down"):
+            raise ValueError("direction must be 'up' or 'down'")
+        x = np.log(paths["S"][:, :, asset] / level)
+        t = np.asarray(paths["times"], dtype=float)
+        dt = np.diff(t)
+        if callable(sigma):
+            sig = np.array([sigma(tm) for tm in 0.5 * (t[:-1] + t[1:])])
+        else:
+            sig = np.full(len(dt), float(sigma))
+        v = sig ** 2 * dt
+        if direction == "up":
+            x = -x
+        a = 2.0 * np.maximum(x[:, :-1], 0.0) * np.maximum(x[:, 1:], 0.0)
+        p_hit = np.exp(-a / v[None, :])
+        dp = p_hit * a / v[None, :] ** 2 * (2.0 * sig * dt)[None, :]
+        q = 1.0 - p_hit
+        surv = np.prod(q, axis=1)
+        # d prod(q) = -sum_k dp_k prod_{j != k} q_j (q_k > 0 no lado vivo)
+        d = -surv * np.sum(dp / np.where(q > 0, q, 1.0), axis=1)
+        return np.where((x > 0).all(axis=1), d, 0.0)
+
+
+ObsIndex = Union[int, slice]
+
+
+@dataclass(frozen=True)
+class Payoff:
+    """
+    Payoff que declara as datas da grade que lê.
+
+      fn:         callable(paths) -> array (n_paths,)
+      obs:        índices da grade lidos (int, negativos contam do fim, ou slice);
+                  None = todas as datas
+      continuous: monitoramento contínuo (máx/mín/barreira) — exige a grade inteira
+      grad:       opcional, callable(paths) -> dF/dS com o shape de paths["S"];
+                  payoffs Lipschitz que o declaram têm Greeks pathwise
+      dsigma:     opcional, callable(paths) -> dF/dsigma_a (n_paths, n_ativos)
+                  com o caminho fixo, para payoffs em que a própria vol entra
+                  (ponte browniana); somado à vega de ``mc_greeks``
+
+    Com ``obs`` declarado o motor MC simula e guarda só essas colunas (mais
+    t0 e T), passando exatamente de uma data observada à seguinte.
+    """
+    fn: Callable[[Dict[str, np.ndarray]], np.ndarray]
+    obs: Optional[Tuple[ObsIndex, ...]] = None
+    continuous: bool = False
+    grad: Optional[Callable[[Dict[str, np.ndarray]], np.ndarray]] = None
+    dsigma: Optional[Callable[[Dict[str, np.ndarray]], np.ndarray]] = None
+
+    def __call__(self, paths: Dict[str, np.ndarray]) -> np.ndarray:
+        return self.fn(paths)
+
+    @property
+    def terminal_only(self) -> bool:
+        return not self.continuous and self.obs == (-1,)
+
+    def required_idx(self, n_times: int) -> Optional[np.ndarray]:
+        """Índices (não negativos, ordenados) lidos numa grade com n_times datas; None = todas."""
+        if self.continuous or self.obs is None:
+            return None
+        grid = np.arange(n_times)
+        return np.unique(np.concatenate([np.atleast_1d(grid[o]) for o in self.obs]))
+
+
+def required_indices(payoffs: Sequence[Callable], n_times: int) -> Optional[np.ndarray]:
+    """
+    União das datas lidas por ``payoffs``; None se algum precisa da grade
+    inteira (ou é um callable comum, sem declaração).
+    """
+    out = []
+    for f in payoffs:
+        req = f.required_idx(n_times) if isinstance(f, Payoff) else None
+        if req is None:
+            return None
+        out.append(req)
+    return np.unique(np.concatenate(out))
+
+
+def terminal_only(f: Callable, grad: Optional[Callable] = None) -> Payoff:
+    """Payoff que só lê a data final (via PF.terminal): S_T é amostrado em um passo."""
+    return Payoff(f, obs=(-1,), grad=grad)
+
+
+def _terminal_grad(paths: Dict[str, np.ndarray], weights: np.ndarray) -> np.ndarray:
+    """dF/dS com ``weights`` (n_paths, dim) na data final e zero no resto."""
+    g = np.zeros(paths["S"].shape)
+    g[:, -1, :] = weights
+    return g
+
 
 relu = lambda x: np.maximum(x, 0.0)
 max_ = np.maximum
@@ -54,25 +234,65 @@ min_ = np.minimum
 where = np.where
 
 
+def _unit(dim: int, asset: int) -> np.ndarray:
+    e = np.zeros(dim)
+    e[asset] = 1.0
+    return e
+
+
 def european_call(asset: int, K: float) -> Callable:
-    return lambda paths: relu(PF.terminal(paths, asset) - K)
+    def _grad(paths):
+        itm = PF.terminal(paths, asset) > K
+        return _terminal_grad(paths, itm[:, None] * _unit(paths["S"].shape[2], asset))
+    return terminal_only(lambda paths: relu(PF.terminal(paths, asset) - K), grad=_grad)
 
 def european_put(asset: int, K: float) -> Callable:
-    return lambda paths: relu(K - PF.terminal(paths, asset))
+    def _grad(paths):
+        itm = PF.terminal(paths, asset) < K
+        return _terminal_grad(paths, -itm[:, None] * _unit(paths["S"].shape[2], asset))
+    return terminal_only(lambda paths: relu(K - PF.terminal(paths, asset)), grad=_grad)
 
-def asian_arith_call(asset: int, K: float, start: int = 1, end: Optional[int] = None) -> Callable:
-    return lambda paths: relu(PF.average(paths, asset, start, end) - K)
+def asian_arith_call(
+    asset: int, K: float, start: int = 1, end: Optional[int] = None, fixings: Optional[Sequence[int]] = None
+) -> Callable:
+    obs = (slice(start, end),) if fixings is None else tuple(int(k) for k in fixings)
 
-def up_and_out_call(asset: int, K: float, barrier: float) -> Callable:
+    def _grad(paths):
+        cols = np.arange(paths["S"].shape[1])[_window(paths, start, end, fixings)]
+        itm = PF.average(paths, asset, start, end, fixings) > K
+        g = np.zeros(paths["S"].shape)
+        g[:, cols, asset] = itm[:, None] / len(cols)
+        return g
+    return Payoff(lambda paths: relu(PF.average(paths, asset, start, end, fixings) - K), obs=obs, grad=_grad)
+
+def up_and_out_call(
+    asset: int, K: float, barrier: float, sigma: Optional[Union[float, Callable[[float], float]]] = None
+) -> Callable:
+    """
+    Call up-and-out. Sem ``sigma`` a barreira é verificada só nas datas da
+    grade; com ``sigma`` (vol do ativo) o payoff é ponderado pela
+    sobrevivência contínua da ponte browniana (``PF.barrier_survival``) —
+    uma grade de ~50 passos já dá o preço de monitoramento contínuo.
+    """
     def _f(paths):
-        knocked = PF.barrier_touched(paths, asset, barrier, "up")
         base = relu(PF.terminal(paths, asset) - K)
+        if sigma is not None:
+            return base * PF.barrier_survival(paths, asset, barrier, sigma, "up")
+        knocked = PF.barrier_touched(paths, asset, barrier, "up")
         base[knocked] = 0.0
         return base
-    return _f
+
+    def _dsigma(paths):
+        out = np.zeros((paths["S"].shape[0], paths["S"].shape[2]))
+        out[:, asset] = relu(PF.terminal(paths, asset) - K) * PF.barrier_survival_dsigma(paths, asset, barrier, sigma, "up")
+        return out
+    return Payoff(_f, continuous=True, dsigma=None if sigma is None else _dsigma)
 
 def basket_call(weights: Sequence[float], K: float) -> Callable:
-    return lambda paths: relu(PF.basket(paths, weights) - K)
+    def _grad(paths):
+        itm = PF.basket(paths, weights) > K
+        return _terminal_grad(paths, itm[:, None] * np.asarray(weights, dtype=float)[None, :])
+    return terminal_only(lambda paths: relu(PF.basket(paths, weights) - K), grad=_grad)
 
 
 # --- Normal CDF sem SciPy ---
@@ -10,7 +10,7 @@ import matplotlib
 matplotlib.use("Agg")  # backend não interativo para CI/servers
 import matplotlib.pyplot as plt
 
-from ..dsl.spec import price_from_spec
+from ..dsl.spec import price_from_spec, pde_ladder_from_spec
 
 
 @dataclass
@@ -197,12 +197,15 @@ def plot_report(
     vary: Optional[int] = None,
     filename: Optional[str] = None,
     dpi: int = 150,
+    value_curve: bool = False,
 ) -> PlotReport:
     """
     Gera um relatório gráfico do payoff + inputs + equações + preço.
     Retorna um PlotReport; se filename for fornecido, salva a figura.
 
     - vary: índice do ativo a variar (se aplicável). Caso None, é inferido.
+    - value_curve: sobrepõe V(S, 0) de ``pde_ladder_from_spec`` (uma solução
+      extra da PDE; ValueError se o produto/modelo não cabe na PDE).
     """
     inputs = _gather_inputs(spec)
     product = spec.get("product", {})
@@ -248,6 +251,10 @@ def plot_report(
             ax_pay.step(x, y, where="post")
         else:
             ax_pay.plot(x, y)
+        # valor hoje V(S, 0): uma única solução da PDE dá a curva inteira
+        if value_curve:
+            ax_pay.plot(x, pde_ladder_from_spec(spec, x)["price"], "--", label="V(S, 0) (PDE)")
+            ax_pay.legend(loc="best")
         ax_pay.set_xlabel(xlab)
         ax_pay.set_ylabel("Payoff")
         ax_pay.set_title("Curva de Payoff (slice 1D)")
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from derivx import HestonModel, MonteCarloEngine, PiecewiseFlatCurve, RiskNeutralGBM
+
+
+def flat_curve(r=0.05):
+    return PiecewiseFlatCurve(np.array([1e-8]), np.array([r]))
+
+
+@pytest.fixture
+def gbm_model():
+    """Fábrica de RiskNeutralGBM: curva flat ``r`` (ou ``curve``), q=0 e sigma=20% por padrão."""
+    def make(q=0.0, sigma=0.2, corr=None, r=0.05, curve=None):
+        return RiskNeutralGBM(flat_curve(r) if curve is None else curve, q_funcs=q, sigma_funcs=sigma, corr=corr)
+    return make
+
+
+@pytest.fixture
+def mc_engine(gbm_model):
+    """Fábrica de MonteCarloEngine sobre ``gbm_model(**kw)``."""
+    return lambda **kw: MonteCarloEngine(gbm_model(**kw))
+
+
+@pytest.fixture
+def heston_model():
+    """Fábrica de HestonModel (r=5% flat, q=0, kappa=1.5, theta=0.04, xi=0.5, rho=-0.7, v0=0.04)."""
+    def make(r=0.05, **kw):
+        p = {"q": 0.0, "kappa": 1.5, "theta": 0.04, "xi": 0.5, "rho": -0.7, "v0": 0.04, **kw}
+        return HestonModel(flat_curve(r), **p)
+    return make
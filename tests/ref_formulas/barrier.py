@@ -0,0 +1,19 @@
+import math
+from .digitals import Phi
+
+
+def up_and_out_call_ref(S0, K, H, r, q, sigma, T):
+    """Reiner–Rubinstein (Haug), monitoramento contínuo, K < H, sem rebate: A - B + C - D."""
+    b = r - q
+    sT = sigma * math.sqrt(T)
+    mu = (b - 0.5 * sigma * sigma) / (sigma * sigma)
+    x1 = math.log(S0 / K) / sT + (1 + mu) * sT
+    x2 = math.log(S0 / H) / sT + (1 + mu) * sT
+    y1 = math.log(H * H / (S0 * K)) / sT + (1 + mu) * sT
+    y2 = math.log(H / S0) / sT + (1 + mu) * sT
+    fS, fK = S0 * math.exp((b - r) * T), K * math.exp(-r * T)
+    A = fS * Phi(x1) - fK * Phi(x1 - sT)
+    B = fS * Phi(x2) - fK * Phi(x2 - sT)
+    C = fS * (H / S0) ** (2 * (mu + 1)) * Phi(-y1) - fK * (H / S0) ** (2 * mu) * Phi(-y1 + sT)
+    D = fS * (H / S0) ** (2 * (mu + 1)) * Phi(-y2) - fK * (H / S0) ** (2 * mu) * Phi(-y2 + sT)
+    return A - B + C - D
@@ -0,0 +1,22 @@
+import cmath
+import math
+
+from scipy.integrate import quad
+
+
+def heston_call_ref(S0, K, r, q, kappa, theta, xi, rho, v0, T):
+    """Heston (1993) por integração numérica das probabilidades P1/P2 ("little trap" de Albrecher et al.)."""
+    def cf(u):
+        b = kappa - rho * xi * 1j * u
+        d = cmath.sqrt(b * b + xi * xi * (1j * u + u * u))
+        g = (b - d) / (b + d)
+        e = cmath.exp(-d * T)
+        C = kappa * theta / xi ** 2 * ((b - d) * T - 2.0 * cmath.log((1.0 - g * e) / (1.0 - g)))
+        D = (b - d) / xi ** 2 * (1.0 - e) / (1.0 - g * e)
+        return cmath.exp(C + D * v0 + 1j * u * (math.log(S0) + (r - q) * T))
+
+    k = math.log(K)
+    fwd = cf(-1j)
+    P1 = 0.5 + quad(lambda u: (cmath.exp(-1j * u * k) * cf(u - 1j) / (1j * u * fwd)).real, 1e-10, 200, limit=500)[0] / math.pi
+    P2 = 0.5 + quad(lambda u: (cmath.exp(-1j * u * k) * cf(u) / (1j * u)).real, 1e-10, 200, limit=500)[0] / math.pi
+    return S0 * math.exp(-q * T) * P1 - K * math.exp(-r * T) * P2
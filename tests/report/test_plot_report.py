@@ -155,3 +155,21 @@ def test_report_ir_cap_smoke():
     rep, out_png = _save_and_assert_png(spec, "cap_ir")
     assert rep.vary_asset is None
     assert "Cap" in (rep.pricing_equation_tex or "")
+
+
+def test_report_value_curve_is_opt_in(monkeypatch):
+    import derivx.report.plot as plot_mod
+    spec = {
+        "engine": "analytic",
+        "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+        "grid": {"T": 1.0},
+        "S0": [100.0],
+        "product": {"style": "european", "type": "european_put", "asset": 0, "K": 100.0},
+    }
+    calls = []
+    ladder = plot_mod.pde_ladder_from_spec
+    monkeypatch.setattr(plot_mod, "pde_ladder_from_spec", lambda s, S: calls.append(1) or ladder(s, S))
+    plot_report(spec)
+    assert calls == []
+    rep = plot_report(spec, value_curve=True)
+    assert calls == [1] and math.isfinite(rep.price)
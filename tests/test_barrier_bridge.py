@@ -0,0 +1,37 @@
+import numpy as np
+from derivx import price_from_spec, MonteCarloEngine, RiskNeutralGBM, PiecewiseFlatCurve, PF
+from derivx import up_and_out_call
+from tests.ref_formulas.barrier import up_and_out_call_ref
+
+
+def test_bridge_corrected_barrier_matches_continuous_formula():
+    ref = up_and_out_call_ref(100.0, 100.0, 130.0, 0.05, 0.0, 0.2, 1.0)
+    base = {"engine": "mc", "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 50}, "S0": [100.0], "n_paths": 100_000, "seed": 5,
+            "product": {"type": "up_and_out_call", "asset": 0, "K": 100.0, "barrier": 130.0}}
+    p_disc, se_disc = price_from_spec(base)
+    p, se = price_from_spec({**base, "product": {**base["product"], "monitoring": "continuous"}})
+    assert abs(p - ref) < 4 * se
+    # 50 datas discretas superestimam bastante (a barreira "escapa" entre as datas)
+    assert p_disc - ref > 10 * se_disc
+
+
+def test_barrier_survival_properties():
+    rc = PiecewiseFlatCurve(np.array([1e-8]), np.array([0.05]))
+    model = RiskNeutralGBM(rc, q_funcs=0.0, sigma_funcs=0.2)
+    times = np.linspace(0.0, 1.0, 21)
+    paths = model.simulate_paths([100.0], times, 5_000, seed=1)
+    up = PF.barrier_survival(paths, 0, 120.0, 0.2, "up")
+    assert np.all((up >= 0) & (up <= 1))
+    assert np.all(up[PF.barrier_touched(paths, 0, 120.0, "up")] == 0.0)
+    # sigma como função de t (constante) dá o mesmo resultado
+    assert np.allclose(up, PF.barrier_survival(paths, 0, 120.0, lambda t: 0.2, "up"))
+    down = PF.barrier_survival(paths, 0, 85.0, 0.2, "down")
+    assert np.all(down[PF.barrier_touched(paths, 0, 85.0, "down")] == 0.0) and down.mean() < 1.0
+
+    # float32 funciona e a correção contínua dá o mesmo na grade de 20 passos e numa grade fina
+    eng = MonteCarloEngine(model)
+    pay = up_and_out_call(0, 100.0, 130.0, sigma=0.2)
+    p20, se20 = eng.price(pay, [100.0], times, n_paths=40_000, seed=2, dtype=np.float32)
+    p200, se200 = eng.price(pay, [100.0], np.linspace(0.0, 1.0, 201), n_paths=40_000, seed=3)
+    assert abs(p20 - p200) < 4 * np.hypot(se20, se200)
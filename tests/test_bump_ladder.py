@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from derivx import MonteCarloEngine
+from derivx import european_call, up_and_out_call, basket_call
+from derivx.analytic import bs_call
+
+
+def test_spot_rate_sigma_ladders_match_black_scholes(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 5)
+    out = eng.bump_ladder(european_call(0, 100.0), [100.0], times, spot=[-0.01, 0.0, 0.01],
+                          sigma=[-0.01, 0.01], rate=[-1e-3, 1e-3], n_paths=100_000, seed=1)
+    base = out["base"][0]
+    sp = out["spot"]
+    assert sp["price"][1] == base and sp["diff_se"][1] == 0.0
+    # CRN: diferença com ruído muito menor que o SE do preço
+    assert np.all(sp["diff_se"] < 0.1 * sp["se"])
+
+    bs = lambda S=100.0, r=0.05, v=0.2: bs_call(S, 100.0, r, 0.0, v, 1.0)
+    delta = (sp["price"][2] - sp["price"][0]) / 2.0
+    vega = (out["sigma"]["price"][1] - out["sigma"]["price"][0]) / 0.02
+    rho = (out["rate"]["price"][1] - out["rate"]["price"][0]) / 2e-3
+    assert abs(delta - (bs(101.0) - bs(99.0)) / 2.0) < 4 * sp["diff_se"][2]
+    assert abs(vega - (bs(v=0.21) - bs(v=0.19)) / 0.02) < 4 * out["sigma"]["diff_se"][1] / 0.01
+    assert abs(rho - (bs(r=0.051) - bs(r=0.049)) / 2e-3) < 4 * out["rate"]["diff_se"][1] / 1e-3
+
+
+def test_rescaled_paths_equal_resimulation_with_same_normals(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 33)
+    ko = up_and_out_call(0, 100.0, 130.0)
+    out = eng.bump_ladder(ko, [100.0], times, spot=[0.02], rate=[0.01], n_paths=20_000, seed=2)
+    # S0 +2% reescalado == nova simulação com mesma seed a partir de 102
+    p_spot = eng.price(ko, [102.0], times, n_paths=20_000, seed=2)[0]
+    assert abs(out["spot"]["price"][0] - p_spot) < 1e-9
+    # curva chocada em +1%
+    p_rate = mc_engine(r=0.06).price(ko, [100.0], times, n_paths=20_000, seed=2)[0]
+    assert abs(out["rate"]["price"][0] - p_rate) < 1e-9
+
+
+def test_single_asset_sigma_bump_on_basket(mc_engine):
+    eng = mc_engine(q=[0.0, 0.0], sigma=[0.2, 0.3], corr=np.array([[1.0, 0.5], [0.5, 1.0]]))
+    times = np.array([0.0, 1.0])
+    out = eng.bump_ladder(basket_call([0.5, 0.5], 100.0), [100.0, 100.0], times,
+                          sigma=[0.01], asset=1, n_paths=50_000, seed=3)
+    ref = mc_engine(q=[0.0, 0.0], sigma=[0.2, 0.31], corr=np.array([[1.0, 0.5], [0.5, 1.0]])).price(
+        basket_call([0.5, 0.5], 100.0), [100.0, 100.0], times, n_paths=50_000, seed=3)[0]
+    assert abs(out["sigma"]["price"][0] - ref) < 1e-9
+
+
+def test_bump_ladder_rejects_non_gbm_models(heston_model):
+    eng = MonteCarloEngine(heston_model())
+    with pytest.raises(ValueError, match="RiskNeutralGBM"):
+        eng.bump_ladder(european_call(0, 100.0), [100.0], np.linspace(0.0, 1.0, 5), spot=[0.01], n_paths=100)
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+from derivx import price_from_spec, PiecewiseFlatCurve, RiskNeutralGBM
+from derivx.analytic import bs_call, bs_put
+from derivx.engine.cos import cos_prices
+from derivx.models.charfn import CHARFNS, get_charfn, model_charfn, register_charfn
+from tests.ref_formulas.heston import heston_call_ref
+
+RC = PiecewiseFlatCurve(np.array([1e-8]), np.array([0.05]))
+
+
+def _merton_ref(K, T, r=0.05, sigma=0.2, lam=0.5, mu_j=-0.1, sigma_j=0.15):
+    """Série de Merton: média de BS condicionada ao nº de saltos."""
+    kbar = math.exp(mu_j + 0.5 * sigma_j ** 2) - 1.0
+    lp = lam * (1.0 + kbar)
+    out = 0.0
+    for n in range(60):
+        s_n = math.sqrt(sigma ** 2 + n * sigma_j ** 2 / T)
+        r_n = r - lam * kbar + n * math.log(1.0 + kbar) / T
+        out += math.exp(-lp * T) * (lp * T) ** n / math.factorial(n) * bs_call(100.0, K, r_n, 0.0, s_n, T)
+    return out
+
+
+def test_cos_matches_references_across_models():
+    Ks = np.linspace(60.0, 160.0, 21)
+    gbm = cos_prices(get_charfn("gbm", RC, q=0.02, sigma=0.25), 100.0, Ks, [0.25, 2.0])
+    assert gbm.shape == (2, 21)
+    assert np.allclose(gbm[1], [bs_call(100.0, K, 0.05, 0.02, 0.25, 2.0) for K in Ks], atol=1e-10)
+    hes = cos_prices(get_charfn("heston", RC, q=0.02, kappa=1.5, theta=0.04, xi=0.5, rho=-0.7, v0=0.04), 100.0, Ks, 1.0)
+    assert np.allclose(hes, [heston_call_ref(100.0, K, 0.05, 0.02, 1.5, 0.04, 0.5, -0.7, 0.04, 1.0) for K in Ks], atol=1e-6)
+    mer = cos_prices(get_charfn("merton", RC, sigma=0.2, lam=0.5, mu_j=-0.1, sigma_j=0.15), 100.0, Ks, 1.0)
+    assert np.allclose(mer, [_merton_ref(K, 1.0) for K in Ks], atol=1e-8)
+    # VG: converge em N (densidade com pico) e respeita a paridade put-call
+    vg = get_charfn("vg", RC, sigma=0.12, nu=0.2, theta=-0.14)
+    c_hi = cos_prices(vg, 100.0, Ks, 1.0, N=2048)
+    assert np.allclose(cos_prices(vg, 100.0, Ks, 1.0, N=512), c_hi, atol=1e-6)
+    puts = cos_prices(vg, 100.0, Ks, 1.0, "put", N=2048)
+    assert np.allclose(c_hi - puts, 100.0 - Ks * math.exp(-0.05), atol=1e-8)
+
+
+def test_model_charfn_and_registry():
+    # sigma(t) dependente do tempo entra pela variância integrada
+    model = RiskNeutralGBM(RC, q_funcs=lambda t: 0.02, sigma_funcs=lambda t: 0.2 + 0.1 * t)
+    p = cos_prices(model_charfn(model), 100.0, 100.0, 1.0)
+    assert p == pytest.approx(bs_call(100.0, 100.0, 0.05, 0.02, math.sqrt(0.04 + 0.02 + 0.01 / 3), 1.0), abs=1e-10)
+    # extremos de strike continuam estáveis (puts diretos + paridade)
+    g = get_charfn("gbm", RC, sigma=0.25)
+    for K in (1.0, 2000.0):
+        assert cos_prices(g, 100.0, K, 1.0, "put") == pytest.approx(bs_put(100.0, K, 0.05, 0.0, 0.25, 1.0), abs=1e-9)
+
+    @register_charfn("gbm_test")
+    def _gbm_test(r_curve, sigma=0.2):
+        return get_charfn("gbm", r_curve, sigma=sigma)
+
+    try:
+        spec = {"engine": "cos", "model": {"name": "gbm_test", "r": 0.05, "sigma": 0.3}, "grid": {"T": 1.0},
+                "S0": [100.0], "product": {"style": "european", "type": "european_call", "asset": 0, "K": 100.0}}
+        p, se = price_from_spec(spec)
+        assert p == pytest.approx(bs_call(100.0, 100.0, 0.05, 0.0, 0.3, 1.0), abs=1e-9) and se == 0.0
+    finally:
+        CHARFNS.pop("gbm_test")
+    with pytest.raises(ValueError):
+        get_charfn("nao_existe", RC)
+
+
+def test_dsl_cos_grid_and_auto():
+    merton = {"name": "merton", "r": 0.05, "q": 0.0, "sigma": 0.2, "lam": 0.5, "mu_j": -0.1, "sigma_j": 0.15}
+    spec = {"engine": "cos", "model": merton, "grid": {"T": [0.5, 1.0]}, "S0": [100.0],
+            "product": {"style": "european", "type": "european_call", "asset": 0, "K": [90.0, 100.0, 110.0]}}
+    p, se = price_from_spec(spec)
+    assert p.shape == (2, 3) and np.all(se == 0)
+    assert p[1, 1] == pytest.approx(_merton_ref(100.0, 1.0), abs=1e-8)
+    auto, _ = price_from_spec({**spec, "engine": "auto", "grid": {"T": 1.0}, "product": {**spec["product"], "K": 100.0}})
+    assert auto == pytest.approx(p[1, 1])
+    # Merton não tem simulação: MC recusa em vez de cair no GBM
+    with pytest.raises(ValueError):
+        price_from_spec({**spec, "engine": "mc", "grid": {"T": 1.0, "steps": 4}, "product": {**spec["product"], "K": 100.0}})
+    heston = {"name": "heston", "r": 0.05, "q": 0.0, "kappa": 1.5, "theta": 0.04, "xi": 0.5, "rho": -0.7, "v0": 0.04}
+    h_cos, _ = price_from_spec({**spec, "model": heston, "grid": {"T": 1.0}, "product": {**spec["product"], "K": 100.0}})
+    h_fft, _ = price_from_spec({**spec, "engine": "fft", "model": heston, "grid": {"T": 1.0}, "product": {**spec["product"], "K": 100.0}})
+    assert h_cos == pytest.approx(h_fft, abs=1e-5)
@@ -0,0 +1,44 @@
+import numpy as np
+from derivx import price_from_spec
+from derivx import asian_arith_call, european_call, bs_call_price
+
+
+def test_float32_paths_match_float64_on_same_normals(gbm_model):
+    # mesmas normais: a diferença é só arredondamento (muito abaixo do ruído de MC)
+    model = gbm_model()
+    times = np.linspace(0.0, 1.0, 253)
+    Z = np.random.default_rng(0).standard_normal((20_000, 252, 1))
+    S64 = model._paths_from_normals(np.array([100.0]), times, Z)
+    S32 = model._paths_from_normals(np.array([100.0]), times, Z.astype(np.float32))
+    assert S32.dtype == np.float32
+    assert np.max(np.abs(S32 / S64 - 1.0)) < 1e-4
+    A64 = np.maximum(S64[:, 1:, 0].mean(axis=1) - 100.0, 0.0).mean()
+    A32 = np.maximum(S32[:, 1:, 0].mean(axis=1, dtype=np.float64) - 100.0, 0.0).mean()
+    assert abs(A32 - A64) < 1e-3
+
+
+def test_float32_price_is_unbiased(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 65)
+    ref = bs_call_price(100.0, 100.0, 0.05, 0.0, 0.2, 1.0)
+    paths = eng.model.simulate_paths([100.0], times, 1_000, seed=1, dtype=np.float32)
+    assert paths["S"].dtype == np.float32
+    p, se = eng.price(european_call(0, 100.0), [100.0], times, n_paths=100_000, seed=3, dtype=np.float32)
+    assert abs(p - ref) < 4 * se
+    # asiático em blocos: mesmo preço que float64 dentro do ruído
+    pa32, se32 = eng.price(asian_arith_call(0, 100.0), [100.0], times, n_paths=50_000, seed=4,
+                           chunk_size=8_192, dtype=np.float32)
+    pa64, se64 = eng.price(asian_arith_call(0, 100.0), [100.0], times, n_paths=50_000, seed=4)
+    assert abs(pa32 - pa64) < 4 * np.hypot(se32, se64)
+
+
+def test_float32_lsmc_via_dsl():
+    spec = {"engine": "mc",
+            "model": {"name": "gbm", "r": 0.06, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 50},
+            "S0": [36.0],
+            "product": {"style": "american", "type": "put", "asset": 0, "K": 40.0},
+            "n_paths": 40_000, "seed": 7}
+    p64, se64 = price_from_spec(spec)
+    p32, se32 = price_from_spec({**spec, "dtype": "float32"})
+    assert abs(p32 - p64) < 4 * np.hypot(se32, se64)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from derivx import PiecewiseFlatCurve, asian_arith_call
+
+
+@pytest.fixture
+def model_kw():
+    return {"q": [0.01, 0.02], "sigma": [lambda t: 0.15 + 0.1 * t, 0.3], "corr": np.array([[1.0, -0.4], [-0.4, 1.0]]),
+            "curve": PiecewiseFlatCurve(np.array([0.5, 1.0]), np.array([0.03, 0.06]))}
+
+
+def _stepwise(model, S0, times, Z):
+    # referência: passo a passo, como na implementação original
+    S = np.empty((Z.shape[0], Z.shape[1] + 1, model.dim))
+    S[:, 0, :] = S0
+    for k in range(Z.shape[1]):
+        dt = times[k + 1] - times[k]
+        tm = 0.5 * (times[k] + times[k + 1])
+        q = np.array([f(tm) for f in model.q_funcs])
+        sig = np.array([f(tm) for f in model.sigma_funcs])
+        dW = Z[:, k, :] @ model._chol.T
+        S[:, k + 1, :] = S[:, k, :] * np.exp((model.r_curve.r(tm) - q - 0.5 * sig ** 2) * dt + sig * np.sqrt(dt) * dW)
+    return S
+
+
+def test_log_space_matches_stepwise_and_caches_schedule(gbm_model, model_kw):
+    model = gbm_model(**model_kw)
+    times = np.linspace(0.0, 1.0, 51)
+    S0 = np.array([100.0, 80.0])
+    Z = np.random.default_rng(0).standard_normal((2_000, 50, 2))
+    S = model._paths_from_normals(S0, times, Z)
+    assert np.allclose(S, _stepwise(model, S0, times, Z), rtol=1e-12)
+    assert model._grid_schedule(times) is model._grid_schedule(times.copy())
+
+
+def test_out_buffer_is_reused(gbm_model, model_kw):
+    model = gbm_model(**model_kw)
+    times = np.linspace(0.0, 1.0, 13)
+    buf = np.empty((1_000, 13, 2))
+    a = model.simulate_paths([100.0, 80.0], times, 1_000, seed=3, out=buf)
+    assert a["S"] is buf
+    b = model.simulate_paths([100.0, 80.0], times, 1_000, seed=3)
+    assert np.array_equal(buf, b["S"])
+    # colunas esparsas também aceitam buffer
+    c = model.simulate_paths([100.0, 80.0], times, 1_000, seed=3, obs_idx=[6], out=buf[:, :3])
+    assert np.shares_memory(c["S"], buf)
+    try:
+        model.simulate_paths([100.0, 80.0], times, 999, seed=3, out=buf)
+        assert False
+    except ValueError:
+        pass
+
+
+def test_chunked_price_with_reused_buffer_is_unchanged(mc_engine, model_kw):
+    eng = mc_engine(**model_kw)
+    times = np.linspace(0.0, 1.0, 25)
+    p1 = eng.price(asian_arith_call(1, 80.0), [100.0, 80.0], times, n_paths=9_001, seed=2)
+    p2 = eng.price(asian_arith_call(1, 80.0), [100.0, 80.0], times, n_paths=9_001, seed=2, chunk_size=2_000)
+    assert abs(p1[0] - p2[0]) < 1e-9 and abs(p1[1] - p2[1]) < 1e-9
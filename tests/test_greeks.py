@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from derivx import MonteCarloEngine
+from derivx import european_call, asian_arith_call, basket_call, up_and_out_call
+from derivx.analytic import bs_call, cash_or_nothing_call
+from derivx.dsl.spec import _build_payoff
+from tests.ref_formulas.barrier import up_and_out_call_ref
+
+
+def _fd(f, x, h):
+    return (f(x + h) - f(x - h)) / (2 * h), (f(x + h) - 2 * f(x) + f(x - h)) / h ** 2
+
+
+def _close(g, name, ref, k=4.0):
+    return np.all(np.abs(np.asarray(g[name]) - ref) < k * np.asarray(g["se"][name]) + 1e-12)
+
+
+def test_european_call_pathwise_and_lr_match_black_scholes(mc_engine):
+    eng = mc_engine(q=0.01)
+    delta, gamma = _fd(lambda s: bs_call(s, 100.0, 0.05, 0.01, 0.2, 1.0), 100.0, 1e-3)
+    vega = _fd(lambda v: bs_call(100.0, 100.0, 0.05, 0.01, v, 1.0), 0.2, 1e-4)[0]
+    rho = _fd(lambda r: bs_call(100.0, 100.0, r, 0.01, 0.2, 1.0), 0.05, 1e-4)[0]
+    times = np.linspace(0.0, 1.0, 9)
+    for method in ("pathwise", "lr"):
+        g = eng.greeks(european_call(0, 100.0), [100.0], times, n_paths=100_000, seed=1, method=method)
+        assert g["method"] == method
+        for name, ref in (("delta", delta), ("gamma", gamma), ("vega", vega), ("rho", rho)):
+            assert _close(g, name, ref), (method, name, g[name], ref)
+    # pathwise é bem menos ruidoso que LR
+    pw = eng.greeks(european_call(0, 100.0), [100.0], times, n_paths=100_000, seed=1)
+    lr = eng.greeks(european_call(0, 100.0), [100.0], times, n_paths=100_000, seed=1, method="lr")
+    assert pw["method"] == "pathwise" and pw["se"]["vega"] < lr["se"]["vega"] / 2
+
+
+def test_path_dependent_and_basket_estimators_agree(mc_engine):
+    times = np.linspace(0.0, 1.0, 13)
+    eng = mc_engine(q=0.01)
+    a = eng.greeks(asian_arith_call(0, 100.0), [100.0], times, n_paths=100_000, seed=2)
+    b = eng.greeks(asian_arith_call(0, 100.0), [100.0], times, n_paths=100_000, seed=3, method="lr")
+    for name in ("delta", "vega", "rho"):
+        assert np.all(np.abs(np.asarray(a[name]) - b[name]) < 4 * np.hypot(a["se"][name], b["se"][name]))
+
+    eng2 = mc_engine(q=[0.0, 0.02], sigma=[0.2, lambda t: 0.25 + 0.1 * t], corr=np.array([[1.0, 0.6], [0.6, 1.0]]))
+    p = basket_call([0.5, 0.5], 100.0)
+    a = eng2.greeks(p, [100.0, 90.0], times, n_paths=100_000, seed=4)
+    b = eng2.greeks(p, [100.0, 90.0], times, n_paths=100_000, seed=5, method="lr")
+    assert a["delta"].shape == (2,)
+    for name in ("delta", "gamma", "vega"):
+        assert np.all(np.abs(a[name] - b[name]) < 4 * np.hypot(a["se"][name], b["se"][name]))
+
+
+def test_lr_greeks_for_discontinuous_payoffs(mc_engine):
+    eng = mc_engine(q=0.0)
+    dig = _build_payoff({"type": "cash_or_nothing_call", "K": 100.0, "cash": 1.0})
+    g = eng.greeks(dig, [100.0], np.linspace(0.0, 1.0, 9), n_paths=100_000, seed=6)
+    assert g["method"] == "lr"
+    delta, gamma = _fd(lambda s: cash_or_nothing_call(s, 100.0, 0.05, 0.0, 0.2, 1.0, 1.0), 100.0, 1e-3)
+    vega = _fd(lambda v: cash_or_nothing_call(100.0, 100.0, 0.05, 0.0, v, 1.0, 1.0), 0.2, 1e-4)[0]
+    assert _close(g, "delta", delta) and _close(g, "gamma", gamma) and _close(g, "vega", vega)
+
+    # barreira: sem grad, LR; delta de um knock-out ATM perto da barreira < delta vanilla
+    ko = eng.greeks(up_and_out_call(0, 100.0, 130.0), [100.0], np.linspace(0.0, 1.0, 9), n_paths=50_000, seed=7)
+    assert ko["method"] == "lr" and ko["delta"][0] < 0.6
+    try:
+        eng.greeks(dig, [100.0], np.linspace(0.0, 1.0, 9), n_paths=1_000, method="pathwise")
+        assert False
+    except ValueError:
+        pass
+
+
+def test_greeks_reject_non_gbm_models(heston_model):
+    eng = MonteCarloEngine(heston_model())
+    with pytest.raises(ValueError, match="RiskNeutralGBM"):
+        eng.greeks(european_call(0, 100.0), [100.0], np.linspace(0.0, 1.0, 5), n_paths=100, seed=1)
+
+
+def test_lr_vega_includes_bridge_sigma_for_continuous_barrier(mc_engine):
+    # a vol entra na sobrevivência da ponte: a vega LR precisa do termo explícito dF/dsigma
+    eng = mc_engine(q=0.0)
+    pay = up_and_out_call(0, 100.0, 130.0, sigma=0.2)
+    g = eng.greeks(pay, [100.0], np.linspace(0.0, 1.0, 9), n_paths=100_000, seed=2)
+    ref = lambda s, v: up_and_out_call_ref(s, 100.0, 130.0, 0.05, 0.0, v, 1.0)
+    assert g["method"] == "lr" and pay.dsigma is not None
+    assert _close(g, "vega", _fd(lambda v: ref(100.0, v), 0.2, 1e-4)[0])
+    assert _close(g, "delta", _fd(lambda s: ref(s, 0.2), 100.0, 1e-3)[0])
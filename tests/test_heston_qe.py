@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from derivx import price_from_spec, MonteCarloEngine, european_call
+from tests.ref_formulas.heston import heston_call_ref
+
+HESTON = {"name": "heston", "r": 0.05, "q": 0.0, "kappa": 1.5, "theta": 0.04, "xi": 0.5, "rho": -0.7, "v0": 0.04}
+
+
+@pytest.mark.parametrize("xi", [0.5, 1.0])  # xi=1 cai muito no ramo exponencial (v = 0 com massa)
+def test_qe_forward_is_martingale_and_variance_mean_exact(xi, heston_model):
+    model = heston_model(xi=xi)
+    times = np.linspace(0.0, 2.0, 5)  # passos de meio ano
+    paths = model.simulate_paths([100.0], times, 200_000, seed=1)
+    assert paths["S"].shape == (200_000, 5, 1) and paths["v"].shape == (200_000, 5)
+    assert paths["v"].min() >= 0.0
+    disc = paths["S"][:, -1, 0] * model.df(0.0, 2.0)
+    assert abs(disc.mean() - 100.0) < 4 * disc.std() / np.sqrt(len(disc))
+    v = paths["v"][:, -1]
+    Ev = model.theta + (model.v0 - model.theta) * np.exp(-model.kappa * 2.0)
+    assert abs(v.mean() - Ev) < 4 * v.std() / np.sqrt(len(v))
+
+
+def test_qe_few_steps_match_semi_analytic():
+    ref = heston_call_ref(100.0, 100.0, 0.05, 0.0, 1.5, 0.04, 0.5, -0.7, 0.04, 1.0)
+    spec = {"engine": "mc", "model": HESTON, "grid": {"T": 1.0, "steps": 16}, "S0": [100.0],
+            "product": {"style": "european", "type": "european_call", "asset": 0, "K": 100.0},
+            "n_paths": 100_000, "seed": 7, "control_variates": "auto"}
+    p, se = price_from_spec(spec)
+    assert abs(p - ref) < max(4 * se, 0.03)
+    # engine 'auto' não usa Black–Scholes com um modelo Heston (vai para a FFT)
+    p_auto, _ = price_from_spec({**spec, "engine": "auto"})
+    assert p_auto == pytest.approx(ref, abs=1e-4)
+
+
+def test_heston_threads_and_lsmc(heston_model):
+    eng = MonteCarloEngine(heston_model())
+    times = np.linspace(0.0, 1.0, 17)
+    p1, se1 = eng.price(european_call(0, 100.0), [100.0], times, n_paths=40_000, seed=3, n_workers=4, backend="threads")
+    p2, se2 = eng.price(european_call(0, 100.0), [100.0], times, n_paths=40_000, seed=4)
+    assert abs(p1 - p2) < 4 * np.hypot(se1, se2)
+
+    spec = {"engine": "mc", "model": HESTON, "grid": {"T": 1.0, "steps": 25}, "S0": [100.0],
+            "product": {"style": "american", "type": "european_put", "asset": 0, "K": 100.0},
+            "n_paths": 20_000, "seed": 3}
+    am, _ = price_from_spec(spec)
+    eu, _ = price_from_spec({**spec, "product": {**spec["product"], "style": "european"}})
+    assert am > eu
+
+
+@pytest.mark.parametrize("bad", [{"kappa": 0.0}, {"kappa": -1.0}, {"xi": 0.0}, {"v0": -0.01}])
+def test_heston_rejects_invalid_parameters(bad, heston_model):
+    # kappa = 0 zeraria o denominador da variancia condicional do esquema QE
+    with pytest.raises(ValueError, match="kappa, xi > 0"):
+        heston_model(**bad)
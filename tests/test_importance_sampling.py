@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from derivx import price_from_spec, MonteCarloEngine
+from derivx import european_call, basket_call
+from derivx.analytic import bs_call, cash_or_nothing_call
+from derivx.engine.importance import optimal_shift
+
+
+def test_deep_otm_call_is_unbiased_with_smaller_se(mc_engine):
+    eng = mc_engine()
+    times = np.array([0.0, 1.0])
+    pay = european_call(0, 170.0)
+    ref = bs_call(100.0, 170.0, 0.05, 0.0, 0.2, 1.0)
+    _, se0 = eng.price(pay, [100.0], times, n_paths=40_000, seed=1)
+    p, se = eng.price(pay, [100.0], times, n_paths=40_000, seed=1, importance_shift="auto")
+    assert abs(p - ref) < 4 * se
+    assert se < se0 / 5
+
+
+def test_digital_via_spec_and_explicit_shift_on_grid(mc_engine):
+    spec = {
+        "engine": "mc", "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+        "grid": {"T": 1.0, "steps": 16}, "S0": [100.0], "n_paths": 40_000, "seed": 3,
+        "product": {"type": "cash_or_nothing_call", "asset": 0, "K": 160.0},
+    }
+    ref = cash_or_nothing_call(100.0, 160.0, 0.05, 0.0, 0.2, 1.0, 1.0)
+    _, se0 = price_from_spec(spec)
+    p, se = price_from_spec({**spec, "importance_shift": "auto"})
+    assert abs(p - ref) < 4 * se and se < se0 / 3
+
+    # mesmo deslocamento num grid completo (caminho todo simulado), em blocos
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 9)
+    p, se = eng.price(european_call(0, 170.0), [100.0], times, n_paths=40_000, seed=4,
+                      importance_shift=[2.85], chunk_size=7_000)
+    assert abs(p - bs_call(100.0, 170.0, 0.05, 0.0, 0.2, 1.0)) < 4 * se
+
+
+def test_likelihood_ratio_has_unit_mean_and_basket_shift(gbm_model):
+    model = gbm_model(sigma=[0.2, 0.3], q=[0.0, 0.0], corr=np.array([[1.0, 0.3], [0.3, 1.0]]))
+    times = np.linspace(0.0, 1.0, 5)
+    paths = model.simulate_paths([100.0, 100.0], times, 50_000, seed=2, is_shift=np.array([0.5, -0.3]))
+    lr = paths["lr"]
+    assert abs(lr.mean() - 1.0) < 4 * lr.std() / np.sqrt(lr.size)
+
+    pay = basket_call([0.5, 0.5], 160.0)
+    mu = optimal_shift(model, pay, [100.0, 100.0], times)
+    assert np.all(mu > 0)
+    eng = MonteCarloEngine(model)
+    p0, se0 = eng.price(pay, [100.0, 100.0], times, n_paths=40_000, seed=7)
+    p, se = eng.price(pay, [100.0, 100.0], times, n_paths=40_000, seed=7, importance_shift=mu)
+    assert abs(p - p0) < 4 * np.hypot(se, se0) and se < se0 / 4
+
+
+def test_importance_shift_rejects_sobol(mc_engine):
+    eng = mc_engine()
+    with pytest.raises(ValueError):
+        eng.price(european_call(0, 170.0), [100.0], np.array([0.0, 1.0]), n_paths=1024,
+                  sampler="sobol", importance_shift="auto")
@@ -0,0 +1,37 @@
+import numpy as np
+from derivx import price_from_spec, MCResult
+from derivx import european_call, asian_arith_call
+
+
+def test_target_se_stops_when_reached(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 17)
+    res = eng.price(asian_arith_call(0, 100.0), [100.0], times, n_paths=4_000, seed=1, target_se=0.02)
+    assert isinstance(res, MCResult)
+    price, se = res
+    assert se <= 0.02 and 4_000 < res.n_paths < 200_000
+    # mesmo fluxo de normais: igual à chamada única com o nº de caminhos usado
+    ref = eng.price(asian_arith_call(0, 100.0), [100.0], times, n_paths=res.n_paths, seed=1)
+    assert abs(price - ref[0]) < 1e-9 and abs(se - ref[1]) < 1e-9
+
+
+def test_relative_target_and_cap(mc_engine):
+    eng = mc_engine()
+    times = np.array([0.0, 1.0])
+    res = eng.price(european_call(0, 100.0), [100.0], times, n_paths=2_000, seed=2, target_rel_se=1e-3)
+    assert res.se <= 1e-3 * res.price
+    capped = eng.price(european_call(0, 100.0), [100.0], times, n_paths=2_000, seed=2,
+                       target_se=1e-6, max_paths=10_000)
+    assert capped.n_paths == 10_000 and capped.se > 1e-6
+
+
+def test_dsl_target_se_with_workers():
+    spec = {"engine": "mc",
+            "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 16},
+            "S0": [100.0],
+            "product": {"style": "european", "type": "asian_arith_call", "asset": 0, "K": 100.0},
+            "n_paths": 5_000, "seed": 3, "target_se": 0.03,
+            "parallel": {"backend": "threads", "workers": 2}}
+    res = price_from_spec(spec)
+    assert res.se <= 0.03 and res.n_paths >= 5_000
@@ -0,0 +1,38 @@
+import numpy as np
+from derivx import price_from_spec
+from derivx import asian_arith_call, european_call
+
+
+def test_chunked_matches_single_block(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 33)
+    payoff = asian_arith_call(0, 100.0)
+    # n_paths ímpar + antitético: o último bloco descarta a cópia negativa, como na chamada única
+    p_full, se_full = eng.price(payoff, [100.0], times, n_paths=20_001, seed=5)
+    p_chunk, se_chunk = eng.price(payoff, [100.0], times, n_paths=20_001, seed=5, chunk_size=3_000)
+    assert abs(p_full - p_chunk) < 1e-9
+    assert abs(se_full - se_chunk) < 1e-9
+
+
+def test_chunked_is_reproducible_and_supports_control_variate(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 17)
+    payoff = asian_arith_call(0, 100.0)
+    cv = (european_call(0, 100.0), 10.450583572185565)
+    a = eng.price(payoff, [100.0], times, n_paths=10_000, seed=3, control_variate=cv, chunk_size=1_024)
+    b = eng.price(payoff, [100.0], times, n_paths=10_000, seed=3, control_variate=cv, chunk_size=1_024)
+    c = eng.price(payoff, [100.0], times, n_paths=10_000, seed=3, control_variate=cv)
+    assert a == b
+    assert abs(a[0] - c[0]) < 1e-9 and abs(a[1] - c[1]) < 1e-9
+
+
+def test_dsl_memory_budget():
+    spec = {"engine": "mc",
+            "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 64},
+            "S0": [100.0],
+            "product": {"style": "european", "type": "european_call", "asset": 0, "K": 100.0},
+            "n_paths": 20_000, "seed": 42}
+    p_full, _ = price_from_spec(spec)
+    p_budget, se = price_from_spec({**spec, "max_memory_mb": 1})
+    assert abs(p_full - p_budget) < 1e-9 and se > 0
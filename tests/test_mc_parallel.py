@@ -0,0 +1,86 @@
+from derivx import price_from_spec, bs_call_price
+
+
+def _spec(product, **extra):
+    return {"engine": "mc",
+            "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 64}, "S0": [100.0],
+            "product": product, "n_paths": 40_000, "seed": 7, **extra}
+
+
+def test_process_pool_is_reproducible_and_unbiased():
+    prod = {"style": "european", "type": "european_call", "asset": 0, "K": 100.0}
+    par = {"parallel": {"backend": "processes", "workers": 3}}
+    a = price_from_spec(_spec(prod, **par))
+    b = price_from_spec(_spec(prod, **par))
+    assert a == b
+    # fluxos diferentes dos do caso serial, mas mesma lei
+    serial = price_from_spec(_spec(prod))
+    assert a != serial
+    bs = bs_call_price(100.0, 100.0, 0.05, 0.0, 0.2, 1.0)
+    assert abs(a[0] - bs) < 4 * a[1]
+    assert abs(a[1] - serial[1]) < 0.1 * serial[1]
+
+
+def test_process_pool_lsmc():
+    prod = {"style": "bermudan", "type": "european_put", "asset": 0, "K": 100.0, "exercise_every": 16}
+    p, se = price_from_spec(_spec(prod, parallel={"backend": "processes", "workers": 2}))
+    p_ser, se_ser = price_from_spec(_spec(prod))
+    assert abs(p - p_ser) < 4 * (se + se_ser)
+
+
+def test_thread_backend_is_reproducible():
+    prod = {"style": "european", "type": "asian_arith_call", "asset": 0, "K": 100.0}
+    par = {"parallel": {"backend": "threads", "workers": 4}}
+    a = price_from_spec(_spec(prod, **par))
+    b = price_from_spec(_spec(prod, **par))
+    assert a == b
+    serial = price_from_spec(_spec(prod))
+    assert abs(a[0] - serial[0]) < 4 * (a[1] + serial[1])
+
+
+def test_threaded_simulation_fills_preallocated_slices():
+    import numpy as np
+    from derivx import RiskNeutralGBM, PiecewiseFlatCurve
+    model = RiskNeutralGBM(PiecewiseFlatCurve(np.array([1e-8]), np.array([0.05])), 0.0, 0.2)
+    times = np.linspace(0.0, 1.0, 17)
+    a = model.simulate_paths([100.0], times, 10_001, seed=3, workers=3)["S"]
+    b = model.simulate_paths([100.0], times, 10_001, seed=3, workers=3)["S"]
+    assert a.shape == (10_001, 17, 1) and np.array_equal(a, b)
+    # cada fatia é um fluxo independente do serial
+    c = model.simulate_paths([100.0], times, 10_001, seed=3)["S"]
+    assert not np.array_equal(a, c)
+    bermudan = {"style": "bermudan", "type": "european_put", "asset": 0, "K": 100.0, "exercise_every": 16}
+    p, se = price_from_spec(_spec(bermudan, parallel={"backend": "threads", "workers": 2}))
+    assert p > 0 and se > 0
+
+
+def test_antithetic_pairs_stay_within_a_worker():
+    import numpy as np
+    from derivx import RiskNeutralGBM, PiecewiseFlatCurve
+    from derivx.engine.parallel import split_paths
+    assert split_paths(10, 3) == [4, 3, 3]
+    assert split_paths(10, 3, antithetic=True) == [4, 4, 2]
+    assert split_paths(11, 3, antithetic=True) == [4, 4, 3]
+    model = RiskNeutralGBM(PiecewiseFlatCurve(np.array([1e-8]), np.array([0.05])), 0.0, 0.2)
+    S = model.simulate_paths([100.0], np.array([0.0, 1.0]), 10, seed=3, workers=3)["S"][:, 1, 0]
+    # cada fatia é [Z; -Z]: os log-retornos de i e i + m/2 somam 2 (r - sigma^2/2) T
+    x = np.log(S / 100.0)
+    for lo, m in zip((0, 4, 8), (4, 4, 2)):
+        h = m // 2
+        assert np.allclose(x[lo:lo + h] + x[lo + h:lo + m], 2 * (0.05 - 0.02))
+
+
+def test_spawn_start_method_falls_back_to_threads(monkeypatch):
+    import multiprocessing as mp
+    import pytest
+    from derivx.engine import parallel
+    # trabalho picklable roda de fato em processos "spawn"
+    assert parallel.run_parallel(pow, [(2, 3), (3, 2)], "processes", start_method="spawn") == [8, 9]
+    # como no Windows/macOS: sem fork, modelo/payoff com closures não são picklable
+    monkeypatch.setattr(mp, "get_all_start_methods", lambda: ["spawn"])
+    monkeypatch.setattr(mp, "get_start_method", lambda allow_none=False: "spawn")
+    prod = {"style": "european", "type": "european_call", "asset": 0, "K": 100.0}
+    with pytest.warns(RuntimeWarning, match="threads"):
+        p = price_from_spec(_spec(prod, parallel={"backend": "processes", "workers": 2}))
+    assert p == price_from_spec(_spec(prod, parallel={"backend": "threads", "workers": 2}))
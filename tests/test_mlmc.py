@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from derivx import price_from_spec, Payoff, PF
+from derivx.analytic import bs_call
+from derivx.engine.mlmc import mlmc_price
+
+
+def test_mlmc_hits_continuous_geometric_asian(gbm_model):
+    # média geométrica contínua = BS com sigma/sqrt(3) e q = (r + sigma^2/6)/2
+    ref = bs_call(100.0, 100.0, 0.05, 0.5 * (0.05 + 0.04 / 6), 0.2 / np.sqrt(3), 1.0)
+    pay = Payoff(lambda p: np.maximum(PF.geometric_average(p, 0) - 100.0, 0.0))
+    res = mlmc_price(gbm_model(), pay, [100.0], 1.0, target_rmse=0.02, seed=3)
+    assert abs(res.price - ref) < 3 * 0.02
+    assert res.se < 0.02 and res.bias < 0.02
+    # acoplamento: a variância das correções cai com o nível e os níveis finos usam poucos caminhos
+    lv = res.levels
+    assert np.all(np.diff(lv["var"][1:]) < 0)
+    assert lv["n_paths"][-1] < lv["n_paths"][0] / 100
+    assert res.n_paths == lv["n_paths"].sum()
+
+
+def test_mlmc_from_spec_matches_fine_grid_mc():
+    base = {"model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2}, "S0": [100.0], "seed": 1,
+            "product": {"type": "asian_arith_call", "asset": 0, "K": 100.0}}
+    p, se = price_from_spec({**base, "engine": "mlmc", "grid": {"T": 1.0}, "target_rmse": 0.02})
+    p_mc, se_mc = price_from_spec({**base, "engine": "mc", "grid": {"T": 1.0, "steps": 256},
+                                   "n_paths": 40_000, "control_variates": "auto"})
+    assert abs(p - p_mc) < 4 * np.hypot(se, se_mc) + 0.02
+
+    with pytest.raises(ValueError):
+        price_from_spec({**base, "engine": "mlmc", "grid": {"T": 1.0}})
+
+
+def test_mlmc_stops_at_min_level_when_bias_is_below_target(gbm_model):
+    # call europeia com passos GBM exatos: as correções são zero e o viés já é nulo em L=2
+    pay = Payoff(lambda p: np.maximum(p["S"][:, -1, 0] - 100.0, 0.0))
+    res = mlmc_price(gbm_model(), pay, [100.0], 1.0, target_rmse=0.1, seed=4)
+    assert len(res.levels["steps"]) == 3
+    assert abs(res.price - bs_call(100.0, 100.0, 0.05, 0.0, 0.2, 1.0)) < 3 * 0.1
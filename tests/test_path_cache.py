@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from derivx import price_from_spec, MonteCarloEngine
+from derivx import asian_arith_call, up_and_out_call
+from derivx.engine.cache import PathCache, path_key, shared_path_cache
+
+
+def test_repricing_hits_cache_with_identical_results(gbm_model, mc_engine):
+    cache = PathCache()
+    eng = MonteCarloEngine(gbm_model(), path_cache=cache)
+    times = np.linspace(0.0, 1.0, 33)
+    asian, barrier = asian_arith_call(0, 100.0), up_and_out_call(0, 100.0, 130.0)
+
+    a1 = eng.price(asian, [100.0], times, n_paths=20_000, seed=7)
+    b1 = eng.price(barrier, [100.0], times, n_paths=20_000, seed=7)
+    assert (cache.misses, cache.hits) == (1, 1)  # dois produtos, uma simulação
+
+    plain = mc_engine()
+    assert tuple(a1) == tuple(plain.price(asian, [100.0], times, n_paths=20_000, seed=7))
+    assert tuple(b1) == tuple(plain.price(barrier, [100.0], times, n_paths=20_000, seed=7))
+
+    # modelo reconstruído com os mesmos parâmetros: mesma chave
+    eng2 = MonteCarloEngine(gbm_model(), path_cache=cache)
+    assert tuple(eng2.price(asian, [100.0], times, n_paths=20_000, seed=7)) == tuple(a1)
+    assert cache.hits == 2
+    # qualquer parâmetro diferente é outra entrada; seed None nunca usa o cache
+    MonteCarloEngine(gbm_model(sigma=0.25), path_cache=cache).price(asian, [100.0], times, n_paths=20_000, seed=7)
+    eng.price(asian, [100.0], times, n_paths=20_000, seed=None)
+    assert cache.misses == 2 and len(cache) == 2
+
+    prices, _, _ = eng.price_many([asian, barrier], [100.0], times, n_paths=20_000, seed=7)
+    assert cache.hits == 3 and abs(prices[0] - a1.price) < 1e-10
+
+
+def test_entries_are_read_only_and_lru_respects_budget(gbm_model):
+    model = gbm_model()
+    times = np.linspace(0.0, 1.0, 9)
+    one = 1_000 * 9 * 8
+    cache = PathCache(max_bytes=2 * one + 1_000)
+    keys = [path_key(model, [100.0], times, 1_000, True, s) for s in range(3)]
+    for k, s in zip(keys, range(3)):
+        paths = cache.get_or_simulate(k, lambda s=s: model.simulate_paths([100.0], times, 1_000, seed=s))
+        with pytest.raises(ValueError):
+            paths["S"][0, 0, 0] = 1.0
+    assert cache.evictions == 1 and cache.get(keys[0]) is None and cache.get(keys[2]) is not None
+    st = cache.stats()
+    assert st["entries"] == 2 and st["bytes"] <= st["max_bytes"]
+
+
+def test_dsl_path_cache_is_shared_between_calls():
+    shared_path_cache().clear()
+    spec = {"engine": "mc", "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 16}, "S0": [100.0], "n_paths": 10_000, "seed": 3, "path_cache": True,
+            "product": {"type": "asian_arith_call", "asset": 0, "K": 100.0}}
+    p1 = price_from_spec(spec)
+    p2 = price_from_spec({**spec, "product": {"type": "asian_arith_call", "asset": 0, "K": 105.0}})
+    assert shared_path_cache().stats()["hits"] == 1 and p2[0] < p1[0]
+    shared_path_cache().clear()
+
+
+def test_caching_leaves_caller_arrays_writeable(gbm_model):
+    eng = MonteCarloEngine(gbm_model(), path_cache=PathCache())
+    times = np.linspace(0.0, 1.0, 9)
+    S0 = np.array([100.0])
+    eng.price(asian_arith_call(0, 100.0), S0, times, n_paths=1_000, seed=1)
+    assert times.flags.writeable and S0.flags.writeable
+    times[0] = 0.0  # o chamador continua dono da grade
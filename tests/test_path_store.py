@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from derivx import price_from_spec, MonteCarloEngine, RiskNeutralGBM, ExerciseSpec, PF
+from derivx import asian_arith_call
+from derivx.engine.store import PathStore
+from derivx.exercise.lsmc import lsmc_price
+
+
+def test_store_matches_chunked_engine_and_reopens(tmp_path, gbm_model, mc_engine):
+    model = gbm_model()
+    eng = MonteCarloEngine(model)
+    times = np.linspace(0.0, 1.0, 17)
+    f = str(tmp_path / "paths.npy")
+    store = PathStore.create(f, model, [100.0], times, 30_001, seed=3, chunk_size=4_000)
+    assert isinstance(store.S, np.memmap) and not store.S.flags.writeable
+
+    pay = asian_arith_call(0, 100.0)
+    ref = eng.price(pay, [100.0], times, n_paths=30_001, seed=3, chunk_size=4_000)
+    got = eng.price_store(pay, store, block_size=5_000)
+    assert abs(got.price - ref.price) < 1e-10 and abs(got.se - ref.se) < 1e-10
+
+    # outro "processo": reabre do disco; workers em threads fundem as faixas
+    again = PathStore.open(f)
+    par = eng.price_store(pay, again, block_size=5_000, n_workers=3, backend="threads", trace=True)
+    assert abs(par.price - ref.price) < 1e-10 and par.trace["n_paths"][-1] == 30_001
+
+    # blocos são views do memmap e servem aos helpers PF
+    blk = next(again.blocks(1_000))
+    assert np.shares_memory(blk["S"], again.S) and PF.average(blk, 0).shape == (1_000,)
+
+    with pytest.raises(ValueError):
+        mc_engine(sigma=0.3).price_store(pay, again)
+    with pytest.raises(FileExistsError):
+        PathStore.create(f, model, [100.0], times, 10, seed=1)
+
+
+def test_blocked_lsmc_matches_in_memory(tmp_path, gbm_model):
+    model = gbm_model()
+    times = np.linspace(0.0, 1.0, 51)
+    store = PathStore.create(str(tmp_path / "am.npy"), model, [100.0], times, 20_000, seed=5)
+    ex = ExerciseSpec(list(range(5, 51, 5)), lambda p, k: np.maximum(100.0 - p["S"][:, k, 0], 0.0))
+    full = lsmc_price(model, {"times": times, "S": np.array(store.S)}, ex, times)
+    blocked = lsmc_price(model, store.paths(), ex, times, block_size=3_000)
+    assert abs(full[0] - blocked[0]) < 1e-8 and abs(full[1] - blocked[1]) < 1e-8
+
+
+def test_dsl_path_store_creates_then_reuses(tmp_path):
+    f = str(tmp_path / "dsl.npy")
+    spec = {"engine": "mc", "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 8}, "S0": [100.0], "n_paths": 20_000, "seed": 2, "path_store": f,
+            "product": {"type": "european_call", "asset": 0, "K": 100.0}}
+    p1 = price_from_spec(spec)
+    mtime = (tmp_path / "dsl.npy").stat().st_mtime_ns
+    p2 = price_from_spec(spec)
+    assert p1 == p2 and (tmp_path / "dsl.npy").stat().st_mtime_ns == mtime
+    am = price_from_spec({**spec, "product": {"style": "american", "type": "european_put", "asset": 0, "K": 100.0}})
+    assert 5.5 < am[0] < 6.5
+
+
+def test_dsl_path_store_rejects_mismatch_and_rebuilds(tmp_path):
+    f = str(tmp_path / "dsl.npy")
+    spec = {"engine": "mc", "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 8}, "S0": [100.0], "n_paths": 2_000, "seed": 1, "path_store": f,
+            "product": {"type": "european_call", "asset": 0, "K": 100.0}}
+    small = price_from_spec(spec)
+    big = {**spec, "n_paths": 50_000, "seed": 9}
+    for bad in (big, {**spec, "seed": 9}, {**spec, "dtype": "float32"}):
+        with pytest.raises(ValueError, match="store difere"):
+            price_from_spec(bad)
+    fresh = price_from_spec({**big, "path_store": {"path": f, "rebuild": True}})
+    assert fresh != small and PathStore.open(f).meta["n_paths"] == 50_000
+    assert price_from_spec(big) == fresh
+    for opt in ({"target_se": 0.01}, {"sampler": "sobol"}, {"importance_shift": [0.5]}):
+        with pytest.raises(ValueError, match="path_store"):
+            price_from_spec({**big, **opt})
+    with pytest.raises(ValueError, match="parallel"):
+        price_from_spec({**big, "parallel": {"workers": 2},
+                         "product": {"style": "american", "type": "european_put", "asset": 0, "K": 100.0}})
+
+
+def test_store_rejects_heston(tmp_path, heston_model):
+    with pytest.raises(ValueError, match="RiskNeutralGBM"):
+        PathStore.create(str(tmp_path / "h.npy"), heston_model(), [100.0], np.linspace(0.0, 1.0, 5), 100, seed=1)
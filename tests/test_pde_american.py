@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+from derivx import price_from_spec, RiskNeutralGBM, PiecewiseFlatCurve
+from derivx.engine.pde import PDEEngine
+from tests.test_lsmc_vs_crr import crr_bermudan_put
+
+GBM = {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2}
+# put americano S=K=100, r=5%, sigma=20%, T=1 (CRR com 4096 passos)
+AMER_PUT = 6.09019
+
+
+def _spec(style, **product):
+    return {"engine": "pde", "model": GBM, "grid": {"T": 1.0, "steps": 256}, "S0": [100.0],
+            "product": {"style": style, "type": "european_put", "asset": 0, "K": 100.0, **product},
+            "NS": 800, "NT": 400}
+
+
+def test_pde_american_and_bermudan_put():
+    p_am, se = price_from_spec(_spec("american"))
+    assert se == 0.0 and p_am == pytest.approx(AMER_PUT, abs=2e-3)
+    assert price_from_spec({**_spec("american"), "engine": "auto"})[0] == p_am
+    p_pol, _ = price_from_spec({**_spec("american"), "lcp": "policy"})
+    assert p_pol == pytest.approx(p_am, abs=1e-10)
+    # bermudana: mesmas datas de _build_exercise que o LSMC (exercise_every na grade de 256 passos)
+    ref = crr_bermudan_put(100.0, 100.0, 0.05, 0.0, 0.2, 1.0, N=256, exercise_every=16)
+    p_b, _ = price_from_spec(_spec("bermudan", exercise_every=16))
+    assert p_b == pytest.approx(ref, abs=1e-2)
+    p_eu, _ = price_from_spec(_spec("european"))
+    assert p_eu < p_b < p_am
+
+
+def test_pde_american_call_with_dividends_and_greeks():
+    rc = PiecewiseFlatCurve(np.array([1e-8]), np.array([0.05]))
+    eng = PDEEngine(RiskNeutralGBM(rc, q_funcs=0.08, sigma_funcs=0.2), NS=400, NT=400)
+    call = lambda S: np.maximum(S - 100.0, 0.0)
+    euro = eng.price(call, 100.0, 1.0, K=100.0)
+    bs = eng.price(call, 100.0, 1.0, K=100.0, exercise=call, lcp="brennan_schwartz")
+    assert bs > euro + 0.2
+    assert eng.price(call, 100.0, 1.0, K=100.0, exercise=call, lcp="policy") == pytest.approx(bs, abs=1e-10)
+    # Greeks da grade: europeu contra BS, americano contra diferença finita de preços completos
+    d1 = (np.log(1.0) + (0.05 - 0.08 + 0.02)) / 0.2
+    ge = eng.greeks(call, 100.0, 1.0, K=100.0)
+    assert ge["delta"] == pytest.approx(np.exp(-0.08) * norm.cdf(d1), abs=1e-4)
+    assert ge["gamma"] == pytest.approx(np.exp(-0.08) * norm.pdf(d1) / 20.0, abs=1e-4)
+    g = eng.greeks(call, 100.0, 1.0, K=100.0, exercise=call)
+    up, dn = (eng.price(call, 100.0 + s, 1.0, K=100.0, exercise=call) for s in (1.0, -1.0))
+    assert g["price"] == pytest.approx(bs)
+    assert g["delta"] == pytest.approx((up - dn) / 2.0, abs=1e-3)
+    assert g["gamma"] > ge["gamma"] and g["theta"] < 0
+
+
+def test_pde_exercise_only_for_vanillas():
+    from derivx.dsl.spec import _pde_applicable
+    for ptype in ("asian_arith_call", "basket_call"):
+        spec = {**_spec("american"), "product": {"style": "american", "type": ptype, "asset": 0, "K": 100.0}}
+        assert not _pde_applicable(spec)
+        with pytest.raises(ValueError):
+            price_from_spec(spec)
+    assert _pde_applicable({**_spec("american"), "engine": "auto"})
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from derivx import price_from_spec, RiskNeutralGBM, PiecewiseFlatCurve
+from derivx.analytic import bs_call, bs_put, cash_or_nothing_call
+from derivx.engine.pde import PDEEngine
+from tests.ref_formulas.barrier import up_and_out_call_ref
+
+GBM = {"name": "gbm", "r": 0.05, "q": 0.02, "sigma": 0.2}
+
+
+def _spec(product, **kw):
+    return {"engine": "pde", "model": GBM, "grid": {"T": 1.0}, "S0": [100.0],
+            "product": {"style": "european", "asset": 0, **product}, "NS": 400, "NT": 200, **kw}
+
+
+def test_pde_vanillas_digital_and_barrier():
+    p, se = price_from_spec(_spec({"type": "european_put", "K": 100.0}))
+    assert se == 0.0 and p == pytest.approx(bs_put(100.0, 100.0, 0.05, 0.02, 0.2, 1.0), abs=3e-3)
+    p, _ = price_from_spec(_spec({"type": "european_call", "K": 110.0}))
+    assert p == pytest.approx(bs_call(100.0, 110.0, 0.05, 0.02, 0.2, 1.0), abs=3e-3)
+    # Rannacher amortece o salto do digital
+    p, _ = price_from_spec(_spec({"type": "cash_or_nothing_call", "K": 100.0}, NS=800, NT=400))
+    assert p == pytest.approx(cash_or_nothing_call(100.0, 100.0, 0.05, 0.02, 0.2, 1.0, 1.0), abs=5e-3)
+    ref = up_and_out_call_ref(100.0, 100.0, 130.0, 0.05, 0.02, 0.2, 1.0)
+    spec = _spec({"type": "up_and_out_call", "K": 100.0, "barrier": 130.0, "monitoring": "continuous"})
+    assert price_from_spec(spec)[0] == pytest.approx(ref, abs=2e-3)
+    # engine 'auto' usa a PDE para barreira contínua
+    assert price_from_spec({**spec, "engine": "auto"})[0] == pytest.approx(ref, abs=2e-3)
+    # monitoramento discreto (semanal): knock-out nas mesmas datas do MC
+    disc = _spec({"type": "up_and_out_call", "K": 100.0, "barrier": 130.0}, NS=1600, NT=800,
+                 grid={"T": 1.0, "steps": 52})
+    mc, se = price_from_spec({**disc, "engine": "mc", "n_paths": 400_000, "seed": 1})
+    p, _ = price_from_spec(disc)
+    assert p > ref + 0.3 and p == pytest.approx(mc, abs=3 * se)
+
+
+def test_pde_converges_second_order_with_curve_and_time_dependent_sigma():
+    rc = PiecewiseFlatCurve(np.array([0.5, 1.0]), np.array([0.02, 0.06]))
+    model = RiskNeutralGBM(rc, q_funcs=0.0, sigma_funcs=lambda t: 0.15 + 0.1 * t)
+    ref = bs_call(100.0, 100.0, 0.04, 0.0, np.sqrt(0.15 ** 2 + 0.015 + 0.01 / 3), 1.0)
+    err = [abs(PDEEngine(model, NS, NT).price(lambda S: np.maximum(S - 100.0, 0.0), 100.0, 1.0, K=100.0) - ref)
+           for NS, NT in ((100, 50), (200, 100), (400, 200))]
+    assert err[2] < 2e-3
+    assert err[0] / err[1] > 3.0 and err[1] / err[2] > 3.0
+
+
+def test_pde_rejects_unsupported():
+    with pytest.raises(ValueError):
+        price_from_spec(_spec({"type": "asian_arith_call", "K": 100.0}))
+    with pytest.raises(ValueError):
+        price_from_spec({**_spec({"type": "european_call", "K": 100.0}),
+                         "model": {"name": "heston", "r": 0.05, "q": 0.0, "kappa": 1.5, "theta": 0.04,
+                                   "xi": 0.5, "rho": -0.7, "v0": 0.04}})
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+from derivx import pde_ladder_from_spec, price_from_spec
+from derivx.engine import pde as pde_mod
+
+GBM = {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2}
+
+
+def _spec(**product):
+    return {"engine": "pde", "model": GBM, "grid": {"T": 1.0, "steps": 64}, "S0": [100.0],
+            "product": {"type": "european_put", "asset": 0, "K": 100.0, **product}, "NS": 800, "NT": 200}
+
+
+def test_ladder_matches_bs_with_one_solve(monkeypatch):
+    calls = []
+    solve = pde_mod.PDEEngine._solve
+    monkeypatch.setattr(pde_mod.PDEEngine, "_solve", lambda self, *a, **k: calls.append(1) or solve(self, *a, **k))
+    L = pde_ladder_from_spec(_spec(), {"min": 60.0, "max": 160.0, "n": 400})
+    assert len(calls) == 1 and L["price"].shape == (400,)
+    S = L["S"]
+    d1 = (np.log(S / 100.0) + 0.07) / 0.2
+    d2 = d1 - 0.2
+    put = 100.0 * np.exp(-0.05) * norm.cdf(-d2) - S * norm.cdf(-d1)
+    theta = -S * norm.pdf(d1) * 0.1 + 0.05 * 100.0 * np.exp(-0.05) * norm.cdf(-d2)
+    assert np.max(np.abs(L["price"] - put)) < 2e-3
+    assert np.max(np.abs(L["delta"] - (norm.cdf(d1) - 1.0))) < 1e-4
+    assert np.max(np.abs(L["gamma"] - norm.pdf(d1) / (0.2 * S))) < 1e-4
+    assert np.max(np.abs(L["theta"] - theta)) < 2e-2
+
+
+def test_ladder_agrees_with_pointwise_price_and_barrier():
+    spec = {**_spec(style="american"), "S0_ladder": [80.0, 100.0, 120.0]}
+    L = pde_ladder_from_spec(spec)
+    for s, p in zip(L["S"], L["price"]):
+        assert p == pytest.approx(price_from_spec({**spec, "S0": [s]})[0], abs=5e-3)
+    # knock-out: pontos além da barreira valem zero
+    B = _spec(type="up_and_out_call", barrier=130.0, monitoring="continuous")
+    L = pde_ladder_from_spec(B, [90.0, 110.0, 130.0, 150.0])
+    assert L["price"][0] > 0 and L["price"][2] == 0.0 and L["price"][3] == 0.0
+    with pytest.raises(ValueError):
+        pde_ladder_from_spec(_spec())
+
+
+def test_ladder_rejects_single_time_step():
+    # com um só passo não há camada t=dt para o theta
+    with pytest.raises(ValueError, match="NT"):
+        pde_ladder_from_spec({**_spec(), "NT": 1}, [90.0, 100.0, 110.0])
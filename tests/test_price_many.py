@@ -0,0 +1,42 @@
+import numpy as np
+from derivx import price_from_spec
+from derivx import european_call, european_put, asian_arith_call
+
+
+def test_price_many_matches_individual_prices(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 33)
+    book = [european_call(0, 90.0), european_put(0, 110.0), asian_arith_call(0, 100.0)]
+    prices, ses, cov = eng.price_many(book, [100.0], times, n_paths=20_000, seed=9)
+    assert prices.shape == ses.shape == (3,) and cov.shape == (3, 3)
+    # a asiática lê a grade inteira: mesmos caminhos que a chamada individual
+    p, se = eng.price(book[2], [100.0], times, n_paths=20_000, seed=9)
+    assert abs(p - prices[2]) < 1e-9 and abs(se - ses[2]) < 1e-9
+    # os europeus sozinhos usariam o amostrador terminal: iguais dentro do ruído
+    for i in (0, 1):
+        p, se = eng.price(book[i], [100.0], times, n_paths=20_000, seed=9)
+        assert abs(p - prices[i]) < 4 * np.hypot(se, ses[i])
+    assert np.allclose(np.sqrt(np.diag(cov)), ses)
+    # call e put no mesmo S_T: fortemente anti-correlacionados
+    assert cov[0, 1] < 0
+
+
+def test_put_call_parity_on_shared_paths(mc_engine):
+    eng = mc_engine()
+    times = np.array([0.0, 1.0])
+    prices, ses, cov = eng.price_many([european_call(0, 100.0), european_put(0, 100.0)], [100.0], times,
+                                      n_paths=50_000, seed=1, chunk_size=8_000)
+    parity = 100.0 - 100.0 * np.exp(-0.05)
+    w = np.array([1.0, -1.0])
+    assert abs(w @ prices - parity) < 4 * np.sqrt(w @ cov @ w) + 1e-9
+
+
+def test_dsl_products():
+    spec = {"engine": "mc",
+            "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 16},
+            "S0": [100.0],
+            "products": [{"type": "european_call", "asset": 0, "K": K} for K in (90.0, 100.0, 110.0)],
+            "n_paths": 20_000, "seed": 2}
+    prices, ses, cov = price_from_spec(spec)
+    assert prices[0] > prices[1] > prices[2] > 0
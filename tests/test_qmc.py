@@ -0,0 +1,32 @@
+import numpy as np
+from derivx import price_from_spec, bs_call_price
+from derivx.engine.qmc import bridge_increments, pca_rotation
+
+
+def test_brownian_bridge_gives_iid_standard_increments():
+    times = np.array([0.0, 0.1, 0.25, 0.5, 0.6, 1.0])
+    xi = np.random.default_rng(0).standard_normal((200_000, 5, 1))
+    Z = bridge_increments(xi, times)[:, :, 0]
+    assert np.allclose(np.cov(Z, rowvar=False), np.eye(5), atol=0.02)
+    # soma dos incrementos reconstrói W(T) = sqrt(T) * xi_0
+    assert np.allclose((Z * np.sqrt(np.diff(times))).sum(axis=1), xi[:, 0, 0])
+
+
+def test_pca_rotation_preserves_correlation():
+    corr = np.array([[1.0, 0.5, 0.2], [0.5, 1.0, 0.3], [0.2, 0.3, 1.0]])
+    chol = np.linalg.cholesky(corr)
+    M = pca_rotation(corr, chol)
+    assert np.allclose(M @ M.T, np.eye(3))
+
+
+def test_sobol_rqmc_beats_pseudo_random():
+    base = {"engine": "mc",
+            "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 32}, "S0": [100.0],
+            "product": {"style": "european", "type": "european_call", "asset": 0, "K": 100.0},
+            "n_paths": 8_192, "seed": 5}
+    p_mc, se_mc = price_from_spec(base)
+    p_qmc, se_qmc = price_from_spec({**base, "sampler": "sobol", "qmc_replications": 8})
+    bs = bs_call_price(100.0, 100.0, 0.05, 0.0, 0.2, 1.0)
+    assert abs(p_qmc - bs) < max(4 * se_qmc, 1e-3)
+    assert se_qmc < se_mc / 10
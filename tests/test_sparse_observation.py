@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from derivx import PF, price_from_spec
+from derivx import asian_arith_call, up_and_out_call
+from derivx.payoffs.core import required_indices
+
+
+def test_payoff_declares_observation_dates():
+    fix = [64, 128, 192, 256]
+    assert list(required_indices([asian_arith_call(0, 100.0, fixings=fix)], 257)) == fix
+    assert len(required_indices([asian_arith_call(0, 100.0)], 257)) == 256
+    assert required_indices([up_and_out_call(0, 100.0, 130.0)], 257) is None
+    assert required_indices([lambda paths: PF.terminal(paths, 0)], 257) is None
+
+
+def test_sparse_fixings_store_only_observed_columns(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 257)
+    paths = eng.model.simulate_paths([100.0], times, 1_000, seed=1, obs_idx=[64, 128, 192])
+    assert list(paths["idx"]) == [0, 64, 128, 192, 256]
+    assert paths["S"].shape == (1_000, 5, 1)
+    assert np.allclose(PF.at_time(paths, 0, 128), paths["S"][:, 2, 0])
+    with pytest.raises(ValueError):
+        PF.at_time(paths, 0, 100)
+
+
+def test_sparse_asian_matches_dense_simulation(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 129)
+    fix = list(range(32, 129, 32))
+    payoff = asian_arith_call(0, 100.0, fixings=fix)
+    p_sparse, se_sparse = eng.price(payoff, [100.0], times, n_paths=100_000, seed=3)
+    # callable comum (sem declaração) força a grade inteira
+    p_dense, se_dense = eng.price(lambda paths: payoff(paths), [100.0], times, n_paths=100_000, seed=4)
+    assert abs(p_sparse - p_dense) < 4 * np.hypot(se_sparse, se_dense)
+
+
+def test_dsl_fixing_times():
+    spec = {"engine": "mc",
+            "model": {"name": "gbm", "r": 0.05, "q": 0.0, "sigma": 0.2},
+            "grid": {"T": 1.0, "steps": 252}, "S0": [100.0],
+            "product": {"style": "european", "type": "asian_arith_call", "asset": 0, "K": 100.0,
+                        "fixing_times": [0.25, 0.5, 0.75, 1.0]},
+            "n_paths": 20_000, "seed": 11}
+    p, se = price_from_spec(spec)
+    assert 0.0 < p < 10.45 and se > 0
@@ -0,0 +1,43 @@
+import numpy as np
+from derivx import european_call, asian_arith_call
+from derivx.engine.stats import RunningMoments
+
+
+def test_running_moments_merge_matches_batch_and_is_stable():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((10_000, 3)) @ np.array([[1.0, 0.5, 0.0], [0.0, 1.0, 0.3], [0.0, 0.0, 1.0]])
+    parts = [RunningMoments(3).update(b) for b in np.array_split(X, 7)]
+    acc = RunningMoments.combine(parts)
+    assert acc.n == len(X)
+    assert np.allclose(acc.mean, X.mean(axis=0)) and np.allclose(acc.cov, np.cov(X.T))
+
+    # média enorme frente ao desvio: soma de quadrados perde tudo, o acumulador não
+    Y = 1e9 + rng.standard_normal(20_000)
+    acc = RunningMoments(1)
+    for b in np.array_split(Y, 50):
+        acc.update(b)
+    assert abs(acc.var[0] - Y.var(ddof=1)) < 1e-6
+
+
+def test_convergence_trace_for_chunked_single_parallel_and_adaptive(mc_engine):
+    eng = mc_engine()
+    times = np.linspace(0.0, 1.0, 13)
+    pay = asian_arith_call(0, 100.0)
+
+    res = eng.price(pay, [100.0], times, n_paths=20_000, seed=1, chunk_size=4_000, trace=True)
+    tr = res.trace
+    assert list(tr["n_paths"]) == [4_000, 8_000, 12_000, 16_000, 20_000]
+    assert tr["price"][-1] == res.price and tr["se"][-1] == res.se
+    assert np.all(np.diff(tr["se"]) < 0)
+    assert eng.price(pay, [100.0], times, n_paths=20_000, seed=1).trace is None
+
+    # sem chunk_size: blocos de n/32 sobre os mesmos caminhos da chamada única
+    full = eng.price(pay, [100.0], times, n_paths=20_000, seed=1, trace=True)
+    ref = eng.price(pay, [100.0], times, n_paths=20_000, seed=1)
+    assert len(full.trace["n_paths"]) in (32, 33) and abs(full.price - ref.price) < 1e-10
+
+    par = eng.price(pay, [100.0], times, n_paths=20_000, seed=1, n_workers=4, backend="threads", trace=True)
+    assert list(par.trace["n_paths"]) == [5_000, 10_000, 15_000, 20_000] and par.trace["price"][-1] == par.price
+
+    ad = eng.price(european_call(0, 100.0), [100.0], times, n_paths=5_000, seed=2, target_se=0.03, trace=True)
+    assert ad.trace["n_paths"][-1] == ad.n_paths and ad.trace["se"][-1] == ad.se <= 0.03
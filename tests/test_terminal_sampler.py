@@ -0,0 +1,44 @@
+import math
+import numpy as np
+from derivx import MonteCarloEngine, RiskNeutralGBM, PiecewiseFlatCurve, european_call, bs_call_price
+from derivx.dsl.spec import _build_payoff
+from derivx.payoffs.core import required_indices
+from derivx.analytic import margrabe_exchange_call
+
+
+def test_terminal_sampler_matches_bs_with_term_structure():
+    # r por trechos e sigma(t) dependente do tempo: a lei de S_T usa as integrais
+    rc = PiecewiseFlatCurve(np.array([0.5, 1.0]), np.array([0.03, 0.06]))
+    model = RiskNeutralGBM(rc, q_funcs=0.01, sigma_funcs=lambda t: 0.15 + 0.1 * t)
+    times = np.linspace(0.0, 1.0, 257)
+    paths = model.simulate_terminal([100.0], times, n_paths=200_000, seed=1)
+    assert paths["S"].shape == (200_000, 2, 1)
+    assert list(paths["idx"]) == [0, 256]
+
+    T = 1.0
+    r_bar = rc.integral(0.0, T) / T
+    mids = 0.5 * (times[:-1] + times[1:])
+    sig_bar = math.sqrt(np.mean((0.15 + 0.1 * mids) ** 2))
+    fwd = 100.0 * math.exp((r_bar - 0.01) * T)
+    ST = paths["S"][:, -1, 0]
+    assert abs(ST.mean() - fwd) < 4 * ST.std() / math.sqrt(ST.size)
+
+    p, se = MonteCarloEngine(model).price(european_call(0, 100.0), [100.0], times, n_paths=200_000, seed=2)
+    ref = bs_call_price(100.0, 100.0, r_bar, 0.01, sig_bar, T)
+    assert abs(p - ref) < 4 * se
+
+
+def test_extra_payoffs_use_terminal_sampler():
+    prod = {"type": "exchange_call", "asset_long": 0, "asset_short": 1}
+    payoff = _build_payoff(prod)
+    assert getattr(payoff, "terminal_only", False)
+
+    rho = 0.5
+    rc = PiecewiseFlatCurve(np.array([1e-8]), np.array([0.05]))
+    model = RiskNeutralGBM(rc, q_funcs=[0.01, 0.03], sigma_funcs=[0.2, 0.3],
+                           corr=np.array([[1.0, rho], [rho, 1.0]]))
+    eng = MonteCarloEngine(model)
+    assert list(required_indices([payoff], 257)) == [256]
+    p, se = eng.price(payoff, [100.0, 120.0], np.linspace(0.0, 1.0, 257), n_paths=100_000, seed=17)
+    ref = margrabe_exchange_call(100.0, 120.0, 0.05, 0.01, 0.03, 0.2, 0.3, rho, 1.0)
+    assert abs(p - ref) < 4 * se